@@ -0,0 +1,156 @@
+"""
+Сравнение масштабирования разбора логов на потоках и процессах.
+
+Собирает большой лог из тестовых файлов, разложенный на несколько
+файлов, и строит по нему отчёт по обработчикам двумя способами:
+самой функцией analyze_logs в пуле потоков и теми же задачами
+в пуле процессов. Работа в обоих пулах одинаковая: задачи
+планируются _plan_tasks (файлы, а без GIL — диапазоны), воркер
+собирает частичный HandlerReport, а частичные отчёты объединяются
+в конце; процессы дополнительно платят за передачу счётчиков
+между процессами.
+
+На обычной сборке потоки упираются в GIL, на 3.13t/3.14t
+время потоков должно сравняться со временем процессов.
+
+Запуск: python benchmarks/bench_threads.py [--copies N] [--files N]
+                                           [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+from logs_analyzer import analyze  # noqa: E402
+from logs_analyzer.logs_parser import DEFAULT_KIND  # noqa: E402
+from logs_analyzer.reports.handlers import HandlerReport  # noqa: E402
+from logs_analyzer.stream import is_free_threaded  # noqa: E402
+
+LOGS_DIR = Path(__file__).resolve().parent.parent / "logs_analyzer" / "logs"
+
+
+def build_logs(directory: Path, copies: int, files: int) -> list[Path]:
+    """
+    Записывает тестовые логи copies раз, поровну в files файлов.
+
+    :param directory: Каталог создаваемых файлов
+    :param copies: Число повторов тестовых логов
+    :param files: Число файлов
+    :return: Пути к созданным файлам
+    """
+    sample = b"".join(
+        log.read_bytes() for log in sorted(LOGS_DIR.glob("*.log"))
+    )
+    paths = []
+    for number in range(files):
+        path = directory / f"bench{number}.log"
+        with path.open(mode="wb") as file:
+            for _ in range(max(1, copies // files)):
+                file.write(sample)
+        paths.append(path)
+    return paths
+
+
+def aggregate_counts(
+    parse: Callable, args: tuple
+) -> dict[str, dict[str, int]]:
+    """
+    Собирает частичный отчёт задачи в процессе-воркере.
+
+    :param parse: Функция разбора задачи
+    :param args: Аргументы функции разбора
+    :return: Счётчики 'обработчик -> уровень -> количество'
+             для передачи в основной процесс
+    """
+    part = analyze._aggregate(  # pylint: disable=protected-access
+        HandlerReport, parse, *args
+    )
+    return {handler: dict(levels) for handler, levels in part.data.items()}
+
+
+def run_threads(paths: list[Path], workers: int) -> int:
+    """
+    Строит отчёт функцией analyze_logs с заданным числом потоков.
+
+    :param paths: Пути к лог-файлам
+    :param workers: Число потоков
+    :return: Общее количество запросов
+    """
+    with mock.patch.object(
+        analyze, "ThreadPoolExecutor",
+        partial(ThreadPoolExecutor, max_workers=workers),
+    ):
+        return analyze.analyze_logs(paths, HandlerReport).total_requests
+
+
+def run_processes(paths: list[Path], workers: int) -> int:
+    """
+    Строит отчёт теми же задачами в пуле процессов.
+
+    :param paths: Пути к лог-файлам
+    :param workers: Число процессов
+    :return: Общее количество запросов
+    """
+    tasks = analyze._plan_tasks(  # pylint: disable=protected-access
+        paths, None, DEFAULT_KIND, None
+    )
+    report = HandlerReport()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(aggregate_counts, parse, args)
+            for parse, args in tasks
+        ]
+        for future in futures:
+            report.add_counts(
+                (handler, level, count)
+                for handler, levels in future.result().items()
+                for level, count in levels.items()
+            )
+    return report.total_requests
+
+
+def main() -> None:
+    """
+    Запускает сравнение и печатает таблицу времени и ускорения.
+
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--copies", type=int, default=300)
+    parser.add_argument("--files", type=int, default=16)
+    parser.add_argument(
+        "--workers", type=int, nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+    )
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]}, "
+          f"GIL {'выключен' if is_free_threaded() else 'включён'}, "
+          f"ядер {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = build_logs(Path(tmp), args.copies, args.files)
+        size = sum(path.stat().st_size for path in paths)
+        print(f"Файлов {len(paths)}, {size / 2 ** 20:.0f} МиБ\n")
+        print(f"{'WORKERS':<10}{'THREADS, s':<14}{'PROCESSES, s':<16}RATIO")
+        for workers in args.workers:
+            timings = []
+            for run in (run_threads, run_processes):
+                started = time.perf_counter()
+                run(paths, workers)
+                timings.append(time.perf_counter() - started)
+            print(f"{workers:<10}{timings[0]:<14.2f}{timings[1]:<16.2f}"
+                  f"{timings[0] / timings[1]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
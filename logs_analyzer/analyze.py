@@ -1,31 +1,434 @@
 """Модуль многопоточного анализа лог-файлов и генерации отчёта."""
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
-from logs_analyzer.logs_parser import parse_log_file
+from logs_analyzer.dedupe import ScalableBloomFilter
+from logs_analyzer.index import parse_indexed
+from logs_analyzer.logs_parser import (LINE_PARSERS, LogQuery, parse_chunk,
+                                       parse_log_file, read_block)
+from logs_analyzer.seek import parse_time_window
+from logs_analyzer.spill import SpilledReport, SpillStore
+from logs_analyzer.stream import (STDIN_MARKER, StreamOptions, analyze_stream,
+                                  is_free_threaded, is_stream_input)
+from logs_analyzer.utils import get_record_kind
 
 
-def analyze_logs(log_files: list[Path], report_class: type) -> Any:
+def _parse_file(
+    log_file: Path,
+    query: LogQuery | None,
+    kind: str,
+    dedupe: ScalableBloomFilter | None = None,
+) -> list[dict[str, str]]:
+    """
+    Парсит лог-файл, по возможности используя индекс.
+
+    Индекс применяется только для запросов с условиями отбора.
+    Без индекса запрос с границами времени читает только найденный
+    бинарным поиском диапазон упорядоченного файла, остальные
+    файлы читаются целиком. При исключении повторов файл читается
+    целиком, а строки проходят через общий фильтр.
+
+    :param log_file: Путь к лог-файлу
+    :param query: Условия отбора записей (None — без отбора)
+    :param kind: Вид записей, ключ LINE_PARSERS
+    :param dedupe: Фильтр уже встречавшихся строк (None — без фильтра)
+    :return: Список записей лога
+    """
+    if dedupe is not None:
+        with log_file.open(mode="r", encoding="utf-8") as file:
+            lines = dedupe.source().unique_lines(file)
+            return LINE_PARSERS[kind](lines, query)
+    if query is not None:
+        records = parse_indexed(log_file, query, kind)
+        if records is None:
+            records = parse_time_window(log_file, query, kind)
+        if records is not None:
+            return records
+    return parse_log_file(log_file, query, kind)
+
+
+FREE_THREADED_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def _aggregate(report_class: type, parse: Callable, *args: Any) -> Any:
+    """
+    Разбирает часть логов в собственный частичный отчёт воркера.
+
+    У каждого воркера свой экземпляр отчёта, поэтому потоки
+    не изменяют общих структур и не ждут друг друга.
+
+    :param report_class: Класс отчёта с методами add_data() и merge()
+    :param parse: Функция разбора, возвращающая список записей
+    :param args: Аргументы функции разбора
+    :return: Частичный отчёт
+    """
+    part = report_class()
+    part.add_data(parse(*args))
+    return part
+
+
+def _plan_tasks(
+    log_files: list[Path],
+    query: LogQuery | None,
+    kind: str,
+    dedupe: ScalableBloomFilter | None,
+) -> list[tuple[Callable, tuple]]:
+    """
+    Делит работу по файлам на задачи для пула потоков.
+
+    Без GIL большие файлы делятся на диапазоны по
+    FREE_THREADED_CHUNK_SIZE байтов, чтобы даже один файл
+    разбирался на всех ядрах. С GIL, а также при отборе
+    (нужен индекс) и исключении повторов задача — целый файл.
+
+    :param log_files: Список путей к лог-файлам
+    :param query: Условия отбора записей (None — без отбора)
+    :param kind: Вид записей, ключ LINE_PARSERS
+    :param dedupe: Фильтр уже встречавшихся строк (None — без фильтра)
+    :return: Пары (функция разбора, аргументы)
+    """
+    if not is_free_threaded() or query is not None or dedupe is not None:
+        return [
+            (_parse_file, (log_file, query, kind, dedupe))
+            for log_file in log_files
+        ]
+    tasks = []
+    for log_file in log_files:
+        size = log_file.stat().st_size
+        tasks.extend(
+            (_parse_range, (
+                log_file, start,
+                min(start + FREE_THREADED_CHUNK_SIZE, size), None, kind,
+            ))
+            for start in range(0, size, FREE_THREADED_CHUNK_SIZE)
+        )
+    return tasks
+
+
+def analyze_logs(
+    log_files: list[Path],
+    report_class: type,
+    query: LogQuery | None = None,
+    dedupe: ScalableBloomFilter | None = None,
+) -> Any:
     """
     Анализирует лог-файлы и формирует отчёт.
 
     Анализирует в многопоточном режиме параллельно.
+    Если у отчёта есть метод merge(), каждый воркер собирает
+    свой частичный отчёт, а частичные отчёты объединяются в конце;
+    на сборках без GIL так разбор масштабируется по ядрам.
+    Результаты объединяются в порядке постановки задач, а не
+    завершения, поэтому отчёт не зависит от планирования потоков.
     Формирует отчёт указанного типа.
+    Потоковые источники ('-' и именованные каналы) обрабатываются
+    конвейером из analyze_stream без записи на диск.
 
     :param log_files: Список путей к анализируемым лог-файлам
     :param report_class: Класс отчёта, должен реализовывать методы:
                         - add_data() для добавления данных
                         - print_report() для вывода результата
+                        - merge() для объединения (необязательно)
+                        Атрибут record_kind задаёт вид записей
+    :param query: Условия отбора записей (None — без отбора)
+    :param dedupe: Фильтр повторных строк, общий для всех источников
+                   (None — без исключения повторов)
     :return: Экземпляр сформированного отчёта
     """
     report = report_class()
+    kind = get_record_kind(report_class)
+    streams = [path for path in log_files if is_stream_input(path)]
+    tasks = _plan_tasks(
+        [path for path in log_files if path not in streams],
+        query, kind, dedupe,
+    )
     with ThreadPoolExecutor() as tpe:
-        futures = [
-            tpe.submit(parse_log_file, log_file) for log_file in log_files
-        ]
-        for future in as_completed(futures):
-            record = future.result()
-            report.add_data(record)
+        if hasattr(report, "merge"):
+            futures = [
+                tpe.submit(_aggregate, report_class, parse, *args)
+                for parse, args in tasks
+            ]
+            for future in futures:
+                report.merge(future.result())
+        else:
+            futures = [tpe.submit(parse, *args) for parse, args in tasks]
+            for future in futures:
+                report.add_data(future.result())
+    for path in streams:
+        if str(path) == STDIN_MARKER:
+            analyze_stream(
+                sys.stdin.buffer, report, query=query, kind=kind,
+                options=StreamOptions(dedupe=dedupe),
+            )
+            continue
+        with path.open(mode="rb") as stream:
+            analyze_stream(
+                stream, report, query=query, kind=kind,
+                options=StreamOptions(dedupe=dedupe),
+            )
     return report
+
+
+DEADLINE_CHUNK_SIZE = 1024 * 1024
+SPILL_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class Coverage:
+    """
+    Сведения о том, какая часть логов была разобрана.
+
+    Используется анализом с ограничением по времени, чтобы
+    частичный отчёт сопровождался оценкой полноты.
+    """
+
+    files_total: int = 0
+    files_done: int = 0
+    bytes_total: int = 0
+    bytes_parsed: int = 0
+
+    @property
+    def fraction(self) -> float:
+        """
+        Возвращает оценку доли выполненной работы.
+
+        :return: Доля разобранных байтов от 0 до 1
+        """
+        if not self.bytes_total:
+            return 1.0
+        return self.bytes_parsed / self.bytes_total
+
+    def print_coverage(self) -> None:
+        """
+        Выводит сведения о полноте отчёта.
+
+        :return: None
+        """
+        print(f"\nCoverage: files {self.files_done}/{self.files_total}, "
+              f"bytes {self.bytes_parsed}/{self.bytes_total} "
+              f"({self.fraction:.1%})")
+
+
+@dataclass(frozen=True)
+class DeadlineOptions:
+    """
+    Параметры анализа с ограничением по времени.
+
+    chunk_size — размер диапазона в байтах,
+    seed — зерно перемешивания диапазонов.
+    """
+
+    chunk_size: int = DEADLINE_CHUNK_SIZE
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class SpillOptions:
+    """
+    Параметры анализа с ограничением памяти.
+
+    chunk_size — размер диапазона в байтах,
+    directory — каталог временных файлов (None — системный).
+    """
+
+    chunk_size: int = SPILL_CHUNK_SIZE
+    directory: Path | None = None
+
+
+def _parse_range(
+    log_file: Path, start: int, end: int, query: LogQuery | None, kind: str
+) -> list[dict[str, str]]:
+    """
+    Парсит строки лог-файла, начинающиеся в диапазоне байтов.
+
+    :param log_file: Путь к лог-файлу
+    :param start: Смещение начала диапазона
+    :param end: Смещение конца диапазона
+    :param query: Условия отбора записей (None — без отбора)
+    :param kind: Вид записей, ключ LINE_PARSERS
+    :return: Список записей лога
+    """
+    with log_file.open(mode="rb") as file:
+        return parse_chunk(read_block(file, start, end), query, kind)
+
+
+def _split_ranges(
+    log_files: list[Path], chunk_size: int
+) -> list[tuple[Path, int, int]]:
+    """
+    Делит лог-файлы на диапазоны байтов.
+
+    :param log_files: Список путей к лог-файлам
+    :param chunk_size: Размер диапазона в байтах
+    :return: Список диапазонов (файл, начало, конец)
+    """
+    ranges = []
+    for log_file in log_files:
+        size = log_file.stat().st_size
+        ranges.extend(
+            (log_file, start, min(start + chunk_size, size))
+            for start in range(0, size, chunk_size)
+        )
+    return ranges
+
+
+def _run_until(
+    units: list[tuple[Path, int, int]],
+    task: Callable[..., Any],
+    stop_at: float,
+) -> Iterator[tuple[tuple[Path, int, int], Any]]:
+    """
+    Выполняет задачу над диапазонами в пуле потоков до срока.
+
+    В работе держится не больше двух диапазонов на поток; после
+    срока новые диапазоны не запускаются, а ожидающие отменяются.
+
+    :param units: Диапазоны (файл, начало, конец) в порядке запуска
+    :param task: Функция от файла, начала и конца диапазона
+    :param stop_at: Срок по часам time.monotonic()
+    :return: Итератор пар (диапазон, результат) в порядке завершения
+    """
+    workers = min(32, (os.cpu_count() or 1) + 4)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    queued = iter(units)
+    pending: dict = {}
+    try:
+        while True:
+            while len(pending) < workers * 2 and time.monotonic() < stop_at:
+                unit = next(queued, None)
+                if unit is None:
+                    break
+                pending[executor.submit(task, *unit)] = unit
+            if not pending:
+                break
+            done, _ = wait(
+                pending,
+                timeout=max(stop_at - time.monotonic(), 0),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            for future in done:
+                yield pending.pop(future), future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def analyze_with_deadline(
+    log_files: list[Path],
+    report_class: type,
+    deadline: float,
+    query: LogQuery | None = None,
+    options: DeadlineOptions = DeadlineOptions(),
+) -> tuple[Any, Coverage]:
+    """
+    Анализирует лог-файлы не дольше заданного времени.
+
+    Файлы делятся на диапазоны по options.chunk_size байтов, которые
+    обрабатываются в случайном порядке вперемешку из всех файлов.
+    Поэтому любой обработанный к сроку префикс — случайная выборка
+    по всем логам, а не несколько первых файлов целиком. По истечении
+    срока новые диапазоны не запускаются, ожидающие отменяются,
+    а отчёт содержит всё, что успело агрегироваться.
+
+    :param log_files: Список путей к анализируемым лог-файлам
+    :param report_class: Класс отчёта с методами add_data() и print_report()
+    :param deadline: Ограничение времени в секундах
+    :param query: Условия отбора записей (None — без отбора)
+    :param options: Размер диапазона и зерно перемешивания
+    :return: Экземпляр отчёта и сведения о полноте
+    :raises ValueError: Если срок не положительное конечное число
+    """
+    if not 0 < deadline < math.inf:
+        raise ValueError(
+            f"срок должен быть положительным конечным числом: {deadline}"
+        )
+    stop_at = time.monotonic() + deadline
+    report = report_class()
+    units = _split_ranges(log_files, options.chunk_size)
+    random.Random(options.seed).shuffle(units)
+    remaining = Counter(unit[0] for unit in units)
+    coverage = Coverage(
+        files_total=len(log_files),
+        files_done=len(set(log_files) - remaining.keys()),
+        bytes_total=sum(end - start for _, start, end in units),
+    )
+    task = partial(
+        _parse_range, query=query, kind=get_record_kind(report_class)
+    )
+    for (log_file, start, end), records in _run_until(units, task, stop_at):
+        report.add_data(records)
+        coverage.bytes_parsed += end - start
+        remaining[log_file] -= 1
+        coverage.files_done += not remaining[log_file]
+    return report, coverage
+
+
+def analyze_with_memory_limit(
+    log_files: list[Path],
+    report_class: type,
+    memory_limit: int,
+    query: LogQuery | None = None,
+    options: SpillOptions = SpillOptions(),
+) -> Any:
+    """
+    Анализирует лог-файлы, удерживая агрегат в пределах бюджета памяти.
+
+    Файлы разбираются диапазонами по options.chunk_size байтов,
+    число диапазонов в работе ограничено, поэтому память занимают
+    только агрегат и частичные отчёты в работе. В бюджет входят
+    оба: каждый частичный отчёт в работе оценивается размером
+    наибольшего из уже полученных. При ошибке временные файлы
+    удаляются.
+
+    :param log_files: Список путей к лог-файлам
+    :param report_class: Класс отчёта с протоколом сброса
+    :param memory_limit: Бюджет памяти агрегата и частичных отчётов
+                         в байтах
+    :param query: Условия отбора записей (None — без отбора)
+    :param options: Размер диапазона и каталог временных файлов
+    :return: Обычный отчёт, если сброс не понадобился, иначе SpilledReport
+    """
+    units = iter(_split_ranges(log_files, options.chunk_size))
+    report = report_class()
+    store = SpillStore(report_class, options.directory)
+    workers = min(32, (os.cpu_count() or 1) + 4)
+    pending: set = set()
+    peak = 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                for unit in islice(units, workers - len(pending)):
+                    pending.add(executor.submit(
+                        _aggregate, report_class, _parse_range,
+                        *unit, query, get_record_kind(report_class),
+                    ))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    peak = max(peak, future.result().memory_usage())
+                    report.merge(future.result())
+                    if report.memory_usage() + len(pending) * peak > (
+                        memory_limit
+                    ):
+                        store.spill(report)
+                        report = report_class()
+    except BaseException:
+        store.close()
+        raise
+    if not store.runs:
+        return report
+    return SpilledReport(store, report)
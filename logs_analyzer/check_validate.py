@@ -3,11 +3,15 @@
 import sys
 from pathlib import Path
 
+from logs_analyzer.stream import is_stream_input
+
 
 def validate_files(paths: list[Path]) -> bool:
     """
     Проверяет, что все пути в списке указывают на существующие файлы.
 
+    Потоковые источники ('-' и именованные каналы) считаются валидными.
+
     Если хотя бы один файл не найден, выводит сообщение об ошибке
     в stderr и возвращает False.
 
@@ -16,6 +20,8 @@ def validate_files(paths: list[Path]) -> bool:
     """
     all_exist = True
     for path in paths:
+        if is_stream_input(path):
+            continue
         if not path.is_file():
             print(f"Ошибка пути {path}. Файл не найден", file=sys.stderr)
             return False
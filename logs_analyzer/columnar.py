@@ -0,0 +1,280 @@
+"""
+Модуль колоночного хранения записей на NumPy.
+
+Логи разбираются один раз в массивы (id обработчика, уровень, время,
+статус), после чего отчёты считаются векторно через bincount.
+Набор данных можно сохранить в .npz и загрузить без повторного парсинга.
+Движок необязателен и доступен только при установленном NumPy.
+"""
+
+import sys
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from logs_analyzer.logs_parser import (LogQuery, iter_request_rows,
+                                       timestamp_to_epoch)
+from logs_analyzer.reports.handlers import LOG_LEVELS
+from logs_analyzer.stream import STDIN_MARKER
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - зависит от окружения
+    np = None
+
+LEVEL_CODES = {level: code for code, level in enumerate(LOG_LEVELS)}
+UNKNOWN_LEVEL = -1
+NO_STATUS = 0
+COLUMNS = {
+    "handler_id": ("i", "int32"),
+    "level": ("b", "int8"),
+    "ts": ("q", "int64"),
+    "status": ("H", "uint16"),
+}
+
+
+def require_numpy() -> None:
+    """
+    Проверяет, что NumPy установлен.
+
+    :return: None
+    :raises RuntimeError: Если NumPy недоступен
+    """
+    if np is None:
+        raise RuntimeError(
+            "движок numpy недоступен: установите пакет numpy"
+        )
+
+
+class ColumnarDataset:
+    """
+    Колоночный набор записей 'django.request'.
+
+    Хранит массивы одинаковой длины:
+    - handler_id (int32): номер обработчика в списке handlers
+    - level (int8): номер уровня в LOG_LEVELS, -1 для прочих уровней
+    - ts (int64): время записи в секундах эпохи
+    - status (uint16): HTTP-статус, 0 если статуса нет
+    """
+
+    def __init__(self, handlers: list[str], **columns: Any) -> None:
+        """
+        Инициализирует набор данных из готовых массивов.
+
+        :param handlers: Словарь обработчиков (номер -> путь)
+        :param columns: Массивы с именами из COLUMNS: handler_id,
+                        level, ts и status
+        """
+        require_numpy()
+        self.handlers = handlers
+        self.handler_id = np.asarray(columns["handler_id"], dtype=np.int32)
+        self.level = np.asarray(columns["level"], dtype=np.int8)
+        self.ts = np.asarray(columns["ts"], dtype=np.int64)
+        self.status = np.asarray(columns["status"], dtype=np.uint16)
+
+    def __len__(self) -> int:
+        """
+        Возвращает количество записей.
+
+        :return: Длина колонок
+        """
+        return len(self.handler_id)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "ColumnarDataset":
+        """
+        Разбирает строки лога в колонки.
+
+        :param lines: Итерируемый набор строк лога
+        :return: Новый набор данных
+        """
+        return cls.from_sources([lines])
+
+    @classmethod
+    def from_sources(
+        cls, sources: Iterable[Iterable[str]]
+    ) -> "ColumnarDataset":
+        """
+        Разбирает несколько источников строк в общий набор колонок.
+
+        Колонки накапливаются в компактных array без промежуточных
+        словарей и переводятся в массивы NumPy без копирования.
+
+        :param sources: Источники строк (файлы, потоки, списки)
+        :return: Новый набор данных
+        """
+        require_numpy()
+        handler_ids: dict[str, int] = {}
+        columns = {
+            name: array(typecode) for name, (typecode, _) in COLUMNS.items()
+        }
+        handler_col, level_col, ts_col, status_col = columns.values()
+        for lines in sources:
+            for stamp, level, handler, _, status, _ in iter_request_rows(
+                lines
+            ):
+                handler_col.append(
+                    handler_ids.setdefault(handler, len(handler_ids))
+                )
+                level_col.append(LEVEL_CODES.get(level, UNKNOWN_LEVEL))
+                ts_col.append(stamp)
+                status_col.append(status or NO_STATUS)
+        return cls(
+            sorted(handler_ids, key=handler_ids.get),
+            **{
+                name: np.frombuffer(column, dtype=column.typecode)
+                if column else []
+                for name, column in columns.items()
+            },
+        )
+
+    @classmethod
+    def from_files(cls, paths: list[Path]) -> "ColumnarDataset":
+        """
+        Разбирает лог-файлы (и '-' — стандартный ввод) в колонки.
+
+        :param paths: Список путей к лог-файлам
+        :return: Новый набор данных
+        """
+        handles = [
+            sys.stdin if str(path) == STDIN_MARKER
+            else path.open(mode="r", encoding="utf-8")
+            for path in paths
+        ]
+        try:
+            return cls.from_sources(handles)
+        finally:
+            for handle in handles:
+                if handle is not sys.stdin:
+                    handle.close()
+
+    def save(self, path: Path) -> None:
+        """
+        Сохраняет набор данных в файл .npz.
+
+        :param path: Путь к файлу
+        :return: None
+        """
+        with path.open(mode="wb") as file:
+            np.savez(
+                file,
+                handlers=np.array(self.handlers, dtype=str),
+                **{name: getattr(self, name) for name in COLUMNS},
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "ColumnarDataset":
+        """
+        Загружает набор данных из файла .npz.
+
+        :param path: Путь к файлу
+        :return: Загруженный набор данных
+        """
+        require_numpy()
+        with np.load(path) as data:
+            return cls(
+                np.asarray(data["handlers"], dtype=str).tolist(),
+                **{name: data[name] for name in COLUMNS},
+            )
+
+    def filter(self, query: LogQuery | None) -> "ColumnarDataset":
+        """
+        Отбирает записи по условиям запроса векторной маской.
+
+        :param query: Условия отбора записей (None — без отбора)
+        :return: Новый набор данных с отобранными записями
+        """
+        if query is None:
+            return self
+        mask = np.ones(len(self), dtype=bool)
+        if query.handler:
+            if query.handler not in self.handlers:
+                mask[:] = False
+            else:
+                mask &= self.handler_id == self.handlers.index(query.handler)
+        if query.since:
+            mask &= self.ts >= timestamp_to_epoch(query.since)
+        if query.until:
+            mask &= self.ts < timestamp_to_epoch(query.until)
+        if query.level:
+            mask &= self.level == LEVEL_CODES.get(query.level, UNKNOWN_LEVEL)
+        if query.handler_prefix:
+            matching = [
+                number for number, handler in enumerate(self.handlers)
+                if handler.startswith(query.handler_prefix)
+            ]
+            mask &= np.isin(self.handler_id, matching)
+        if query.status is not None:
+            mask &= self.status == query.status
+        return ColumnarDataset(
+            self.handlers,
+            **{name: getattr(self, name)[mask] for name in COLUMNS},
+        )
+
+    def handler_level_counts(self) -> Any:
+        """
+        Считает матрицу 'обработчик x уровень' одним вызовом bincount.
+
+        Записи с уровнями вне LOG_LEVELS не учитываются.
+
+        :return: Массив формы (число обработчиков, число уровней)
+        """
+        known = self.level >= 0
+        width = len(LOG_LEVELS)
+        cells = (
+            self.handler_id[known].astype(np.int64) * width
+            + self.level[known]
+        )
+        return np.bincount(
+            cells, minlength=len(self.handlers) * width
+        ).reshape(len(self.handlers), width)
+
+    def to_report(self, report_class: type) -> Any:
+        """
+        Формирует отчёт по агрегатам набора данных.
+
+        Отчёт получает готовые счётчики через add_counts(), поэтому
+        цикл на Python идёт только по ненулевым ячейкам матрицы.
+
+        :param report_class: Класс отчёта с методом add_counts()
+        :return: Экземпляр сформированного отчёта
+        """
+        matrix = self.handler_level_counts()
+        report = report_class()
+        report.add_counts(
+            (self.handlers[row], LOG_LEVELS[col], int(matrix[row, col]))
+            for row, col in zip(*np.nonzero(matrix))
+        )
+        return report
+
+
+def analyze_columnar(
+    log_files: list[Path],
+    report_class: type,
+    query: LogQuery | None = None,
+    dataset: Path | None = None,
+    save_to: Path | None = None,
+) -> Any:
+    """
+    Формирует отчёт колоночным движком.
+
+    Набор данных загружается из файла dataset, если он указан,
+    иначе разбирается из лог-файлов и при необходимости сохраняется.
+
+    :param log_files: Список путей к лог-файлам
+    :param report_class: Класс отчёта с методом add_counts()
+    :param query: Условия отбора записей (None — без отбора)
+    :param dataset: Путь к сохранённому набору данных .npz
+    :param save_to: Путь для сохранения разобранного набора данных
+    :return: Экземпляр сформированного отчёта
+    :raises RuntimeError: Если NumPy недоступен
+    """
+    require_numpy()
+    if dataset is not None:
+        columns = ColumnarDataset.load(dataset)
+    else:
+        columns = ColumnarDataset.from_files(log_files)
+    if save_to is not None:
+        columns.save(save_to)
+    return columns.filter(query).to_report(report_class)
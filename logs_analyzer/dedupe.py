@@ -0,0 +1,278 @@
+"""
+Модуль исключения повторно присланных логов и строк.
+
+Одинаковые файлы определяются по размеру и хешу нескольких фрагментов.
+Повторные строки отбрасываются масштабируемым фильтром Блума:
+память растёт с числом уникальных строк логарифмически по слоям,
+а доля ложных срабатываний ограничена заданной вероятностью.
+
+Источник (файл или поток) сам может содержать одинаковые строки,
+например одно событие, записанное дважды в ту же миллисекунду.
+Поэтому отбрасываются только повторы между источниками: строка,
+встреченная в источниках k1, k2, ... раз, учитывается max(k1, k2, ...)
+раз (SourceFilter).
+"""
+
+import hashlib
+import math
+import sys
+import threading
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+SAMPLE_SIZE = 64 * 1024
+INITIAL_CAPACITY = 1_000_000
+SOURCE_CAPACITY = 64 * 1024
+ERROR_RATE = 0.001
+
+
+def file_fingerprint(path: Path) -> tuple[int, str]:
+    """
+    Считает отпечаток файла по размеру и фрагментам содержимого.
+
+    Хешируются начало, середина и конец файла, поэтому отпечаток
+    многогигабайтного файла считается за три чтения.
+
+    :param path: Путь к файлу
+    :return: Размер файла и хеш фрагментов
+    """
+    size = path.stat().st_size
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open(mode="rb") as file:
+        for offset in (0, max(size // 2 - SAMPLE_SIZE // 2, 0),
+                       max(size - SAMPLE_SIZE, 0)):
+            file.seek(offset)
+            digest.update(file.read(SAMPLE_SIZE))
+    return size, digest.hexdigest()
+
+
+def drop_duplicate_files(paths: list[Path]) -> list[Path]:
+    """
+    Убирает из списка файлы с одинаковым содержимым.
+
+    Хеш считается только для файлов, размер которых совпал
+    с размером другого файла. О пропущенных файлах сообщается в stderr.
+
+    :param paths: Список путей к лог-файлам
+    :return: Список без повторов, в исходном порядке
+    """
+    by_size: dict[int, list[Path]] = {}
+    for path in paths:
+        by_size.setdefault(path.stat().st_size, []).append(path)
+    seen: dict[tuple[int, str], Path] = {}
+    unique = []
+    for path in paths:
+        if len(by_size[path.stat().st_size]) > 1:
+            fingerprint = file_fingerprint(path)
+            if fingerprint in seen:
+                print(f"Пропущен дубликат {path} (совпадает с "
+                      f"{seen[fingerprint]})", file=sys.stderr)
+                continue
+            seen[fingerprint] = path
+        unique.append(path)
+    return unique
+
+
+def hash_pair(item: bytes) -> tuple[int, int]:
+    """
+    Считает два независимых хеша элемента для двойного хеширования.
+
+    :param item: Элемент в байтах
+    :return: Пара 64-битных хешей (второй всегда нечётный)
+    """
+    digest = hashlib.blake2b(item, digest_size=16).digest()
+    return (
+        int.from_bytes(digest[:8], "little"),
+        int.from_bytes(digest[8:], "little") | 1,
+    )
+
+
+class BloomFilter:
+    """
+    Класс фильтра Блума фиксированной ёмкости.
+
+    Позиции битов получаются двойным хешированием из пары хешей,
+    которая считается один раз на элемент для всех слоёв.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """
+        Инициализирует битовый массив под ёмкость и вероятность ошибки.
+
+        :param capacity: Ожидаемое число уникальных элементов
+        :param error_rate: Допустимая доля ложных срабатываний
+        """
+        self.capacity = capacity
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, math.ceil(-math.log2(error_rate)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, first: int, second: int) -> list[int]:
+        """
+        Вычисляет позиции битов элемента.
+
+        :param first: Первый хеш элемента
+        :param second: Второй хеш элемента
+        :return: Номера битов
+        """
+        size = self.size
+        return [(first + step * second) % size for step in range(self.hashes)]
+
+    def contains(self, positions: list[int]) -> bool:
+        """
+        Проверяет, установлены ли все биты (с возможной ложной тревогой).
+
+        :param positions: Номера битов элемента
+        :return: True, если элемент, вероятно, уже добавлен
+        """
+        bits = self.bits
+        return all(bits[pos >> 3] >> (pos & 7) & 1 for pos in positions)
+
+    def add(self, positions: list[int]) -> None:
+        """
+        Устанавливает биты элемента.
+
+        :param positions: Номера битов элемента
+        :return: None
+        """
+        bits = self.bits
+        for pos in positions:
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+
+class ScalableBloomFilter:
+    """
+    Класс масштабируемого фильтра Блума.
+
+    Когда текущий слой заполнен, добавляется новый слой с удвоенной
+    ёмкостью и вдвое меньшей вероятностью ошибки, поэтому сумма
+    вероятностей ложного срабатывания по слоям остаётся около error_rate.
+    Методы потокобезопасны.
+    """
+
+    GROWTH = 2
+    TIGHTENING = 0.5
+
+    def __init__(
+        self,
+        error_rate: float = ERROR_RATE,
+        initial_capacity: int = INITIAL_CAPACITY,
+    ) -> None:
+        """
+        Инициализирует фильтр с одним слоем.
+
+        :param error_rate: Допустимая общая доля ложных срабатываний
+        :param initial_capacity: Ёмкость первого слоя
+        :raises ValueError: Если вероятность ошибки вне (0, 1)
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError(
+                f"вероятность ошибки должна быть в (0, 1): {error_rate}"
+            )
+        self.error_rate = error_rate
+        self.filters = [BloomFilter(
+            initial_capacity, error_rate * (1 - self.TIGHTENING)
+        )]
+        self._lock = threading.Lock()
+
+    def add(self, item: bytes) -> bool:
+        """
+        Добавляет элемент, если он ещё не встречался.
+
+        :param item: Элемент в байтах
+        :return: True, если элемент новый
+        """
+        first, second = hash_pair(item)
+        with self._lock:
+            layer = self.filters[-1]
+            positions = layer.positions(first, second)
+            if layer.contains(positions):
+                return False
+            for older in self.filters[:-1]:
+                if older.contains(older.positions(first, second)):
+                    return False
+            if layer.count >= layer.capacity:
+                layer = BloomFilter(
+                    layer.capacity * self.GROWTH,
+                    self.error_rate * (1 - self.TIGHTENING)
+                    * self.TIGHTENING ** len(self.filters),
+                )
+                self.filters.append(layer)
+                positions = layer.positions(first, second)
+            layer.add(positions)
+            return True
+
+    def source(self) -> "SourceFilter":
+        """
+        Создаёт фильтр строк отдельного источника поверх этого фильтра.
+
+        :return: Фильтр источника
+        """
+        return SourceFilter(self)
+
+
+class SourceFilter:
+    """
+    Класс фильтра строк одного источника поверх общего фильтра.
+
+    Номер вхождения строки в источнике определяется пробами
+    собственного фильтра Блума: пары (строка, 1), (строка, 2), ...
+    добавляются, пока не найдётся новая. Поэтому память источника
+    ограничена фильтром и не зависит от длины и числа строк, а k-е
+    вхождение строки стоит k проб. В общий фильтр добавляется пара
+    (строка, номер вхождения).
+    """
+
+    def __init__(self, shared: ScalableBloomFilter) -> None:
+        """
+        Инициализирует фильтр источника.
+
+        :param shared: Фильтр, общий для всех источников
+        """
+        self.shared = shared
+        self.seen = ScalableBloomFilter(shared.error_rate, SOURCE_CAPACITY)
+
+    def add(self, item: bytes) -> bool:
+        """
+        Добавляет очередное вхождение строки источника.
+
+        :param item: Строка без перевода строки
+        :return: True, если в других источниках строка встречалась
+                 реже, чем уже встретилась в этом
+        """
+        occurrence = item
+        number = 1
+        while not self.seen.add(occurrence):
+            number += 1
+            occurrence = item + b"\n%d" % number
+        return self.shared.add(occurrence)
+
+    def unique_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        Пропускает строки, кроме учтённых в других источниках.
+
+        Перевод строки не учитывается, поэтому последняя строка файла
+        без перевода строки совпадает с такой же строкой в середине.
+
+        :param lines: Строки источника по порядку
+        :return: Итератор новых строк
+        """
+        for line in lines:
+            if self.add(line.rstrip("\r\n").encode()):
+                yield line
+
+    def unique_chunk(self, chunk: bytes) -> bytes:
+        """
+        Убирает из блока байтов строки, учтённые в других источниках.
+
+        :param chunk: Очередной блок источника, выровненный по строкам
+        :return: Блок только с новыми строками
+        """
+        return b"".join(
+            line for line in chunk.splitlines(keepends=True)
+            if self.add(line.rstrip(b"\r\n"))
+        )
@@ -0,0 +1,174 @@
+"""
+Модуль потокового выделения шаблонов сообщений в стиле Drain.
+
+Сообщение разбивается на токены и спускается по дереву фиксированной
+глубины: сначала по числу токенов, затем по первым токенам. В листе
+хранится ограниченный список кластеров, сообщение присоединяется
+к наиболее похожему шаблону, а различающиеся позиции шаблона
+заменяются на '<*>'. Кеш недавних сообщений отвечает на повторы
+без обхода дерева, поэтому стоимость строки близка к O(1).
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+WILDCARD = "<*>"
+
+
+@dataclass(frozen=True)
+class DrainConfig:
+    """
+    Параметры дерева майнера.
+
+    depth — глубина дерева (уровень длины + токены префикса + лист),
+    similarity — минимальная доля совпавших токенов для кластера,
+    max_children — максимум потомков узла дерева,
+    max_clusters — максимум кластеров в листе,
+    cache_size — размер кеша недавних сообщений.
+    """
+
+    depth: int = 4
+    similarity: float = 0.5
+    max_children: int = 100
+    max_clusters: int = 32
+    cache_size: int = 4096
+
+
+@dataclass(slots=True)
+class LogCluster:
+    """
+    Кластер сообщений с общим шаблоном.
+
+    Хранит номер кластера, токены шаблона и число сообщений.
+    """
+
+    cluster_id: int
+    tokens: list[str]
+    size: int = 0
+
+    @property
+    def template(self) -> str:
+        """
+        Возвращает шаблон кластера строкой.
+
+        :return: Токены шаблона через пробел
+        """
+        return " ".join(self.tokens)
+
+
+def _mask(token: str) -> str:
+    """
+    Заменяет токены с цифрами на '<*>' при спуске по дереву.
+
+    Числа, идентификаторы и адреса почти всегда переменные,
+    и ветвиться по ним бессмысленно.
+
+    :param token: Токен сообщения
+    :return: Токен или '<*>'
+    """
+    return WILDCARD if any(char.isdigit() for char in token) else token
+
+
+class DrainMiner:
+    """
+    Потоковый майнер шаблонов с деревом префиксов фиксированной глубины.
+
+    Число узлов на уровне и кластеров в листе ограничено, поэтому
+    обработка одного сообщения не зависит от объёма уже увиденных.
+    """
+
+    def __init__(self, config: DrainConfig = DrainConfig()) -> None:
+        """
+        Инициализирует пустое дерево.
+
+        :param config: Параметры дерева
+        """
+        self.config = config
+        self.root: dict[int, dict] = {}
+        self.clusters: list[LogCluster] = []
+        self._cache: OrderedDict[str, LogCluster] = OrderedDict()
+
+    def _leaf(self, tokens: list[str]) -> list[LogCluster]:
+        """
+        Спускается по дереву к листу для последовательности токенов.
+
+        Если у узла уже max_children потомков, новые токены
+        направляются в общую ветку '<*>'.
+
+        :param tokens: Токены сообщения
+        :return: Список кластеров листа
+        """
+        node = self.root.setdefault(len(tokens), {})
+        for token in tokens[:max(self.config.depth - 2, 1)]:
+            key = _mask(token)
+            if key not in node and len(node) >= self.config.max_children:
+                key = WILDCARD
+            node = node.setdefault(key, {})
+        return node.setdefault(None, [])
+
+    @staticmethod
+    def _score(template: list[str], tokens: list[str]) -> float:
+        """
+        Считает долю позиций, где шаблон совпадает с сообщением.
+
+        :param template: Токены шаблона
+        :param tokens: Токены сообщения той же длины
+        :return: Доля совпадений от 0 до 1
+        """
+        if not tokens:
+            return 1.0
+        same = sum(
+            1 for left, right in zip(template, tokens)
+            if left in (right, WILDCARD)
+        )
+        return same / len(tokens)
+
+    def add(self, message: str, count: int = 1) -> LogCluster:
+        """
+        Относит сообщение к кластеру и обновляет его шаблон.
+
+        :param message: Текст сообщения
+        :param count: Сколько раз сообщение встретилось
+        :return: Кластер, к которому отнесено сообщение
+        """
+        cluster = self._cache.get(message)
+        if cluster is not None:
+            self._cache.move_to_end(message)
+            cluster.size += count
+            return cluster
+
+        tokens = message.split()
+        leaf = self._leaf(tokens)
+        best, best_score = None, -1.0
+        for candidate in leaf:
+            score = self._score(candidate.tokens, tokens)
+            if score > best_score:
+                best, best_score = candidate, score
+        if best is not None and (
+            best_score >= self.config.similarity
+            or len(leaf) >= self.config.max_clusters
+        ):
+            best.tokens = [
+                left if left == right else WILDCARD
+                for left, right in zip(best.tokens, tokens)
+            ]
+            cluster = best
+        else:
+            cluster = LogCluster(len(self.clusters), tokens)
+            self.clusters.append(cluster)
+            leaf.append(cluster)
+
+        self._cache[message] = cluster
+        if len(self._cache) > self.config.cache_size:
+            self._cache.popitem(last=False)
+        cluster.size += count
+        return cluster
+
+    def template(self, cluster_id: int) -> str:
+        """
+        Возвращает текущий шаблон кластера.
+
+        :param cluster_id: Номер кластера
+        :return: Токены шаблона через пробел
+        """
+        return self.clusters[cluster_id].template
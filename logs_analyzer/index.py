@@ -0,0 +1,253 @@
+"""
+Модуль индексных файлов-спутников для выборочного чтения логов.
+
+Индекс лежит рядом с логом ('app1.log.idx') и хранит смещения блоков
+строк, диапазон времени каждого блока, словарь обработчиков и битовую
+карту обработчиков, встречающихся в блоке. Запросы с отбором по
+обработчику или времени читают только подходящие блоки.
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from logs_analyzer.logs_parser import (DEFAULT_KIND, TIMESTAMP_WIDTH, LogQuery,
+                                       parse_chunk, parse_lines, read_block)
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+BLOCK_SIZE = 256 * 1024
+TAIL_HASH_SIZE = 4096
+
+
+def index_path(path: Path) -> Path:
+    """
+    Возвращает путь индексного файла для лога.
+
+    :param path: Путь к лог-файлу
+    :return: Путь к индексу рядом с логом
+    """
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def _tail_hash(file: BinaryIO, size: int) -> str:
+    """
+    Считает хеш последних байтов проиндексированной части файла.
+
+    По нему проверяется, что файл только дописывался,
+    а не был перезаписан.
+
+    :param file: Файл, открытый в бинарном режиме
+    :param size: Размер проиндексированной части
+    :return: Хеш в шестнадцатеричном виде
+    """
+    start = max(size - TAIL_HASH_SIZE, 0)
+    file.seek(start)
+    return hashlib.blake2b(
+        file.read(size - start), digest_size=16
+    ).hexdigest()
+
+
+def _summarize_block(
+    start: int, end: int, lines: list[bytes], handlers: dict[str, int]
+) -> list:
+    """
+    Формирует описание блока строк.
+
+    :param start: Смещение начала блока
+    :param end: Смещение конца блока
+    :param lines: Строки блока в байтах
+    :param handlers: Словарь 'обработчик -> номер', дополняется на месте
+    :return: [начало, конец, мин. время, макс. время, битовая карта]
+    """
+    text = b"".join(lines).decode("utf-8", errors="replace").splitlines()
+    stamps = [line[:TIMESTAMP_WIDTH] for line in text if line[:1].isdigit()]
+    bitmap = 0
+    for record in parse_lines(text):
+        bitmap |= 1 << handlers.setdefault(record["handler"], len(handlers))
+    return [
+        start,
+        end,
+        min(stamps, default=""),
+        max(stamps, default=""),
+        format(bitmap, "x"),
+    ]
+
+
+def _scan_blocks(
+    file: BinaryIO, start: int, block_size: int, handlers: dict[str, int]
+) -> tuple[list[list], int]:
+    """
+    Разбивает файл, начиная со смещения, на блоки строк.
+
+    Незавершённая последняя строка в индекс не попадает:
+    её проиндексирует следующее обновление.
+
+    :param file: Файл, открытый в бинарном режиме
+    :param start: Смещение, с которого начинается сканирование
+    :param block_size: Примерный размер блока в байтах
+    :param handlers: Словарь 'обработчик -> номер', дополняется на месте
+    :return: Список блоков и смещение конца проиндексированной части
+    """
+    file.seek(start)
+    blocks = []
+    block_start = offset = start
+    lines: list[bytes] = []
+    for raw in file:
+        if not raw.endswith(b"\n"):
+            break
+        lines.append(raw)
+        offset += len(raw)
+        if offset - block_start >= block_size:
+            blocks.append(
+                _summarize_block(block_start, offset, lines, handlers)
+            )
+            block_start, lines = offset, []
+    if lines:
+        blocks.append(_summarize_block(block_start, offset, lines, handlers))
+    return blocks, offset
+
+
+def load_index(path: Path) -> dict[str, Any] | None:
+    """
+    Загружает индекс лога, если он соответствует файлу.
+
+    Индекс используется, если размер и время изменения файла совпадают
+    с записанными, либо если файл только вырос и хеш конца
+    проиндексированной части не изменился. Устаревший индекс
+    игнорируется с предупреждением в stderr.
+
+    :param path: Путь к лог-файлу
+    :return: Содержимое индекса или None
+    """
+    idx = index_path(path)
+    if not idx.is_file():
+        return None
+    try:
+        index = json.loads(idx.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        index = {}
+    if index.get("version") != INDEX_VERSION:
+        print(f"Индекс {idx} повреждён и не используется", file=sys.stderr)
+        return None
+    stat = path.stat()
+    if (stat.st_size, stat.st_mtime_ns) == (index["size"], index["mtime_ns"]):
+        return index
+    if stat.st_size >= index["size"]:
+        with path.open(mode="rb") as file:
+            if _tail_hash(file, index["size"]) == index["tail_hash"]:
+                return index
+    print(f"Индекс {idx} устарел и не используется", file=sys.stderr)
+    return None
+
+
+def build_index(path: Path, block_size: int = BLOCK_SIZE) -> dict[str, Any]:
+    """
+    Создаёт или дополняет индекс лог-файла.
+
+    Если файл с момента прошлой индексации только дописывался,
+    сканируется лишь новая часть, а новые блоки добавляются
+    к существующим.
+
+    :param path: Путь к лог-файлу
+    :param block_size: Примерный размер блока в байтах
+    :return: Содержимое записанного индекса
+    """
+    index = load_index(path)
+    if index is None or index["block_size"] != block_size:
+        index = {"size": 0, "handlers": [], "blocks": []}
+    handlers = {name: pos for pos, name in enumerate(index["handlers"])}
+    with path.open(mode="rb") as file:
+        blocks, size = _scan_blocks(file, index["size"], block_size, handlers)
+        tail_hash = _tail_hash(file, size)
+    index = {
+        "version": INDEX_VERSION,
+        "size": size,
+        "mtime_ns": path.stat().st_mtime_ns,
+        "tail_hash": tail_hash,
+        "block_size": block_size,
+        "handlers": sorted(handlers, key=handlers.get),
+        "blocks": index["blocks"] + blocks,
+    }
+    index_path(path).write_text(
+        json.dumps(index, ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    return index
+
+
+def select_blocks(
+    index: dict[str, Any], query: LogQuery
+) -> list[tuple[int, int]]:
+    """
+    Отбирает блоки индекса, которые могут содержать нужные записи.
+
+    Соседние блоки объединяются в один диапазон для чтения.
+
+    :param index: Содержимое индекса
+    :param query: Условия отбора записей
+    :return: Список диапазонов байтов (начало, конец)
+    """
+    mask = None
+    if query.handler is not None:
+        if query.handler not in index["handlers"]:
+            return []
+        mask = 1 << index["handlers"].index(query.handler)
+    elif query.handler_prefix:
+        mask = sum(
+            1 << number for number, handler in enumerate(index["handlers"])
+            if handler.startswith(query.handler_prefix)
+        )
+        if not mask:
+            return []
+    ranges: list[tuple[int, int]] = []
+    for start, end, min_ts, max_ts, bitmap in index["blocks"]:
+        if mask is not None and not int(bitmap, 16) & mask:
+            continue
+        if query.since and max_ts < query.since:
+            continue
+        if query.until and min_ts and min_ts >= query.until:
+            continue
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+    return ranges
+
+
+def parse_indexed(
+    path: Path, query: LogQuery, kind: str = DEFAULT_KIND
+) -> list[dict[str, str]] | None:
+    """
+    Парсит только блоки лога, подходящие под условия отбора.
+
+    Часть файла, дописанная после индексации, читается целиком.
+    Карта обработчиков строится по записям 'django.request', поэтому
+    для других видов записей отбор по имени логгера индекс не ускоряет.
+
+    :param path: Путь к лог-файлу
+    :param query: Условия отбора записей
+    :param kind: Вид записей, ключ LINE_PARSERS
+    :return: Список записей или None, если пригодного индекса нет
+    """
+    index = load_index(path)
+    if index is None:
+        return None
+    if kind != DEFAULT_KIND and (
+        query.handler not in (None, *index["handlers"])
+        or (query.handler_prefix and not query.handler_prefix.startswith("/"))
+    ):
+        return None
+    ranges = select_blocks(index, query)
+    size = path.stat().st_size
+    if size > index["size"]:
+        ranges.append((index["size"], size))
+    records = []
+    with path.open(mode="rb") as file:
+        for start, end in ranges:
+            records.extend(parse_chunk(
+                read_block(file, start, end), query, kind
+            ))
+    return records
@@ -0,0 +1,298 @@
+"""
+Модуль загрузки записей 'django.request' в SQLite.
+
+Записи потоково извлекаются парсером и вставляются крупными пачками
+через executemany в режиме WAL. Пути обработчиков хранятся один раз
+в таблице-словаре handlers, а индексы строятся после загрузки.
+Загруженные файлы запоминаются в таблице files по пути, размеру
+и отпечатку содержимого: неизменный файл и его копия повторно
+не загружаются, а записи изменившегося файла заменяются.
+"""
+
+import os
+import sqlite3
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any
+
+from logs_analyzer.dedupe import file_fingerprint
+from logs_analyzer.logs_parser import (LogQuery, RequestRow,
+                                       parse_request_rows, timestamp_to_epoch)
+from logs_analyzer.stream import iter_batches, make_executor
+
+BATCH_SIZE = 100_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS handlers (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS requests (
+    ts INTEGER NOT NULL,
+    level TEXT NOT NULL,
+    handler_id INTEGER NOT NULL REFERENCES handlers (id),
+    method TEXT,
+    status INTEGER,
+    ip TEXT,
+    file_id INTEGER REFERENCES files (id)
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+"""
+REQUIRED_TABLES = frozenset({"handlers", "requests"})
+
+INDEXES = {
+    "requests_handler_level": "requests (handler_id, level)",
+    "requests_ts": "requests (ts)",
+}
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """
+    Открывает базу данных и создаёт схему при необходимости.
+
+    :param db_path: Путь к файлу SQLite
+    :return: Соединение с базой данных
+    """
+    connection = sqlite3.connect(db_path)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def connect_readonly(db_path: Path) -> sqlite3.Connection:
+    """
+    Открывает существующую базу только для чтения.
+
+    :param db_path: Путь к файлу SQLite
+    :return: Соединение с базой данных
+    :raises ValueError: Если в базе нет таблиц подкоманды ingest
+    """
+    connection = sqlite3.connect(
+        f"{db_path.resolve().as_uri()}?mode=ro", uri=True
+    )
+    tables = {
+        row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+    }
+    if not REQUIRED_TABLES <= tables:
+        connection.close()
+        raise ValueError(
+            f"{db_path} не содержит данных подкоманды ingest"
+        )
+    return connection
+
+
+def _register_file(
+    connection: sqlite3.Connection, log_file: Path
+) -> int | None:
+    """
+    Запоминает загружаемый файл и решает, нужно ли его загружать.
+
+    Файл пропускается, если он уже загружен без изменений или
+    совпадает по содержимому с другим загруженным файлом.
+    Если файл по тому же пути изменился, его прежние записи удаляются.
+    О пропуске и замене сообщается в stderr.
+
+    :param connection: Соединение с базой данных
+    :param log_file: Путь к лог-файлу
+    :return: id файла в таблице files или None, если файл пропускается
+    """
+    path = str(log_file.resolve())
+    size, digest = file_fingerprint(log_file)
+    mtime_ns = log_file.stat().st_mtime_ns
+    same = connection.execute(
+        "SELECT path FROM files WHERE size = ? AND digest = ?",
+        (size, digest),
+    ).fetchone()
+    if same is not None:
+        print(f"Пропущен {log_file}: уже загружен"
+              + ("" if same[0] == path else f" как {same[0]}"),
+              file=sys.stderr)
+        return None
+    row = connection.execute(
+        "SELECT id FROM files WHERE path = ?", (path,)
+    ).fetchone()
+    if row is None:
+        return connection.execute(
+            "INSERT INTO files (path, size, mtime_ns, digest) "
+            "VALUES (?, ?, ?, ?)",
+            (path, size, mtime_ns, digest),
+        ).lastrowid
+    print(f"Файл {log_file} изменился, его записи загружаются заново",
+          file=sys.stderr)
+    connection.execute("DELETE FROM requests WHERE file_id = ?", row)
+    connection.execute(
+        "UPDATE files SET size = ?, mtime_ns = ?, digest = ? WHERE id = ?",
+        (size, mtime_ns, digest, row[0]),
+    )
+    return row[0]
+
+
+def _iter_file_rows(
+    log_file: Path, executor: Executor, in_flight: int
+) -> Iterator[RequestRow]:
+    """
+    Потоково извлекает записи из файла, разбирая блоки в воркерах.
+
+    Блоки отдаются воркерам по мере чтения, а записи возвращаются
+    в исходном порядке; число блоков в работе ограничено.
+
+    :param log_file: Путь к лог-файлу
+    :param executor: Пул воркеров для разбора блоков
+    :param in_flight: Максимальное число блоков в работе
+    :return: Итератор кортежей с полями запроса
+    """
+    pending: deque = deque()
+    with log_file.open(mode="rb") as file:
+        for batch in iter_batches(file):
+            pending.append(executor.submit(parse_request_rows, batch))
+            if len(pending) >= in_flight:
+                yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def _insert_rows(
+    connection: sqlite3.Connection,
+    rows: Iterable[RequestRow],
+    handler_ids: dict[str, int],
+    file_id: int,
+) -> int:
+    """
+    Вставляет записи пачками, подменяя пути обработчиков их id.
+
+    Новые обработчики сразу добавляются в таблицу-словарь.
+
+    :param connection: Соединение с базой данных
+    :param rows: Записи, полученные из parse_request_rows
+    :param handler_ids: Словарь 'путь -> id', дополняется на месте
+    :param file_id: id файла, из которого взяты записи
+    :return: Количество вставленных записей
+    """
+    insert = (
+        "INSERT INTO requests "
+        "(ts, level, handler_id, method, status, ip, file_id) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)"
+    )
+    total = 0
+    batch = []
+    for stamp, level, handler, method, status, address in rows:
+        handler_id = handler_ids.get(handler)
+        if handler_id is None:
+            handler_id = connection.execute(
+                "INSERT INTO handlers (path) VALUES (?)", (handler,)
+            ).lastrowid
+            handler_ids[handler] = handler_id
+        batch.append(
+            (stamp, level, handler_id, method, status, address, file_id)
+        )
+        if len(batch) >= BATCH_SIZE:
+            connection.executemany(insert, batch)
+            total += len(batch)
+            batch.clear()
+    connection.executemany(insert, batch)
+    return total + len(batch)
+
+
+def ingest_logs(db_path: Path, log_files: list[Path]) -> int:
+    """
+    Загружает записи 'django.request' из лог-файлов в базу данных.
+
+    Блоки файлов разбираются параллельно в воркерах, а вставка идёт
+    в основном процессе. На время загрузки индексы удаляются,
+    а синхронизация с диском отключается; после загрузки индексы
+    строятся заново. Уже загруженные файлы пропускаются,
+    а записи изменившихся файлов заменяются.
+
+    :param db_path: Путь к файлу SQLite
+    :param log_files: Список путей к лог-файлам
+    :return: Количество загруженных записей
+    """
+    workers = os.cpu_count() or 1
+    connection = connect(db_path)
+    try:
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("PRAGMA cache_size = -262144")
+        connection.execute("PRAGMA temp_store = MEMORY")
+        for name in INDEXES:
+            connection.execute(f"DROP INDEX IF EXISTS {name}")
+        handler_ids = dict(connection.execute("SELECT path, id FROM handlers"))
+        total = 0
+        with make_executor(workers) as executor:
+            for log_file in log_files:
+                with connection:
+                    file_id = _register_file(connection, log_file)
+                    if file_id is None:
+                        continue
+                    rows = _iter_file_rows(log_file, executor, workers * 2)
+                    total += _insert_rows(
+                        connection, rows, handler_ids, file_id
+                    )
+        with connection:
+            for name, columns in INDEXES.items():
+                connection.execute(f"CREATE INDEX {name} ON {columns}")
+        connection.execute("PRAGMA synchronous = NORMAL")
+    finally:
+        connection.close()
+    return total
+
+
+def load_report(
+    db_path: Path, report_class: type, query: LogQuery | None = None
+) -> Any:
+    """
+    Формирует отчёт по загруженной базе без повторного парсинга логов.
+
+    Счётчики агрегируются запросом GROUP BY и передаются
+    в метод отчёта add_counts().
+
+    :param db_path: Путь к файлу SQLite
+    :param report_class: Класс отчёта с методом add_counts()
+    :param query: Условия отбора записей (None — без отбора)
+    :return: Экземпляр сформированного отчёта
+    """
+    conditions, params = [], []
+    if query and query.handler:
+        conditions.append("h.path = ?")
+        params.append(query.handler)
+    if query and query.since:
+        conditions.append("r.ts >= ?")
+        params.append(timestamp_to_epoch(query.since))
+    if query and query.until:
+        conditions.append("r.ts < ?")
+        params.append(timestamp_to_epoch(query.until))
+    if query and query.level:
+        conditions.append("r.level = ?")
+        params.append(query.level)
+    if query and query.handler_prefix:
+        conditions.append("substr(h.path, 1, ?) = ?")
+        params.extend([len(query.handler_prefix), query.handler_prefix])
+    if query and query.method:
+        conditions.append("r.method = ?")
+        params.append(query.method)
+    if query and query.status is not None:
+        conditions.append("r.status = ?")
+        params.append(query.status)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = (
+        "SELECT h.path, r.level, COUNT(*) FROM requests AS r "
+        f"JOIN handlers AS h ON h.id = r.handler_id {where} "
+        "GROUP BY h.path, r.level"
+    )
+    report = report_class()
+    connection = connect_readonly(db_path)
+    try:
+        report.add_counts(connection.execute(sql, params))
+    finally:
+        connection.close()
+    return report
@@ -1,9 +1,538 @@
 """Модуль содержит функцию для парсинга лог-файлов Django."""
 
+import calendar
+import math
+import re
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
 
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIMESTAMP_WIDTH = 19
+HTTP_METHODS = frozenset(
+    {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+)
+HTTP_STATUSES = range(100, 600)
 
-def parse_log_file(path: Path) -> list[dict[str, str]]:
+ERROR_LEVELS = frozenset({"ERROR", "CRITICAL"})
+ERROR_LOGGERS = frozenset({"django.request", "django.core.management"})
+DEFAULT_KIND = "requests"
+DB_LOGGER = "django.db.backends"
+
+_SQL_LITERAL = re.compile(
+    r"(?<![\w.])(FROM|JOIN|INTO|UPDATE|TABLE)\s+('[^']*'|\"[^\"]*\")"
+    r"|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b",
+    re.IGNORECASE,
+)
+_SQL_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+RequestRow = tuple[int, str, str, str | None, int | None, str | None]
+
+
+@dataclass(frozen=True)
+class LogQuery:
+    """
+    Условия отбора записей при парсинге.
+
+    Временные границы хранятся в формате 'YYYY-MM-DD HH:MM:SS',
+    который сравнивается с началом строки лога лексикографически;
+    since входит в интервал, until — нет.
+    Уровень и метод хранятся в верхнем регистре, как в строках лога.
+    """
+
+    handler: str | None = None
+    since: str | None = None
+    until: str | None = None
+    level: str | None = None
+    handler_prefix: str | None = None
+    method: str | None = None
+    status: int | None = None
+
+    def needles(self, logger: str | None = None) -> tuple[str, ...]:
+        """
+        Составляет подстроки, без которых строка заведомо не подходит.
+
+        Проверка подстроки дешевле разбиения строки на токены,
+        поэтому неподходящие строки отсеиваются до разбора.
+        Подстроки идут в порядке проверки: уровень, логгер,
+        обработчик, метод, статус.
+
+        :param logger: Имя логгера, обязательного в строке (None — любой)
+        :return: Кортеж подстрок
+        """
+        needles = []
+        if self.level:
+            needles.append(f" {self.level} ")
+        if logger:
+            needles.append(logger)
+        if self.handler:
+            needles.append(f" {self.handler}")
+        elif self.handler_prefix:
+            needles.append(f" {self.handler_prefix}")
+        if self.method:
+            needles.append(f" {self.method} ")
+        if self.status is not None:
+            needles.append(f" {self.status} ")
+        return tuple(needles)
+
+    def accepts(
+        self,
+        level: str,
+        handler: str,
+        method: str | None = None,
+        status: str | None = None,
+    ) -> bool:
+        """
+        Проверяет поля разобранной строки на точное совпадение.
+
+        :param level: Уровень логирования
+        :param handler: Путь обработчика или имя логгера
+        :param method: HTTP-метод (None — нет в строке)
+        :param status: Код ответа строкой (None — нет в строке)
+        :return: True, если запись подходит под все условия
+        """
+        return (
+            (not self.level or level == self.level)
+            and (not self.handler or handler == self.handler)
+            and (not self.handler_prefix
+                 or handler.startswith(self.handler_prefix))
+            and (not self.method or method == self.method)
+            and (self.status is None or status == str(self.status))
+        )
+
+
+def compile_filter(
+    query: LogQuery | None, logger: str | None = None
+) -> Callable[[str], bool]:
+    """
+    Собирает проверку строки по подстрокам условий запроса.
+
+    Проверки вкладываются цепочкой замыканий: строка, в которой
+    нет первой подстроки, отбрасывается одним сравнением без
+    разбиения на токены и без создания промежуточных объектов.
+
+    :param query: Условия отбора записей (None — без отбора)
+    :param logger: Имя логгера, обязательного в строке (None — любой)
+    :return: Функция 'строка -> может ли строка подойти'
+    """
+    needles = (query or LogQuery()).needles(logger)
+    if not needles:
+        return lambda line: True
+
+    def chain(rest: tuple[str, ...]) -> Callable[[str], bool]:
+        first = rest[0]
+        if len(rest) == 1:
+            return lambda line: first in line
+        tail = chain(rest[1:])
+        return lambda line: first in line and tail(line)
+
+    return chain(needles)
+
+
+def compile_window(
+    query: LogQuery | None,
+) -> Callable[[str], bool] | None:
+    """
+    Собирает проверку времени строки по границам запроса.
+
+    :param query: Условия отбора записей (None — без отбора)
+    :return: Функция 'строка -> попадает ли время в [since, until)'
+             или None, если границ нет
+    """
+    since = query.since if query else None
+    until = query.until if query else None
+    if since and until:
+        return lambda line: (
+            since <= line.lstrip()[:TIMESTAMP_WIDTH] < until
+        )
+    if since:
+        return lambda line: line.lstrip()[:TIMESTAMP_WIDTH] >= since
+    if until:
+        return lambda line: line.lstrip()[:TIMESTAMP_WIDTH] < until
+    return None
+
+
+KIND_FILTERS = {
+    DEFAULT_KIND: frozenset(
+        {"handler", "level", "handler_prefix", "method", "status"}
+    ),
+    "errors": frozenset({"handler", "level", "handler_prefix"}),
+    "timeline": frozenset(
+        {"handler", "level", "handler_prefix", "method", "status"}
+    ),
+    "db": frozenset({"level"}),
+}
+
+
+def normalize_timestamp(value: str) -> str:
+    """
+    Приводит дату или дату со временем к формату строк лога.
+
+    :param value: Дата в ISO-формате ('2025-03-28' или '2025-03-28 12:00')
+    :return: Строка вида 'YYYY-MM-DD HH:MM:SS'
+    :raises ValueError: Если значение не является датой
+    """
+    return datetime.fromisoformat(value).strftime(TIMESTAMP_FORMAT)
+
+
+@lru_cache(maxsize=4096)
+def _minute_epoch(minute: str) -> int:
+    """
+    Переводит минуту вида 'YYYY-MM-DD HH:MM' в секунды эпохи.
+
+    Результат кешируется: соседние строки лога почти всегда
+    относятся к одной минуте.
+
+    :param minute: Начало метки времени с точностью до минуты
+    :return: Секунды от начала эпохи (время считается UTC)
+    :raises ValueError: Если строка не является меткой времени
+    """
+    return calendar.timegm(time.strptime(minute, "%Y-%m-%d %H:%M"))
+
+
+def timestamp_to_epoch(stamp: str) -> int:
+    """
+    Переводит метку времени строки лога в секунды эпохи.
+
+    :param stamp: Метка вида 'YYYY-MM-DD HH:MM:SS[,mmm]'
+    :return: Секунды от начала эпохи (время считается UTC)
+    :raises ValueError: Если строка не является меткой времени
+    """
+    return _minute_epoch(stamp[:16]) + int(stamp[17:TIMESTAMP_WIDTH])
+
+
+def iter_request_rows(lines: Iterable[str]) -> Iterator[RequestRow]:
+    """
+    Извлекает из строк 'django.request' все поля запроса.
+
+    Каждая строка превращается в кортеж
+    (время в секундах эпохи, уровень, обработчик, метод, статус, IP).
+    Метод, статус и IP равны None, если их нет в строке
+    (например, в сообщениях 'Internal Server Error').
+
+    :param lines: Итерируемый набор строк лога
+    :return: Итератор кортежей с полями запроса
+    """
+    for line in lines:
+        if "django.request" not in line:
+            continue
+        parts = line.split()
+        if len(parts) < 6 or parts[3].rstrip(":") != "django.request":
+            continue
+        pos = 5
+        while pos < len(parts) and not parts[pos].startswith("/"):
+            pos += 1
+        if pos == len(parts):
+            continue
+        try:
+            stamp = timestamp_to_epoch(f"{parts[0]} {parts[1]}")
+        except ValueError:
+            continue
+        method = parts[4] if parts[4] in HTTP_METHODS else None
+        status = None
+        if pos + 1 < len(parts) and parts[pos + 1].isdecimal():
+            status = int(parts[pos + 1])
+            if status not in HTTP_STATUSES:
+                status = None
+        address = None
+        for part in parts[pos + 1:]:
+            if part.startswith("[") and part.endswith("]"):
+                address = part[1:-1]
+                break
+        yield stamp, parts[2].upper(), parts[pos], method, status, address
+
+
+def parse_request_rows(chunk: bytes) -> list[RequestRow]:
+    """
+    Извлекает поля запросов из блока байтов, выровненного по строкам.
+
+    Используется воркерами загрузки в SQLite.
+
+    :param chunk: Блок байтов, заканчивающийся на границе строки
+    :return: Список кортежей с полями запроса
+    """
+    return list(
+        iter_request_rows(chunk.decode("utf-8", errors="replace").splitlines())
+    )
+
+
+def _handler_position(parts: list[str]) -> int | None:
+    """
+    Находит позицию пути обработчика среди токенов строки запроса.
+
+    :param parts: Токены строки лога
+    :return: Номер токена или None, если пути нет
+    """
+    for pos in range(5, len(parts)):
+        if parts[pos].startswith("/"):
+            return pos
+    return None
+
+
+def _accepts_request(
+    query: LogQuery, level: str, parts: list[str], pos: int
+) -> bool:
+    """
+    Проверяет поля строки 'django.request' условиями запроса.
+
+    :param query: Условия отбора записей
+    :param level: Уровень логирования
+    :param parts: Токены строки лога
+    :param pos: Позиция пути обработчика
+    :return: True, если запись подходит
+    """
+    return query.accepts(
+        level,
+        parts[pos],
+        parts[4],
+        parts[pos + 1] if pos + 1 < len(parts) else None,
+    )
+
+
+def parse_lines(
+    lines: Iterable[str], query: LogQuery | None = None
+) -> list[dict[str, str]]:
+    """
+    Парсит строки лога и извлекает записи с модулем 'django.request'.
+
+    Каждая запись представлена словарём с ключами:
+    - 'handler': путь обработчика запроса (например, '/api/v1/users/')
+    - 'level': уровень логирования (например, 'INFO', 'ERROR')
+
+    :param lines: Итерируемый набор строк лога
+    :param query: Условия отбора записей (None — без отбора)
+    :return: Список словарей с информацией об
+     обработчиках и уровнях логов
+    """
+    in_window = compile_window(query)
+    matches = compile_filter(query, "django.request")
+    records = []
+    for line in lines:
+        if not matches(line):
+            continue
+        if in_window and not in_window(line):
+            continue
+        parts = line.split()
+        if len(parts) < 6:
+            continue
+        module = parts[3].rstrip(":")
+        if module != "django.request":
+            continue
+
+        level = parts[2].upper()
+
+        pos = _handler_position(parts)
+        if pos is None:
+            continue
+        if query and not _accepts_request(query, level, parts, pos):
+            continue
+        records.append({"handler": parts[pos], "level": level})
+    return records
+
+
+def parse_error_lines(
+    lines: Iterable[str], query: LogQuery | None = None
+) -> list[dict[str, str]]:
+    """
+    Парсит строки ERROR и CRITICAL вместе с текстом исключения.
+
+    Учитываются логгеры 'django.request' и 'django.core.management'.
+    Каждая запись представлена словарём с ключами:
+    - 'handler': путь обработчика, а для строк без пути — имя логгера
+    - 'level': уровень логирования ('ERROR' или 'CRITICAL')
+    - 'message': текст исключения после ' - ' или всё сообщение
+
+    :param lines: Итерируемый набор строк лога
+    :param query: Условия отбора записей (None — без отбора)
+    :return: Список словарей с обработчиком, уровнем и сообщением
+    """
+    in_window = compile_window(query)
+    matches = compile_filter(query)
+    records = []
+    for line in lines:
+        if not matches(line):
+            continue
+        parts = line.split(None, 4)
+        if len(parts) < 5 or parts[2].upper() not in ERROR_LEVELS:
+            continue
+        module = parts[3].rstrip(":")
+        if module not in ERROR_LOGGERS:
+            continue
+        if in_window and not in_window(line):
+            continue
+        message = parts[4].strip()
+        handler = module
+        if module == "django.request":
+            handler = next(
+                (part for part in message.split() if part.startswith("/")),
+                module,
+            )
+        if query and not query.accepts(parts[2].upper(), handler):
+            continue
+        _, dash, detail = message.partition(" - ")
+        records.append({
+            "handler": handler,
+            "level": parts[2].upper(),
+            "message": detail.strip() if dash else message,
+        })
+    return records
+
+
+def parse_timeline_lines(
+    lines: Iterable[str], query: LogQuery | None = None
+) -> list[dict]:
+    """
+    Парсит строки 'django.request' вместе с временем записи.
+
+    Каждая запись представлена словарём с ключами:
+    - 'handler': путь обработчика запроса
+    - 'level': уровень логирования
+    - 'time': время записи в секундах эпохи
+
+    :param lines: Итерируемый набор строк лога
+    :param query: Условия отбора записей (None — без отбора)
+    :return: Список словарей с обработчиком, уровнем и временем
+    """
+    in_window = compile_window(query)
+    matches = compile_filter(query, "django.request")
+    records = []
+    for line in lines:
+        if not matches(line):
+            continue
+        if in_window and not in_window(line):
+            continue
+        parts = line.split()
+        if len(parts) < 6 or parts[3].rstrip(":") != "django.request":
+            continue
+        pos = _handler_position(parts)
+        level = parts[2].upper()
+        if pos is None or (
+            query and not _accepts_request(query, level, parts, pos)
+        ):
+            continue
+        try:
+            stamp = timestamp_to_epoch(f"{parts[0]} {parts[1]}")
+        except ValueError:
+            continue
+        records.append({"handler": parts[pos], "level": level, "time": stamp})
+    return records
+
+
+def normalize_query(sql: str) -> str:
+    """
+    Приводит SQL-запрос к форме без конкретных значений.
+
+    Числа и строковые литералы заменяются на '?', списки значений
+    сворачиваются в '(?)', а имена таблиц в кавычках после FROM,
+    JOIN, INTO, UPDATE и TABLE сохраняются.
+
+    :param sql: Текст запроса
+    :return: Форма запроса, общая для запросов с разными значениями
+    """
+    shape = _SQL_LITERAL.sub(
+        lambda match: match.group(0) if match.group(1) else "?", sql
+    )
+    shape = _SQL_LIST.sub("(?)", shape)
+    return " ".join(shape.split()).rstrip(";")
+
+
+def parse_db_lines(
+    lines: Iterable[str], query: LogQuery | None = None
+) -> list[dict]:
+    """
+    Парсит строки 'django.db.backends' с длительностью запроса.
+
+    Каждая запись представлена словарём с ключами:
+    - 'shape': форма запроса из normalize_query()
+    - 'duration': длительность запроса в секундах
+
+    Из условий отбора применяются только время и уровень.
+    Строки с длительностью, которая не является конечным
+    неотрицательным числом ('inf', 'nan', '-1'), пропускаются.
+
+    :param lines: Итерируемый набор строк лога
+    :param query: Условия отбора записей (None — без отбора)
+    :return: Список словарей с формой запроса и длительностью
+    """
+    in_window = compile_window(query)
+    matches = compile_filter(query, DB_LOGGER)
+    records = []
+    for line in lines:
+        if not matches(line):
+            continue
+        if in_window and not in_window(line):
+            continue
+        parts = line.split(None, 4)
+        if len(parts) < 5 or parts[3].rstrip(":") != DB_LOGGER:
+            continue
+        if query and not query.accepts(parts[2].upper(), DB_LOGGER):
+            continue
+        duration, _, sql = parts[4].partition(" ")
+        if not (duration.startswith("(") and duration.endswith(")")):
+            continue
+        try:
+            seconds = float(duration[1:-1])
+        except ValueError:
+            continue
+        if not math.isfinite(seconds) or seconds < 0:
+            continue
+        records.append({"shape": normalize_query(sql), "duration": seconds})
+    return records
+
+
+def parse_chunk(
+    chunk: bytes, query: LogQuery | None = None, kind: str = DEFAULT_KIND
+) -> list[dict[str, str]]:
+    """
+    Парсит блок байтов, выровненный по границе строк.
+
+    Используется воркерами потоковой обработки: блок декодируется
+    целиком и разбивается на строки без повторного копирования.
+
+    :param chunk: Блок байтов, заканчивающийся на границе строки
+    :param query: Условия отбора записей (None — без отбора)
+    :param kind: Вид записей, ключ LINE_PARSERS
+    :return: Список словарей с информацией об
+     обработчиках и уровнях логов
+    """
+    return LINE_PARSERS[kind](
+        chunk.decode("utf-8", errors="replace").splitlines(), query
+    )
+
+
+def read_block(file: BinaryIO, start: int, end: int) -> bytes:
+    """
+    Читает строки, начинающиеся в диапазоне байтов [start, end).
+
+    Строка принадлежит тому диапазону, в котором находится её первый
+    байт: обрывок строки в начале пропускается, а последняя строка
+    дочитывается до конца. Поэтому соседние диапазоны не теряют
+    и не дублируют строки.
+
+    :param file: Файл, открытый в бинарном режиме
+    :param start: Смещение начала диапазона
+    :param end: Смещение конца диапазона (не включительно)
+    :return: Блок байтов, выровненный по границам строк
+    """
+    file.seek(max(start - 1, 0))
+    if start > 0 and file.read(1) != b"\n":
+        file.readline()
+    start = file.tell()
+    if start >= end:
+        return b""
+    chunk = file.read(end - start)
+    if chunk and not chunk.endswith(b"\n"):
+        chunk += file.readline()
+    return chunk
+
+
+def parse_log_file(
+    path: Path, query: LogQuery | None = None, kind: str = DEFAULT_KIND
+) -> list[dict[str, str]]:
     """
     Парсит лог-файл и извлекает записи с модулем 'django.request'.
 
@@ -12,28 +541,18 @@ def parse_log_file(path: Path) -> list[dict[str, str]]:
     - 'level': уровень логирования (например, 'INFO', 'ERROR')
 
     :param path: Путь к лог-файлу
+    :param query: Условия отбора записей (None — без отбора)
+    :param kind: Вид записей, ключ LINE_PARSERS
     :return: Список словарей с информацией об
      обработчиках и уровнях логов
     """
-    records = []
     with path.open(mode="r", encoding="utf-8") as file:
-        for line in file:
-            if not line.strip():
-                continue
-            parts = line.strip().split()
-            if len(parts) < 6:
-                continue
-            module = parts[3].rstrip(":")
-            if module != "django.request":
-                continue
-
-            level = parts[2].upper()
-
-            handler = None
-            for part in parts[5:]:
-                if part.startswith("/"):
-                    handler = part
-                    break
-            if handler:
-                records.append({"handler": handler, "level": level})
-        return records
+        return LINE_PARSERS[kind](file, query)
+
+
+LINE_PARSERS = {
+    DEFAULT_KIND: parse_lines,
+    "errors": parse_error_lines,
+    "timeline": parse_timeline_lines,
+    "db": parse_db_lines,
+}
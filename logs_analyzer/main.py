@@ -1,28 +1,90 @@
 """Модуль main содержит точку входа для CLI-приложения анализа логов Django."""
 
 import argparse
+import sqlite3
 import sys
+import time
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
-from logs_analyzer.analyze import analyze_logs
+from logs_analyzer.analyze import (Coverage, analyze_logs,
+                                   analyze_with_deadline,
+                                   analyze_with_memory_limit)
 from logs_analyzer.check_validate import validate_files
+from logs_analyzer.columnar import analyze_columnar
+from logs_analyzer.dedupe import (ERROR_RATE, ScalableBloomFilter,
+                                  drop_duplicate_files)
+from logs_analyzer.index import BLOCK_SIZE, build_index, index_path
+from logs_analyzer.ingest import ingest_logs, load_report
+from logs_analyzer.logs_parser import (DEFAULT_KIND, HTTP_METHODS,
+                                       KIND_FILTERS, LogQuery,
+                                       normalize_timestamp)
+from logs_analyzer.merge import MERGE_WINDOW, analyze_ordered
 from logs_analyzer.reports import REPORTS_REGISTRY
-from logs_analyzer.utils import get_report_class
+from logs_analyzer.reports.handlers import LOG_LEVELS
+from logs_analyzer.sampling import sample_logs
+from logs_analyzer.server import DEFAULT_PORT, POLL_INTERVAL, LogWatcher, serve
+from logs_analyzer.snapshot import (Snapshot, SnapshotDiff, load_snapshot,
+                                    save_snapshot, supports_snapshot)
+from logs_analyzer.spill import parse_memory_limit, supports_spill
+from logs_analyzer.stream import is_stream_input
+from logs_analyzer.utils import (get_record_kind, get_report_class,
+                                 requires_time_order)
 
 
-def main() -> None:
+def run_index(argv: list[str]) -> None:
     """
-    Основная функция запуска CLI-приложения.
+    Подкоманда index: создаёт или дополняет индексы лог-файлов.
 
-    Парсит аргументы командной строки, проверяет существование лог-файлов,
-    получает класс отчёта, выполняет анализ логов и выводит отчёт.
+    :param argv: Аргументы командной строки после имени подкоманды
+    :return: None
+    :raises SystemExit: При ошибках валидации файлов или индексации
+    """
+    parser = argparse.ArgumentParser(
+        prog="logs_analyzer index",
+        description="Индексация логов для быстрых выборочных запросов"
+    )
+    parser.add_argument(
+        "log_files",
+        nargs="+",
+        type=Path,
+        help="Пути к лог-файлам"
+    )
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=BLOCK_SIZE,
+        help="Примерный размер блока индекса в байтах"
+    )
+    args = parser.parse_args(argv)
+
+    if not validate_files(paths=args.log_files):
+        sys.exit(1)
+
+    for log_file in args.log_files:
+        try:
+            index = build_index(log_file, block_size=args.block_size)
+        except OSError as er:
+            print(f"Ошибка индексации {log_file}: {er}", file=sys.stderr)
+            sys.exit(1)
+        print(
+            f"{index_path(log_file)}: блоков {len(index['blocks'])}, "
+            f"обработчиков {len(index['handlers'])}"
+        )
+
+
+def run_ingest(argv: list[str]) -> None:
+    """
+    Подкоманда ingest: загружает записи логов в базу SQLite.
 
+    :param argv: Аргументы командной строки после имени подкоманды
     :return: None
-    :raises SystemExit: При ошибках валидации файлов,
-     выборе отчёта или анализе логов
+    :raises SystemExit: При ошибках валидации файлов или загрузки
     """
     parser = argparse.ArgumentParser(
-        description="Анализ логов приложения Django"
+        prog="logs_analyzer ingest",
+        description="Загрузка записей django.request в SQLite"
     )
     parser.add_argument(
         "log_files",
@@ -30,27 +92,559 @@ def main() -> None:
         type=Path,
         help="Пути к лог-файлам"
     )
+    parser.add_argument(
+        "--db",
+        required=True,
+        type=Path,
+        help="Путь к файлу базы данных SQLite"
+    )
+    args = parser.parse_args(argv)
+
+    if not validate_files(paths=args.log_files):
+        sys.exit(1)
+
+    started = time.perf_counter()
+    try:
+        total = ingest_logs(db_path=args.db, log_files=args.log_files)
+    except (sqlite3.Error, OSError) as er:
+        print(f"Ошибка загрузки в {args.db}: {er}", file=sys.stderr)
+        sys.exit(1)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(
+        f"Загружено записей: {total} за {elapsed:.2f} с "
+        f"({total / elapsed:.0f} записей/с)"
+    )
+
+
+def run_serve(argv: list[str]) -> None:
+    """
+    Подкоманда serve: держит отчёты в памяти и отвечает по HTTP.
+
+    :param argv: Аргументы командной строки после имени подкоманды
+    :return: None
+    :raises SystemExit: При ошибках валидации файлов
+    """
+    parser = argparse.ArgumentParser(
+        prog="logs_analyzer serve",
+        description="Сервер отчётов с инкрементальным обновлением"
+    )
+    parser.add_argument(
+        "log_files",
+        nargs="+",
+        type=Path,
+        help="Пути к наблюдаемым лог-файлам"
+    )
+    parser.add_argument(
+        "--report",
+        nargs="+",
+        default=list(REPORTS_REGISTRY),
+        choices=REPORTS_REGISTRY.keys(),
+        help="Отчёты, которые держатся в памяти"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Адрес для прослушивания"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help="Порт HTTP-сервера"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=POLL_INTERVAL,
+        help="Интервал проверки файлов в секундах"
+    )
+    parser.add_argument(
+        "--anomaly-z",
+        type=float,
+        metavar="Z",
+        help="Порог z-оценки всплеска доли ошибок (отчёт anomalies)"
+    )
+    args = parser.parse_args(argv)
+
+    classes = {}
+    if args.anomaly_z is not None:
+        if "anomalies" not in args.report:
+            parser.error("--anomaly-z задаёт порог отчёта anomalies")
+        try:
+            classes["anomalies"] = get_report_class(
+                report_name="anomalies"
+            ).configured(args.anomaly_z)
+        except ValueError as er:
+            parser.error(str(er))
+    if not validate_files(paths=args.log_files):
+        sys.exit(1)
+
+    serve(
+        watcher=LogWatcher(args.log_files, args.report, classes),
+        host=args.host,
+        port=args.port,
+        interval=args.interval,
+    )
+
+
+COMMANDS = {
+    "index": run_index,
+    "ingest": run_ingest,
+    "serve": run_serve,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Создаёт парсер аргументов основного режима анализа.
+
+    :return: Настроенный парсер аргументов
+    """
+    parser = argparse.ArgumentParser(
+        description="Анализ логов приложения Django"
+    )
+    parser.add_argument(
+        "log_files",
+        nargs="*",
+        type=Path,
+        help="Пути к лог-файлам ('-' — стандартный ввод)"
+    )
     parser.add_argument(
         "--report",
         required=True,
         choices=REPORTS_REGISTRY.keys(),
         help="Тип отчёта"
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--handler",
+        help="Учитывать только указанный обработчик"
+    )
+    parser.add_argument(
+        "--since",
+        type=normalize_timestamp,
+        help="Учитывать записи начиная с момента (ISO-формат)"
+    )
+    parser.add_argument(
+        "--until",
+        type=normalize_timestamp,
+        help="Учитывать записи до момента, не включая его (ISO-формат)"
+    )
+    parser.add_argument(
+        "--level",
+        type=str.upper,
+        choices=LOG_LEVELS,
+        help="Учитывать только записи указанного уровня"
+    )
+    parser.add_argument(
+        "--handler-prefix",
+        help="Учитывать только обработчики с указанным префиксом пути"
+    )
+    parser.add_argument(
+        "--method",
+        type=str.upper,
+        choices=sorted(HTTP_METHODS),
+        help="Учитывать только запросы с указанным HTTP-методом"
+    )
+    parser.add_argument(
+        "--status",
+        type=int,
+        help="Учитывать только запросы с указанным кодом ответа"
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        help="Строить отчёт по базе SQLite из подкоманды ingest"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("python", "numpy"),
+        default="python",
+        help="Движок анализа (numpy — колоночный, требует NumPy)"
+    )
+    parser.add_argument(
+        "--dataset",
+        type=Path,
+        help="Строить отчёт по сохранённому набору данных .npz"
+    )
+    parser.add_argument(
+        "--save-dataset",
+        type=Path,
+        help="Сохранить разобранный набор данных в .npz (движок numpy)"
+    )
+    parser.add_argument(
+        "--sample",
+        type=float,
+        metavar="RATE",
+        help="Приближённый отчёт по случайной доле блоков (0 < RATE <= 1)"
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help="Вывести частичный отчёт, если анализ не уложился в срок"
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Пропускать повторные файлы и повторные строки"
+    )
+    parser.add_argument(
+        "--dedupe-error-rate",
+        type=float,
+        default=ERROR_RATE,
+        help="Допустимая доля ложно отброшенных строк при --dedupe"
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=parse_memory_limit,
+        metavar="SIZE",
+        help="Бюджет памяти агрегата (например, 512M) по оценке "
+             "размера отчётов, а не по точному объёму памяти процесса; "
+             "излишек сбрасывается на диск"
+    )
+    parser.add_argument(
+        "--save-snapshot",
+        type=Path,
+        metavar="PATH",
+        help="Сохранить агрегат отчёта в снимок для последующего сравнения"
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        metavar="SNAPSHOT",
+        help="Вывести изменения отчёта относительно сохранённого снимка"
+    )
+    parser.add_argument(
+        "--anomaly-z",
+        type=float,
+        metavar="Z",
+        help="Порог z-оценки всплеска доли ошибок (отчёт anomalies)"
+    )
+    parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="Сливать логи в один поток по времени"
+    )
+    parser.add_argument(
+        "--merge-window",
+        type=float,
+        default=MERGE_WINDOW,
+        metavar="SECONDS",
+        help="Допустимое отставание строк от порядка времени при --ordered"
+    )
+    return parser
 
-    if not validate_files(paths=args.log_files):
+
+# Режим -> режимы, с которыми он несовместим, и сообщение об ошибке.
+MODE_CONFLICTS: dict[str, tuple[frozenset[str], str]] = {
+    "db": (
+        frozenset({"dataset", "numpy", "sample", "deadline"}),
+        "--db строит отчёт по базе: --engine numpy, --dataset, "
+        "--save-dataset, --sample и --deadline с ним не работают",
+    ),
+    "sample": (
+        frozenset({"streams"}),
+        "--sample работает с отчётом по запросам и файлами",
+    ),
+    "deadline": (
+        frozenset({"streams"}),
+        "--deadline работает только с файлами",
+    ),
+    "dedupe": (
+        frozenset({"db", "dataset", "numpy", "sample", "deadline"}),
+        "--dedupe работает только в обычном режиме анализа",
+    ),
+    "ordered": (
+        frozenset({"db", "dataset", "numpy", "sample", "deadline", "dedupe"}),
+        "--ordered работает только в обычном режиме анализа",
+    ),
+    "time_order": (
+        frozenset({"db", "dataset", "numpy", "sample", "deadline", "dedupe"}),
+        "отчёт {report} строится по записям в порядке времени "
+        "и работает только в обычном режиме анализа",
+    ),
+    "memory_limit": (
+        frozenset({"streams", "db", "dataset", "numpy", "sample",
+                   "deadline", "dedupe", "ordered", "time_order"}),
+        "--memory-limit работает только в обычном режиме с файлами",
+    ),
+    "snapshot": (
+        frozenset({"sample", "deadline", "memory_limit"}),
+        "--save-snapshot и --compare работают с полным отчётом",
+    ),
+}
+
+# Режимы, требования режима к классу отчёта и сообщение об ошибке.
+MODE_REQUIREMENTS: tuple[tuple[frozenset[str], Callable, str], ...] = (
+    (
+        frozenset({"db", "numpy"}),
+        lambda report_class: hasattr(report_class, "add_counts"),
+        "отчёт {report} строится только по логам",
+    ),
+    (
+        frozenset({"sample"}),
+        lambda report_class: get_record_kind(report_class) == DEFAULT_KIND,
+        "--sample работает с отчётом по запросам и файлами",
+    ),
+    (
+        frozenset({"memory_limit"}),
+        supports_spill,
+        "отчёт {report} не поддерживает --memory-limit",
+    ),
+    (
+        frozenset({"snapshot"}),
+        supports_snapshot,
+        "отчёт {report} не сохраняется в снимок",
+    ),
+)
+
+
+def active_modes(args: argparse.Namespace, report_class: type) -> set[str]:
+    """
+    Определяет выбранные режимы анализа.
+
+    Режим 'ordered' выбирается ключом --ordered, а 'time_order' —
+    отчётом, которому нужны записи в порядке времени.
+
+    :param args: Разобранные аргументы командной строки
+    :param report_class: Класс выбранного отчёта
+    :return: Имена режимов из MODE_CONFLICTS и MODE_REQUIREMENTS,
+             а также 'streams' при потоковых источниках
+    """
+    flags = {
+        "streams": any(is_stream_input(path) for path in args.log_files),
+        "db": args.db,
+        "dataset": args.dataset,
+        "numpy": args.engine == "numpy",
+        "sample": args.sample is not None,
+        "deadline": args.deadline is not None,
+        "dedupe": args.dedupe,
+        "ordered": args.ordered,
+        "time_order": requires_time_order(report_class),
+        "memory_limit": args.memory_limit is not None,
+        "snapshot": args.save_snapshot or args.compare,
+    }
+    return {mode for mode, selected in flags.items() if selected}
+
+
+def check_modes(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    report_class: type,
+) -> None:
+    """
+    Проверяет совместимость режимов анализа с отчётом и источниками.
+
+    Требования режимов к отчёту и несовместимые сочетания режимов
+    задаются таблицами MODE_REQUIREMENTS и MODE_CONFLICTS.
+
+    :param parser: Парсер аргументов для вывода ошибки
+    :param args: Разобранные аргументы командной строки
+    :param report_class: Класс выбранного отчёта
+    :return: None
+    :raises SystemExit: Если режим несовместим с отчётом или источниками
+    """
+    if args.since and args.until and args.since >= args.until:
+        parser.error("--since должен быть раньше --until")
+    supported = KIND_FILTERS.get(get_record_kind(report_class), frozenset())
+    for name in ("handler", "level", "handler_prefix", "method", "status"):
+        if getattr(args, name) is not None and name not in supported:
+            option = "--" + name.replace("_", "-")
+            parser.error(f"отчёт {args.report} не поддерживает {option}")
+    if args.dataset and args.log_files:
+        parser.error("--dataset строит отчёт без лог-файлов")
+    if args.db and args.log_files:
+        parser.error("--db строит отчёт без лог-файлов")
+    if args.method and args.engine == "numpy":
+        parser.error("--method не поддерживается движком numpy")
+    modes = active_modes(args, report_class)
+    for required_by, check, message in MODE_REQUIREMENTS:
+        if modes & required_by and not check(report_class):
+            parser.error(message.format(report=args.report))
+    for mode, (conflicts, message) in MODE_CONFLICTS.items():
+        if mode in modes and modes & conflicts:
+            parser.error(message.format(report=args.report))
+
+
+def run_analysis(
+    args: argparse.Namespace,
+    report_class: type,
+    query: LogQuery | None,
+) -> tuple[Any, Coverage | None]:
+    """
+    Выполняет анализ в режиме, выбранном аргументами.
+
+    :param args: Разобранные аргументы командной строки
+    :param report_class: Класс выбранного отчёта
+    :param query: Условия отбора записей (None — без отбора)
+    :return: Экземпляр отчёта и сведения о полноте (только для --deadline)
+    """
+    coverage = None
+    if args.db:
+        report = load_report(
+            db_path=args.db, report_class=report_class, query=query
+        )
+    elif args.sample is not None:
+        report = sample_logs(
+            log_files=args.log_files, rate=args.sample, query=query
+        )
+    elif args.deadline is not None:
+        report, coverage = analyze_with_deadline(
+            log_files=args.log_files,
+            report_class=report_class,
+            deadline=args.deadline,
+            query=query,
+        )
+    elif args.engine == "numpy":
+        report = analyze_columnar(
+            log_files=args.log_files,
+            report_class=report_class,
+            query=query,
+            dataset=args.dataset,
+            save_to=args.save_dataset,
+        )
+    elif args.memory_limit is not None:
+        report = analyze_with_memory_limit(
+            log_files=args.log_files,
+            report_class=report_class,
+            memory_limit=args.memory_limit,
+            query=query,
+        )
+    elif args.ordered or requires_time_order(report_class):
+        report = analyze_ordered(
+            log_files=args.log_files,
+            report_class=report_class,
+            query=query,
+            window=args.merge_window,
+        )
+    elif args.dedupe:
+        report = analyze_logs(
+            log_files=drop_duplicate_files([
+                path for path in args.log_files if not is_stream_input(path)
+            ]) + [path for path in args.log_files if is_stream_input(path)],
+            report_class=report_class,
+            query=query,
+            dedupe=ScalableBloomFilter(error_rate=args.dedupe_error_rate),
+        )
+    else:
+        report = analyze_logs(
+            log_files=args.log_files,
+            report_class=report_class,
+            query=query,
+        )
+    return report, coverage
+
+
+def load_baseline(
+    args: argparse.Namespace, report_class: type
+) -> Snapshot | None:
+    """
+    Загружает снимок для сравнения, если задан --compare.
+
+    :param args: Разобранные аргументы командной строки
+    :param report_class: Класс выбранного отчёта
+    :return: Базовый снимок или None без --compare
+    :raises SystemExit: Если снимок не читается или не подходит к отчёту
+    """
+    if not args.compare:
+        return None
+    try:
+        return load_snapshot(args.compare, args.report, report_class)
+    except (ValueError, OSError) as er:
+        print(f"Ошибка чтения снимка: {er}", file=sys.stderr)
+        sys.exit(1)
+
+
+def print_results(
+    args: argparse.Namespace,
+    report: Any,
+    query: LogQuery | None,
+    baseline: Snapshot | None,
+) -> None:
+    """
+    Выводит отчёт или разницу со снимком и сохраняет снимок.
+
+    :param args: Разобранные аргументы командной строки
+    :param report: Экземпляр отчёта
+    :param query: Условия отбора записей (None — без отбора)
+    :param baseline: Базовый снимок для сравнения (None — без сравнения)
+    :return: None
+    :raises SystemExit: Если снимок не удалось сохранить
+    """
+    if baseline is not None:
+        SnapshotDiff(baseline, report, query).print_report()
+    else:
+        report.print_report()
+    if args.save_snapshot:
+        try:
+            save_snapshot(args.save_snapshot, args.report, report, query)
+        except OSError as er:
+            print(f"Ошибка сохранения снимка: {er}", file=sys.stderr)
+            sys.exit(1)
+
+
+def main() -> None:
+    """
+    Основная функция запуска CLI-приложения.
+
+    Парсит аргументы командной строки, проверяет существование лог-файлов,
+    получает класс отчёта, выполняет анализ логов и выводит отчёт.
+    Если первым аргументом указана подкоманда из COMMANDS,
+    управление передаётся ей.
+
+    :return: None
+    :raises SystemExit: При ошибках валидации файлов,
+     выборе отчёта или анализе логов
+    """
+    argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        COMMANDS[argv[0]](argv[1:])
+        return
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.log_files and not (args.db or args.dataset):
+        parser.error("укажите лог-файлы, --db или --dataset")
+    if args.dataset or args.save_dataset:
+        args.engine = "numpy"
+
+    sources = args.log_files + [
+        path for path in (args.db, args.dataset) if path
+    ]
+    if not validate_files(paths=sources):
         sys.exit(1)
 
     report_class = get_report_class(report_name=args.report)
+    if args.anomaly_z is not None:
+        if not hasattr(report_class, "configured"):
+            parser.error(f"отчёт {args.report} не поддерживает --anomaly-z")
+        try:
+            report_class = report_class.configured(args.anomaly_z)
+        except ValueError as er:
+            parser.error(str(er))
+    check_modes(parser, args, report_class)
+    query = LogQuery(
+        handler=args.handler,
+        since=args.since,
+        until=args.until,
+        level=args.level,
+        handler_prefix=args.handler_prefix,
+        method=args.method,
+        status=args.status,
+    )
+    if query == LogQuery():
+        query = None
 
+    baseline = load_baseline(args, report_class)
     try:
-        report = analyze_logs(
-            log_files=args.log_files, report_class=report_class
-        )
-    except (ValueError, ConnectionError, RuntimeError, OSError) as er:
+        report, coverage = run_analysis(args, report_class, query)
+    except (ValueError, ConnectionError, RuntimeError, OSError,
+            sqlite3.Error) as er:
         print(f"Ошибка при анализе логов: {er}", file=sys.stderr)
         sys.exit(1)
-    report.print_report()
+    print_results(args, report, query, baseline)
+    if coverage is not None:
+        coverage.print_coverage()
 
 
 if __name__ == "__main__":
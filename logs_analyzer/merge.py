@@ -0,0 +1,212 @@
+"""
+Модуль слияния нескольких логов в один поток по времени.
+
+Каждый файл читается буферизованно и проходит через окно
+переупорядочивания: строки держатся в куче, пока самая свежая
+метка файла не уйдёт вперёд больше чем на window секунд. Затем
+потоки файлов сливаются кучей на k входов (heapq.merge), поэтому
+в памяти находятся только строки внутри окна и по одной строке
+на файл, а не все логи целиком.
+"""
+
+import heapq
+import io
+import sys
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from operator import itemgetter
+from pathlib import Path
+from typing import Any
+
+from logs_analyzer.logs_parser import (LINE_PARSERS, TIMESTAMP_WIDTH, LogQuery,
+                                       timestamp_to_epoch)
+from logs_analyzer.stream import STDIN_MARKER
+from logs_analyzer.utils import get_record_kind
+
+MERGE_WINDOW = 5.0
+READ_BUFFER = 1024 * 1024
+PARSE_BATCH = 10_000
+
+TimedLine = tuple[int, int, str]
+
+
+def iter_timed_lines(lines: Iterable[str]) -> Iterator[TimedLine]:
+    """
+    Снабжает строки лога временем в секундах эпохи.
+
+    Строки без метки времени (например, продолжение трассировки)
+    получают время предыдущей строки и не отрываются от неё.
+
+    :param lines: Итерируемый набор строк лога
+    :return: Итератор кортежей (время, порядковый номер, строка)
+    """
+    stamp = 0
+    for number, line in enumerate(lines):
+        try:
+            stamp = timestamp_to_epoch(line[:TIMESTAMP_WIDTH])
+        except ValueError:
+            pass
+        yield stamp, number, line
+
+
+@dataclass
+class ReorderedLines:
+    """
+    Класс упорядочивания строк одного источника в пределах окна.
+
+    Строка выдаётся, когда самая свежая увиденная метка опережает её
+    больше чем на window секунд. Строки, пришедшие позже уже выданных,
+    выдаются сразу и учитываются в счётчике late.
+    """
+
+    lines: Iterable[str]
+    window: float
+    late: int = 0
+
+    def __iter__(self) -> Iterator[TimedLine]:
+        """
+        Выдаёт строки источника по возрастанию времени.
+
+        :return: Итератор кортежей (время, порядковый номер, строка)
+        """
+        heap: list[TimedLine] = []
+        newest = released = None
+        for item in iter_timed_lines(self.lines):
+            if released is not None and item[0] < released:
+                self.late += 1
+                yield item
+                continue
+            heapq.heappush(heap, item)
+            if newest is None or item[0] > newest:
+                newest = item[0]
+            while heap and heap[0][0] <= newest - self.window:
+                released = heap[0][0]
+                yield heapq.heappop(heap)
+        while heap:
+            yield heapq.heappop(heap)
+
+
+class MergedLogs:
+    """
+    Класс слияния лог-файлов в один поток строк по времени.
+
+    Итерирование открывает файлы и выдаёт строки всех источников
+    в порядке времени; после обхода в late хранится число строк,
+    опоздавших больше чем на окно.
+    """
+
+    def __init__(
+        self,
+        log_files: list[Path],
+        window: float = MERGE_WINDOW,
+        buffer_size: int = READ_BUFFER,
+    ) -> None:
+        """
+        Инициализирует слияние.
+
+        :param log_files: Список путей к лог-файлам ('-' — стандартный ввод)
+        :param window: Допустимое отставание строк в секундах
+        :param buffer_size: Размер буфера чтения каждого файла
+        """
+        self.log_files = log_files
+        self.window = window
+        self.buffer_size = buffer_size
+        self.sources: list[ReorderedLines] = []
+
+    @property
+    def late(self) -> int:
+        """
+        Возвращает число строк, опоздавших больше чем на окно.
+
+        :return: Сумма опозданий по всем источникам
+        """
+        return sum(source.late for source in self.sources)
+
+    def _open(self, path: Path) -> io.TextIOBase:
+        """
+        Открывает источник для буферизованного чтения.
+
+        :param path: Путь к лог-файлу или '-'
+        :return: Текстовый поток
+        """
+        if str(path) == STDIN_MARKER:
+            return io.TextIOWrapper(
+                sys.stdin.buffer, encoding="utf-8", errors="replace"
+            )
+        return path.open(
+            mode="r", encoding="utf-8", errors="replace",
+            buffering=self.buffer_size,
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Выдаёт строки всех источников в порядке времени.
+
+        При равном времени строки идут в порядке файлов в списке.
+
+        :return: Итератор строк лога
+        """
+        files = [self._open(path) for path in self.log_files]
+        try:
+            self.sources = [
+                ReorderedLines(file, self.window) for file in files
+            ]
+            for _, _, line in heapq.merge(*self.sources, key=itemgetter(0)):
+                yield line
+        finally:
+            for path, file in zip(self.log_files, files):
+                if str(path) == STDIN_MARKER:
+                    file.detach()
+                else:
+                    file.close()
+
+
+def _batches(lines: Iterable[str], size: int) -> Iterator[list[str]]:
+    """
+    Группирует строки в пакеты для парсера.
+
+    :param lines: Итерируемый набор строк
+    :param size: Число строк в пакете
+    :return: Итератор списков строк
+    """
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def analyze_ordered(
+    log_files: list[Path],
+    report_class: type,
+    query: LogQuery | None = None,
+    window: float = MERGE_WINDOW,
+) -> Any:
+    """
+    Анализирует логи одним потоком в порядке времени.
+
+    Отчёт получает записи строго по возрастанию времени (с точностью
+    до окна), что нужно отчётам о последовательностях событий.
+    Об опоздавших строках сообщается в stderr.
+
+    :param log_files: Список путей к лог-файлам
+    :param report_class: Класс отчёта с методами add_data() и print_report()
+    :param query: Условия отбора записей (None — без отбора)
+    :param window: Допустимое отставание строк в секундах
+    :return: Экземпляр сформированного отчёта
+    :raises ValueError: Если окно отрицательное
+    """
+    if window < 0:
+        raise ValueError(f"окно слияния не может быть отрицательным: {window}")
+    report = report_class()
+    parser = LINE_PARSERS[get_record_kind(report_class)]
+    merged = MergedLogs(log_files, window=window)
+    for batch in _batches(merged, PARSE_BATCH):
+        report.add_data(parser(batch, query))
+    if merged.late:
+        print(f"Строк вне порядка больше окна {window:g} с: {merged.late}",
+              file=sys.stderr)
+    return report
@@ -4,8 +4,16 @@
 REPORTS_REGISTRY - реестр доступных классов отчётов.
 """
 
+from logs_analyzer.reports.anomalies import AnomalyReport
+from logs_analyzer.reports.db import DBReport
+from logs_analyzer.reports.errors import ErrorReport
 from logs_analyzer.reports.handlers import HandlerReport
+from logs_analyzer.reports.timeline import TimelineReport
 
 REPORTS_REGISTRY: dict[str, type] = {
     "handlers": HandlerReport,
+    "errors": ErrorReport,
+    "timeline": TimelineReport,
+    "db": DBReport,
+    "anomalies": AnomalyReport,
 }
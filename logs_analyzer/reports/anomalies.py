@@ -0,0 +1,241 @@
+"""Модуль содержит класс AnomalyReport."""
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+
+from logs_analyzer.logs_parser import ERROR_LEVELS
+from logs_analyzer.reports.timeline import format_time
+
+ALPHA = 0.1
+Z_THRESHOLD = 3.0
+WARMUP_MINUTES = 5
+MIN_REQUESTS = 3
+MIN_STD = 0.02
+MAX_ANOMALIES = 20
+
+
+@dataclass(slots=True)
+class ErrorRatioNorm:
+    """
+    Норма обработчика по закрытым минутам.
+
+    Экспоненциально взвешенные среднее и дисперсия доли ошибок
+    и среднее число запросов в минуту.
+    """
+
+    minutes: int = 0
+    rate: float = 0.0
+    ratio: float = 0.0
+    variance: float = 0.0
+
+    def update(self, requests: int, errors: int) -> None:
+        """
+        Учитывает закрытую минуту за O(1).
+
+        :param requests: Число запросов минуты (больше нуля)
+        :param errors: Число ошибок минуты
+        :return: None
+        """
+        ratio = errors / requests
+        if not self.minutes:
+            self.ratio, self.rate = ratio, float(requests)
+        else:
+            diff = ratio - self.ratio
+            increment = ALPHA * diff
+            self.ratio += increment
+            self.variance = (1 - ALPHA) * (self.variance + diff * increment)
+            self.rate += ALPHA * (requests - self.rate)
+        self.minutes += 1
+
+
+@dataclass(slots=True)
+class HandlerBaseline:
+    """
+    Модель нормы одного обработчика.
+
+    Хранит счётчики текущей минуты, норму прошлых минут
+    и последние аномалии. Размер состояния не зависит от длины потока.
+    """
+
+    minute: int | None = None
+    requests: int = 0
+    errors: int = 0
+    norm: ErrorRatioNorm = field(default_factory=ErrorRatioNorm)
+    anomalies: deque[tuple[int, int, int, float, float]] = field(
+        default_factory=lambda: deque(maxlen=MAX_ANOMALIES)
+    )
+
+
+class AnomalyReport:
+    """
+    Класс для формирования отчёта о всплесках доли ошибок.
+
+    Для каждого обработчика записи группируются по минутам.
+    Когда минута закрывается, её доля ошибок сравнивается с нормой
+    (EWMA и EWMVar прошлых минут): минута с z-оценкой выше threshold
+    считается аномальной. Затем норма обновляется за O(1).
+    Отчёт рассчитан на записи в порядке времени; для каждого
+    обработчика хранится не больше MAX_ANOMALIES последних аномалий.
+    """
+
+    record_kind = "timeline"
+    requires_order = True
+    threshold = Z_THRESHOLD
+
+    def __init__(self) -> None:
+        """
+        Инициализирует структуру данных.
+
+        Модели нормы по обработчикам.
+        """
+        self.data: dict[str, HandlerBaseline] = {}
+
+    @classmethod
+    def configured(cls, threshold: float) -> type:
+        """
+        Создаёт класс отчёта с другим порогом z-оценки.
+
+        :param threshold: Порог z-оценки
+        :return: Подкласс AnomalyReport
+        :raises ValueError: Если порог не положительный
+        """
+        if threshold <= 0:
+            raise ValueError(f"порог должен быть положительным: {threshold}")
+        return type(cls.__name__, (cls,), {"threshold": threshold})
+
+    def _score(self, baseline: HandlerBaseline) -> float | None:
+        """
+        Считает z-оценку доли ошибок текущей минуты.
+
+        :param baseline: Модель нормы обработчика
+        :return: z-оценка или None, если данных для оценки мало
+        """
+        if baseline.norm.minutes < WARMUP_MINUTES or (
+            baseline.requests < MIN_REQUESTS
+        ):
+            return None
+        norm = baseline.norm
+        std = max(math.sqrt(norm.variance), MIN_STD)
+        return (baseline.errors / baseline.requests - norm.ratio) / std
+
+    def _close_minute(self, baseline: HandlerBaseline) -> None:
+        """
+        Оценивает закрытую минуту и обновляет норму.
+
+        :param baseline: Модель нормы обработчика
+        :return: None
+        """
+        if baseline.requests < MIN_REQUESTS:
+            return
+        score = self._score(baseline)
+        if score is not None and score > self.threshold:
+            baseline.anomalies.append((
+                baseline.minute, baseline.requests, baseline.errors,
+                baseline.norm.ratio, score,
+            ))
+        baseline.norm.update(baseline.requests, baseline.errors)
+
+    def add_data(self, records: list[dict]) -> None:
+        """
+        Добавляет записи в модели нормы.
+
+        Запись из более ранней минуты, чем текущая, учитывается
+        в текущей минуте.
+
+        :param records: Список словарей с данными логов,
+                        где каждый словарь содержит:
+                        - 'handler': путь обработчика запроса (str)
+                        - 'level': уровень логирования (str)
+                        - 'time': время в секундах эпохи (int)
+        :return: None
+        """
+        for record in records:
+            baseline = self.data.get(record["handler"])
+            if baseline is None:
+                baseline = self.data[record["handler"]] = HandlerBaseline()
+            minute = record["time"] - record["time"] % 60
+            if baseline.minute is None:
+                baseline.minute = minute
+            elif minute > baseline.minute:
+                self._close_minute(baseline)
+                baseline.minute = minute
+                baseline.requests = baseline.errors = 0
+            baseline.requests += 1
+            baseline.errors += record["level"] in ERROR_LEVELS
+
+    def _rows(self) -> list[tuple[str, int, int, int, float, float]]:
+        """
+        Собирает аномалии всех обработчиков, включая текущую минуту.
+
+        Текущая минута ещё не закрыта, поэтому оценивается
+        без изменения нормы.
+
+        :return: Кортежи (обработчик, минута, запросы, ошибки,
+                 норма доли ошибок, z) в порядке времени
+        """
+        rows = [
+            (handler, *anomaly)
+            for handler, baseline in self.data.items()
+            for anomaly in baseline.anomalies
+        ]
+        for handler, baseline in self.data.items():
+            score = self._score(baseline)
+            if score is not None and score > self.threshold:
+                rows.append((handler, baseline.minute, baseline.requests,
+                             baseline.errors, baseline.norm.ratio, score))
+        return sorted(rows, key=lambda row: (row[1], row[0]))
+
+    def as_dict(self) -> dict:
+        """
+        Возвращает данные отчёта в виде, пригодном для JSON.
+
+        :return: Словарь с аномалиями и нормой по обработчикам
+        """
+        return {
+            "threshold": self.threshold,
+            "anomalies": [
+                {
+                    "handler": handler,
+                    "minute": format_time(minute),
+                    "requests": requests,
+                    "errors": errors,
+                    "baseline": round(ratio, 4),
+                    "z": round(score, 2),
+                }
+                for handler, minute, requests, errors, ratio, score
+                in self._rows()
+            ],
+            "baselines": {
+                handler: {
+                    "minutes": baseline.norm.minutes,
+                    "requests_per_minute": round(baseline.norm.rate, 2),
+                    "error_ratio": round(baseline.norm.ratio, 4),
+                }
+                for handler, baseline in sorted(self.data.items())
+            },
+        }
+
+    def print_report(self) -> None:
+        """
+        Выводит минуты со всплесками доли ошибок в порядке времени.
+
+        :return: None
+        """
+        rows = self._rows()
+        print(f"\nAnomalies: {len(rows)} (z > {self.threshold:g})\n")
+        handler_width = 26
+        time_width = 21
+        count_width = 10
+        print(f"{'HANDLER'.ljust(handler_width)}"
+              f"{'MINUTE'.ljust(time_width)}"
+              f"{'REQUESTS'.ljust(count_width)}"
+              f"{'ERRORS'.ljust(count_width)}"
+              f"{'BASELINE'.ljust(count_width)}Z")
+        for handler, minute, requests, errors, ratio, score in rows:
+            print(f"{handler.ljust(handler_width)}"
+                  f"{format_time(minute).ljust(time_width)}"
+                  f"{str(requests).ljust(count_width)}"
+                  f"{str(errors).ljust(count_width)}"
+                  f"{ratio:<{count_width}.2f}"
+                  f"{score:.1f}")
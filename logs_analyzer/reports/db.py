@@ -0,0 +1,119 @@
+"""Модуль содержит класс DBReport."""
+
+from logs_analyzer.sketch import RELATIVE_ACCURACY, DDSketch
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class DBReport:
+    """
+    Класс для формирования отчёта по длительности запросов к базе.
+
+    Для каждой формы запроса хранит скетч DDSketch, поэтому память
+    на форму фиксирована, а квантили p50/p95/p99 оцениваются
+    с относительной погрешностью RELATIVE_ACCURACY.
+    """
+
+    record_kind = "db"
+
+    def __init__(self) -> None:
+        """
+        Инициализирует структуру данных.
+
+        Скетчи длительностей 'форма запроса -> DDSketch'.
+        """
+        self.data: dict[str, DDSketch] = {}
+
+    @property
+    def total_queries(self) -> int:
+        """
+        Возвращает общее количество запросов.
+
+        :return: Сумма счётчиков по всем формам
+        """
+        return sum(sketch.count for sketch in self.data.values())
+
+    def add_data(self, records: list[dict]) -> None:
+        """
+        Добавляет записи о запросах к базе в отчёт.
+
+        :param records: Список словарей с данными логов,
+                        где каждый словарь содержит:
+                        - 'shape': форма запроса (str)
+                        - 'duration': длительность в секундах (float)
+        :return: None
+        """
+        for record in records:
+            sketch = self.data.get(record["shape"])
+            if sketch is None:
+                sketch = self.data[record["shape"]] = DDSketch()
+            sketch.add(record["duration"])
+
+    def merge(self, other: "DBReport") -> None:
+        """
+        Добавляет в отчёт данные другого отчёта.
+
+        Используется для объединения частичных отчётов воркеров.
+
+        :param other: Отчёт того же класса
+        :return: None
+        """
+        for shape, sketch in other.data.items():
+            if shape not in self.data:
+                self.data[shape] = DDSketch()
+            self.data[shape].merge(sketch)
+
+    def _rows(self) -> list[tuple[str, DDSketch]]:
+        """
+        Возвращает формы запросов по убыванию количества.
+
+        :return: Пары (форма запроса, скетч)
+        """
+        return sorted(
+            self.data.items(), key=lambda item: (-item[1].count, item[0])
+        )
+
+    def as_dict(self) -> dict:
+        """
+        Возвращает данные отчёта в виде, пригодном для JSON.
+
+        :return: Словарь с общим количеством запросов и квантилями
+                 длительности по формам запросов
+        """
+        return {
+            "total_queries": self.total_queries,
+            "relative_accuracy": RELATIVE_ACCURACY,
+            "queries": {
+                shape: {
+                    "count": sketch.count,
+                    "total": round(sketch.total, 6),
+                    **{
+                        f"p{round(q * 100)}": sketch.quantile(q)
+                        for q in QUANTILES
+                    },
+                }
+                for shape, sketch in self._rows()
+            },
+        }
+
+    def print_report(self) -> None:
+        """
+        Выводит квантили длительности по формам запросов.
+
+        Формы отсортированы по убыванию количества запросов,
+        длительности выводятся в секундах.
+
+        :return: None
+        """
+        print(f"\nTotal queries: {self.total_queries}\n")
+        count_width = 8
+        value_width = 10
+        print(f"{'COUNT'.ljust(count_width)}"
+              + "".join(f"P{round(q * 100)}".ljust(value_width)
+                        for q in QUANTILES)
+              + "QUERY")
+        for shape, sketch in self._rows():
+            print(f"{str(sketch.count).ljust(count_width)}"
+                  + "".join(f"{sketch.quantile(q):.3f}".ljust(value_width)
+                            for q in QUANTILES)
+                  + shape)
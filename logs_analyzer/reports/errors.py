@@ -0,0 +1,125 @@
+"""Модуль содержит класс ErrorReport."""
+
+from collections import defaultdict
+
+from logs_analyzer.drain import DrainMiner
+
+TOP_SIGNATURES = 3
+
+
+class ErrorReport:
+    """
+    Класс для формирования отчёта по сигнатурам ошибок.
+
+    Группирует тексты исключений строк ERROR и CRITICAL в шаблоны
+    потоковым майнером DrainMiner и считает их по обработчикам.
+    """
+
+    record_kind = "errors"
+
+    def __init__(self) -> None:
+        """
+        Инициализирует структуру данных.
+
+        Майнер шаблонов сообщений.
+        Счётчики 'обработчик -> номер кластера -> количество'.
+        Счётчик общего количества ошибок.
+        """
+        self.miner = DrainMiner()
+        self.data: dict[str, dict[int, int]] =\
+            defaultdict(lambda: defaultdict(int))
+        self.total_errors = 0
+
+    def add_data(self, records: list[dict[str, str]]) -> None:
+        """
+        Добавляет записи об ошибках в отчёт.
+
+        Каждая запись должна содержать ключи 'handler' и 'message'.
+
+        :param records: Список словарей с данными логов,
+                        где каждый словарь содержит:
+                        - 'handler': путь обработчика или имя логгера (str)
+                        - 'message': текст исключения (str)
+        :return: None
+        """
+        for record in records:
+            cluster = self.miner.add(record["message"])
+            self.data[record["handler"]][cluster.cluster_id] += 1
+            self.total_errors += 1
+
+    def merge(self, other: "ErrorReport") -> None:
+        """
+        Добавляет в отчёт данные другого отчёта.
+
+        Номера кластеров у отчётов свои, поэтому шаблоны другого
+        отчёта заново относятся к кластерам этого майнера вместе
+        с числом сообщений. Шаблоны, как у любого потокового майнера,
+        зависят от порядка объединения, поэтому analyze_logs
+        объединяет частичные отчёты в порядке постановки задач.
+
+        :param other: Отчёт того же класса
+        :return: None
+        """
+        for handler, clusters in other.data.items():
+            for cluster_id, count in sorted(clusters.items()):
+                cluster = self.miner.add(
+                    other.miner.template(cluster_id), count
+                )
+                self.data[handler][cluster.cluster_id] += count
+        self.total_errors += other.total_errors
+
+    def top_signatures(self, handler: str) -> list[tuple[str, int]]:
+        """
+        Возвращает самые частые сигнатуры обработчика.
+
+        :param handler: Путь обработчика или имя логгера
+        :return: Не более TOP_SIGNATURES пар (шаблон, количество)
+                 по убыванию количества, при равенстве — по шаблону
+        """
+        return sorted(
+            (
+                (self.miner.template(cluster_id), count)
+                for cluster_id, count in self.data[handler].items()
+            ),
+            key=lambda item: (-item[1], item[0]),
+        )[:TOP_SIGNATURES]
+
+    def as_dict(self) -> dict:
+        """
+        Возвращает данные отчёта в виде, пригодном для JSON.
+
+        :return: Словарь с общим количеством ошибок и самыми частыми
+                 сигнатурами по обработчикам
+        """
+        return {
+            "total_errors": self.total_errors,
+            "handlers": {
+                handler: [
+                    {"signature": template, "count": count}
+                    for template, count in self.top_signatures(handler)
+                ]
+                for handler in sorted(self.data)
+            },
+        }
+
+    def print_report(self) -> None:
+        """
+        Выводит самые частые сигнатуры ошибок по каждому обработчику.
+
+        Для каждого обработчика печатается не более TOP_SIGNATURES
+        шаблонов, отсортированных по убыванию количества.
+
+        :return: None
+        """
+        print(f"\nTotal errors: {self.total_errors}\n")
+        handler_width = 26
+        count_width = 8
+        print(f"{'HANDLER'.ljust(handler_width)}"
+              f"{'COUNT'.ljust(count_width)}SIGNATURE")
+        for handler in sorted(self.data):
+            top = self.top_signatures(handler)
+            for position, (template, count) in enumerate(top):
+                name = handler if position == 0 else ""
+                print(f"{name.ljust(handler_width)}"
+                      f"{str(count).ljust(count_width)}"
+                      f"{template}")
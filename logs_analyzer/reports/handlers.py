@@ -1,8 +1,14 @@
 """Модуль содержит класс HandlerReport."""
 
+import sys
 from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
 
 LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+# Оценка памяти: словарь уровней обработчика со слотом в data
+# и объект счётчика уровня (без размера строки пути).
+HANDLER_BYTES = 264
+LEVEL_BYTES = 32
 
 
 class HandlerReport:
@@ -13,16 +19,36 @@ class HandlerReport:
     Сохраняет общее количество запросов.
     """
 
+    record_kind = "requests"
+
     def __init__(self) -> None:
         """
         Инициализирует структуру данных.
 
         Данные для хранения статистики.
         Счётчик общего количества запросов.
+        Текущая оценка размера данных в байтах.
         """
         self.data: dict[str, dict[str, int]] =\
             defaultdict(lambda: defaultdict(int))
         self.total_requests = 0
+        self.memory = 0
+
+    def _levels(self, handler: str, level: str) -> dict[str, int]:
+        """
+        Возвращает счётчики обработчика и учитывает новые ключи в оценке.
+
+        :param handler: Путь обработчика
+        :param level: Уровень, счётчик которого сейчас изменится
+        :return: Счётчики 'уровень -> количество' обработчика
+        """
+        levels = self.data.get(handler)
+        if levels is None:
+            levels = self.data[handler]
+            self.memory += sys.getsizeof(handler) + HANDLER_BYTES
+        if level not in levels:
+            self.memory += LEVEL_BYTES
+        return levels
 
     def add_data(self, records: list[dict[str, str]]) -> None:
         """
@@ -43,9 +69,117 @@ class HandlerReport:
             level = record["level"]
             if level not in LOG_LEVELS:
                 continue
-            self.data[handler][level] += 1
+            self._levels(handler, level)[level] += 1
             self.total_requests += 1
 
+    def add_counts(self, counts: Iterable[tuple[str, str, int]]) -> None:
+        """
+        Добавляет в отчёт уже агрегированные счётчики.
+
+        Используется источниками, которые считают записи сами
+        (например, база SQLite), чтобы не разворачивать счётчики
+        обратно в отдельные записи.
+
+        :param counts: Тройки (обработчик, уровень, количество)
+        :return: None
+        """
+        for handler, level, count in counts:
+            if level not in LOG_LEVELS:
+                continue
+            self._levels(handler, level)[level] += count
+            self.total_requests += count
+
+    def merge(self, other: "HandlerReport") -> None:
+        """
+        Добавляет в отчёт данные другого отчёта.
+
+        Используется для объединения частичных отчётов воркеров.
+
+        :param other: Отчёт того же класса
+        :return: None
+        """
+        self.add_counts(
+            (handler, level, count)
+            for handler, levels in other.data.items()
+            for level, count in levels.items()
+        )
+
+    def memory_usage(self) -> int:
+        """
+        Оценивает размер данных отчёта в памяти.
+
+        Оценка ведётся при добавлении данных и учитывает длину путей
+        обработчиков и число уровней у каждого.
+
+        :return: Примерное число байтов
+        """
+        return self.memory
+
+    def spill_items(self) -> list[tuple[str, dict[str, int]]]:
+        """
+        Возвращает счётчики обработчиков в порядке пути.
+
+        :return: Пары (обработчик, счётчики по уровням)
+        """
+        return [
+            (handler, dict(levels))
+            for handler, levels in sorted(self.data.items())
+        ]
+
+    @staticmethod
+    def combine(
+        first: dict[str, int], second: dict[str, int]
+    ) -> dict[str, int]:
+        """
+        Объединяет счётчики одного обработчика из разных прогонов.
+
+        :param first: Счётчики по уровням
+        :param second: Счётчики по уровням
+        :return: Суммарные счётчики
+        """
+        return {
+            level: first.get(level, 0) + second.get(level, 0)
+            for level in first.keys() | second.keys()
+        }
+
+    def as_dict(self) -> dict:
+        """
+        Возвращает данные отчёта в виде, пригодном для JSON.
+
+        :return: Словарь с общим количеством запросов и счётчиками
+                 'обработчик -> уровень -> количество'
+        """
+        return {
+            "total_requests": self.total_requests,
+            "handlers": {
+                handler: dict(levels)
+                for handler, levels in sorted(self.data.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HandlerReport":
+        """
+        Восстанавливает отчёт из словаря, полученного as_dict.
+
+        :param data: Словарь с ключом 'handlers'
+        :return: Отчёт с теми же счётчиками
+        :raises ValueError: Если словарь не похож на данные отчёта
+        """
+        handlers = data.get("handlers") if isinstance(data, dict) else None
+        if not isinstance(handlers, dict):
+            raise ValueError("нет счётчиков обработчиков")
+        report = cls()
+        try:
+            report.add_counts(
+                (handler, level, int(count))
+                for handler, levels in handlers.items()
+                for level, count in levels.items()
+            )
+        except (AttributeError, TypeError, ValueError) as er:
+            raise ValueError(f"некорректные счётчики: {er}") from er
+        return report
+
     def print_report(self) -> None:
         """
         Выводит отчёт по обработчикам запросов в табличном виде.
@@ -56,7 +190,29 @@ class HandlerReport:
 
         :return: None
         """
-        print(f"\nTotal requests: {self.total_requests}\n")
+        self.print_items(lambda: sorted(self.data.items()))
+
+    @staticmethod
+    def print_items(
+        items: Callable[[], Iterator[tuple[str, dict[str, int]]]]
+    ) -> None:
+        """
+        Выводит отчёт по потоку счётчиков, отсортированному по пути.
+
+        Поток читается дважды (для общего итога и для таблицы),
+        а в памяти держатся только итоги по уровням, поэтому так
+        выводится и отчёт, сброшенный на диск.
+
+        :param items: Функция, возвращающая новый итератор пар
+                      (обработчик, счётчики по уровням)
+        :return: None
+        """
+        total = sum(
+            levels.get(level, 0)
+            for _, levels in items()
+            for level in LOG_LEVELS
+        )
+        print(f"\nTotal requests: {total}\n")
         header = ["HANDLER"] + LOG_LEVELS
         handler_width = 20
         level_width = 10
@@ -65,17 +221,18 @@ class HandlerReport:
         )
         print(header_str)
 
-        for handler in sorted(self.data.keys()):
+        totals = dict.fromkeys(LOG_LEVELS, 0)
+        for handler, levels in items():
 
             counts = [
-                str(self.data[handler].get(level, 0)).ljust(level_width)
+                str(levels.get(level, 0)).ljust(level_width)
                 for level in LOG_LEVELS
             ]
             print(f"{handler.ljust(handler_width)}{''.join(counts)}")
+            for level in LOG_LEVELS:
+                totals[level] += levels.get(level, 0)
 
-        totals = [
-            str(sum(self.data[h].get(level, 0) for h in self.data))
-            .ljust(level_width)
-            for level in LOG_LEVELS
-        ]
-        print(f"{''.ljust(handler_width)}{''.join(totals)}")
+        row = "".join(
+            str(totals[level]).ljust(level_width) for level in LOG_LEVELS
+        )
+        print(f"{''.ljust(handler_width)}{row}")
@@ -0,0 +1,129 @@
+"""Модуль содержит класс SampledHandlerReport."""
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+
+from logs_analyzer.reports.handlers import LOG_LEVELS
+
+
+@dataclass
+class Coverage:
+    """Объём прочитанных при выборке данных."""
+
+    blocks_read: int = 0
+    blocks_total: int = 0
+    bytes_read: int = 0
+    bytes_total: int = 0
+
+    def add(self, other: "Coverage") -> None:
+        """
+        Прибавляет объём данных другого файла.
+
+        :param other: Объём данных файла
+        :return: None
+        """
+        self.blocks_read += other.blocks_read
+        self.blocks_total += other.blocks_total
+        self.bytes_read += other.bytes_read
+        self.bytes_total += other.bytes_total
+
+
+@dataclass
+class FileSample:
+    """
+    Оценки одного файла по выборке блоков.
+
+    Оценки заданы парами (оценка, дисперсия): по ячейкам
+    '(обработчик, уровень)' и по общему числу запросов.
+    """
+
+    estimates: dict[tuple[str, str], tuple[float, float]]
+    total: tuple[float, float]
+    coverage: Coverage
+
+
+class SampledHandlerReport:
+    """
+    Класс приближённого отчёта по обработчикам.
+
+    Формируется режимом выборки (--sample): хранит оценки счётчиков
+    и их дисперсии, а также долю прочитанных данных.
+    Оценки независимых файлов складываются вместе с дисперсиями.
+    """
+
+    def __init__(self, rate: float, z: float) -> None:
+        """
+        Инициализирует структуру данных.
+
+        Оценки 'обработчик -> уровень -> [оценка, дисперсия]'
+        и [оценка, дисперсия] общего числа запросов.
+        Объём прочитанных блоков и байтов.
+
+        :param rate: Запрошенная доля выборки
+        :param z: Квантиль нормального распределения для интервала
+        """
+        self.rate = rate
+        self.z = z
+        self.data: dict[str, dict[str, list[float]]] =\
+            defaultdict(lambda: defaultdict(lambda: [0.0, 0.0]))
+        self.total = [0.0, 0.0]
+        self.coverage = Coverage()
+
+    def add_sample(self, sample: FileSample) -> None:
+        """
+        Добавляет оценки и объём прочитанных данных одного файла.
+
+        :param sample: Оценки файла
+        :return: None
+        """
+        for (handler, level), (estimate, variance) in (
+            sample.estimates.items()
+        ):
+            cell = self.data[handler][level]
+            cell[0] += estimate
+            cell[1] += variance
+        self.total[0] += sample.total[0]
+        self.total[1] += sample.total[1]
+        self.coverage.add(sample.coverage)
+
+    def interval(self, estimate: float, variance: float) -> str:
+        """
+        Форматирует оценку с полушириной доверительного интервала.
+
+        :param estimate: Оценка счётчика
+        :param variance: Дисперсия оценки
+        :return: Строка вида '1200±35'
+        """
+        return f"{estimate:.0f}±{self.z * math.sqrt(variance):.0f}"
+
+    def print_report(self) -> None:
+        """
+        Выводит приближённый отчёт в табличном виде.
+
+        Каждая ячейка содержит оценку и полуширину доверительного
+        интервала; в заголовке указана доля прочитанных данных.
+
+        :return: None
+        """
+        coverage = self.coverage
+        share = (coverage.bytes_read / coverage.bytes_total
+                 if coverage.bytes_total else 0)
+        print(f"\nSampled {coverage.blocks_read} of "
+              f"{coverage.blocks_total} blocks "
+              f"({share:.1%} of bytes, rate {self.rate:g})")
+        print(f"Total requests: ~{self.interval(*self.total)}\n")
+        header = ["HANDLER"] + LOG_LEVELS
+        handler_width = 20
+        level_width = 14
+        print(header[0].ljust(handler_width) + "".join(
+            h.ljust(level_width) for h in header[1:]
+        ))
+
+        for handler in sorted(self.data):
+            cells = [
+                self.interval(*self.data[handler].get(level, (0.0, 0.0)))
+                .ljust(level_width)
+                for level in LOG_LEVELS
+            ]
+            print(f"{handler.ljust(handler_width)}{''.join(cells)}")
@@ -0,0 +1,137 @@
+"""Модуль содержит класс TimelineReport."""
+
+import time
+from dataclasses import dataclass
+
+from logs_analyzer.logs_parser import ERROR_LEVELS, TIMESTAMP_FORMAT
+
+BURST_GAP = 60
+
+
+@dataclass(slots=True)
+class HandlerTimeline:
+    """
+    Хронология одного обработчика.
+
+    Хранит счётчики запросов и ошибок, время первой и последней
+    ошибки и число всплесков ошибок.
+    """
+
+    requests: int = 0
+    errors: int = 0
+    first_error: int | None = None
+    last_error: int | None = None
+    bursts: int = 0
+
+
+def format_time(stamp: int | None) -> str:
+    """
+    Форматирует время в секундах эпохи как метку строки лога.
+
+    :param stamp: Время в секундах эпохи (None — нет события)
+    :return: Строка 'YYYY-MM-DD HH:MM:SS' или '-'
+    """
+    if stamp is None:
+        return "-"
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime(stamp))
+
+
+class TimelineReport:
+    """
+    Класс для формирования отчёта о хронологии ошибок.
+
+    Для каждого обработчика выводит первую и последнюю ошибку
+    и число всплесков — серий ошибок, разделённых паузой больше
+    BURST_GAP секунд. Всплески считаются по ходу потока, поэтому
+    отчёт требует записей в порядке времени и не объединяется
+    из частичных отчётов: всплеск может начинаться в одной части
+    и продолжаться в другой.
+    """
+
+    record_kind = "timeline"
+    requires_order = True
+
+    def __init__(self) -> None:
+        """
+        Инициализирует структуру данных.
+
+        Хронологии по обработчикам.
+        Счётчик общего количества ошибок.
+        """
+        self.data: dict[str, HandlerTimeline] = {}
+        self.total_errors = 0
+
+    def add_data(self, records: list[dict]) -> None:
+        """
+        Добавляет записи в хронологию.
+
+        :param records: Список словарей с данными логов,
+                        где каждый словарь содержит:
+                        - 'handler': путь обработчика запроса (str)
+                        - 'level': уровень логирования (str)
+                        - 'time': время в секундах эпохи (int)
+        :return: None
+        """
+        for record in records:
+            timeline = self.data.get(record["handler"])
+            if timeline is None:
+                timeline = self.data[record["handler"]] = HandlerTimeline()
+            timeline.requests += 1
+            if record["level"] not in ERROR_LEVELS:
+                continue
+            stamp = record["time"]
+            timeline.errors += 1
+            self.total_errors += 1
+            if timeline.last_error is None or (
+                stamp - timeline.last_error > BURST_GAP
+            ):
+                timeline.bursts += 1
+            if timeline.first_error is None or stamp < timeline.first_error:
+                timeline.first_error = stamp
+            if timeline.last_error is None or stamp > timeline.last_error:
+                timeline.last_error = stamp
+
+    def as_dict(self) -> dict:
+        """
+        Возвращает данные отчёта в виде, пригодном для JSON.
+
+        :return: Словарь с общим количеством ошибок и хронологиями
+                 по обработчикам
+        """
+        return {
+            "total_errors": self.total_errors,
+            "handlers": {
+                handler: {
+                    "requests": timeline.requests,
+                    "errors": timeline.errors,
+                    "bursts": timeline.bursts,
+                    "first_error": format_time(timeline.first_error),
+                    "last_error": format_time(timeline.last_error),
+                }
+                for handler, timeline in sorted(self.data.items())
+            },
+        }
+
+    def print_report(self) -> None:
+        """
+        Выводит хронологию ошибок по обработчикам в табличном виде.
+
+        :return: None
+        """
+        bursts = sum(timeline.bursts for timeline in self.data.values())
+        print(f"\nTotal errors: {self.total_errors} in {bursts} bursts\n")
+        handler_width = 26
+        count_width = 10
+        time_width = 21
+        print(f"{'HANDLER'.ljust(handler_width)}"
+              f"{'REQUESTS'.ljust(count_width)}"
+              f"{'ERRORS'.ljust(count_width)}"
+              f"{'BURSTS'.ljust(count_width)}"
+              f"{'FIRST ERROR'.ljust(time_width)}LAST ERROR")
+        for handler, timeline in sorted(self.data.items()):
+            print(f"{handler.ljust(handler_width)}"
+                  f"{str(timeline.requests).ljust(count_width)}"
+                  f"{str(timeline.errors).ljust(count_width)}"
+                  f"{str(timeline.bursts).ljust(count_width)}"
+                  f"{format_time(timeline.first_error).ljust(time_width)}"
+                  f"{format_time(timeline.last_error)}")
@@ -0,0 +1,201 @@
+"""
+Модуль выборочного анализа больших логов.
+
+Файл делится на блоки фиксированного размера, из них случайно
+выбирается доля rate, и разбираются только строки выбранных блоков.
+Счётчики масштабируются на весь файл по доле записей на байт, а по
+разбросу счётчиков между блоками оценивается доверительный интервал
+(кластерная выборка без возвращения с оценкой отношением и поправкой
+на конечность совокупности).
+"""
+
+import math
+import random
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+
+from logs_analyzer.logs_parser import LogQuery, parse_chunk, read_block
+from logs_analyzer.reports.handlers import LOG_LEVELS
+from logs_analyzer.reports.sampled import (Coverage, FileSample,
+                                           SampledHandlerReport)
+
+BLOCK_SIZE = 64 * 1024
+CONFIDENCE_Z = 1.96
+
+
+def _choose_blocks(
+    n_blocks: int, rate: float, rng: random.Random
+) -> list[int]:
+    """
+    Выбирает номера блоков для чтения.
+
+    Выбирается не меньше двух блоков (если они есть), чтобы можно
+    было оценить разброс; номера сортируются для последовательного
+    чтения с диска.
+
+    :param n_blocks: Число блоков в файле
+    :param rate: Доля блоков для чтения
+    :param rng: Генератор случайных чисел
+    :return: Отсортированные номера блоков
+    """
+    k = min(n_blocks, max(2, math.ceil(rate * n_blocks)))
+    return sorted(rng.sample(range(n_blocks), k))
+
+
+def _read_blocks(
+    path: Path, chosen: list[int], block_size: int, query: LogQuery | None
+) -> Iterator[tuple[int, Counter]]:
+    """
+    Разбирает выбранные блоки файла.
+
+    Записи с уровнями вне LOG_LEVELS не учитываются.
+
+    :param path: Путь к лог-файлу
+    :param chosen: Отсортированные номера блоков
+    :param block_size: Размер блока в байтах
+    :param query: Условия отбора записей (None — без отбора)
+    :return: Итератор пар (прочитано байтов,
+             счётчик '(обработчик, уровень) -> число записей')
+    """
+    with path.open(mode="rb") as file:
+        for block in chosen:
+            start = block * block_size
+            chunk = read_block(file, start, start + block_size)
+            yield len(chunk), Counter(
+                (record["handler"], record["level"])
+                for record in parse_chunk(chunk, query)
+                if record["level"] in LOG_LEVELS
+            )
+
+
+class _BlockSums:
+    """
+    Класс сумм по прочитанным блокам для оценки отношением.
+
+    Блоки выровнены по строкам и различаются по размеру (последний
+    блок короче), поэтому счётчик оценивается как доля записей
+    на байт, умноженная на размер файла, а дисперсия — по остаткам
+    d = y - R * x, где x — размер блока:
+    N^2 * (1 - k/N) * s_d^2 / k.
+    Общее число запросов хранится под ключом None: ячейки одного
+    блока зависимы, и его дисперсия считается по итогам блоков,
+    а не суммой дисперсий ячеек.
+    """
+
+    def __init__(self) -> None:
+        """
+        Инициализирует суммы.
+
+        Для каждого ключа — суммы y, y^2 и x * y;
+        для размеров блоков — суммы x и x^2.
+        """
+        self.blocks = 0
+        self.sizes = [0, 0]
+        self.sums: Counter = Counter()
+        self.squares: Counter = Counter()
+        self.products: Counter = Counter()
+
+    def add(self, length: int, counts: Counter) -> None:
+        """
+        Учитывает один прочитанный блок.
+
+        :param length: Прочитано байтов
+        :param counts: Счётчик '(обработчик, уровень) -> число записей'
+        :return: None
+        """
+        self.blocks += 1
+        self.sizes[0] += length
+        self.sizes[1] += length * length
+        for key, value in [*counts.items(), (None, counts.total())]:
+            self.sums[key] += value
+            self.squares[key] += value * value
+            self.products[key] += value * length
+
+    def estimate(
+        self, key: tuple[str, str] | None, n_blocks: int, size: int
+    ) -> tuple[float, float]:
+        """
+        Оценивает счётчик файла.
+
+        :param key: Ячейка '(обработчик, уровень)' или None для общего
+                    числа запросов
+        :param n_blocks: Число блоков в файле (N)
+        :param size: Размер файла в байтах
+        :return: Пара (оценка, дисперсия оценки); без данных нули
+        """
+        k = self.blocks
+        if not self.sizes[0]:
+            return 0.0, 0.0
+        ratio = self.sums[key] / self.sizes[0]
+        spread = (
+            self.squares[key] - 2 * ratio * self.products[key]
+            + ratio * ratio * self.sizes[1]
+        ) / (k - 1) if k > 1 else 0.0
+        variance = n_blocks ** 2 * (1 - k / n_blocks) * max(spread, 0.0) / k
+        return ratio * size, variance
+
+
+def sample_file(
+    path: Path,
+    rate: float,
+    query: LogQuery | None = None,
+    rng: random.Random | None = None,
+    block_size: int = BLOCK_SIZE,
+) -> FileSample:
+    """
+    Оценивает счётчики одного файла по случайной выборке блоков.
+
+    :param path: Путь к лог-файлу
+    :param rate: Доля блоков для чтения (0 < rate <= 1)
+    :param query: Условия отбора записей (None — без отбора)
+    :param rng: Генератор случайных чисел
+    :param block_size: Размер блока в байтах
+    :return: Оценки и объём прочитанных данных файла
+    """
+    size = path.stat().st_size
+    n_blocks = math.ceil(size / block_size)
+    chosen = _choose_blocks(n_blocks, rate, rng or random.Random())
+    sums = _BlockSums()
+    for length, counts in _read_blocks(path, chosen, block_size, query):
+        sums.add(length, counts)
+    return FileSample(
+        estimates={
+            cell: sums.estimate(cell, n_blocks, size)
+            for cell in sums.sums if cell is not None
+        },
+        total=sums.estimate(None, n_blocks, size),
+        coverage=Coverage(
+            blocks_read=len(chosen),
+            blocks_total=n_blocks,
+            bytes_read=sums.sizes[0],
+            bytes_total=size,
+        ),
+    )
+
+
+def sample_logs(
+    log_files: list[Path],
+    rate: float,
+    query: LogQuery | None = None,
+    seed: int | None = None,
+) -> SampledHandlerReport:
+    """
+    Формирует приближённый отчёт по обработчикам по выборке блоков.
+
+    Время работы пропорционально доле rate, а не объёму логов.
+
+    :param log_files: Список путей к лог-файлам
+    :param rate: Доля блоков для чтения (0 < rate <= 1)
+    :param query: Условия отбора записей (None — без отбора)
+    :param seed: Зерно генератора для воспроизводимой выборки
+    :return: Приближённый отчёт с доверительными интервалами
+    :raises ValueError: Если доля выборки вне (0, 1]
+    """
+    if not 0 < rate <= 1:
+        raise ValueError(f"доля выборки должна быть в (0, 1]: {rate}")
+    rng = random.Random(seed)
+    report = SampledHandlerReport(rate=rate, z=CONFIDENCE_Z)
+    for log_file in log_files:
+        report.add_sample(sample_file(log_file, rate, query=query, rng=rng))
+    return report
@@ -0,0 +1,176 @@
+"""
+Модуль поиска интервала времени в упорядоченных лог-файлах.
+
+Логи Django обычно пишутся в порядке времени, поэтому для запроса
+с --since/--until не нужно читать файл с начала: границы интервала
+находятся бинарным поиском по смещениям. В точке пробы читается
+метка времени первой целой строки, и за O(log размера) проб
+определяется диапазон байтов, который затем разбирается блоками.
+
+Порядок проверяется выборочно: ORDER_PROBES проб по PROBE_LINES
+строк. Небольшой беспорядок (несколько процессов пишут в один файл)
+допускается в пределах ORDER_SLACK секунд, а границы поиска
+расширяются на столько же. Результат совпадает с полным чтением,
+только если беспорядок во всём файле не превышает ORDER_SLACK:
+участок с большим беспорядком между пробами не обнаруживается,
+и его записи за границами найденного диапазона пропускаются.
+Файлы, в которых пробы нашли беспорядок, читаются целиком.
+"""
+
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO
+
+from logs_analyzer.logs_parser import (DEFAULT_KIND, TIMESTAMP_FORMAT,
+                                       TIMESTAMP_WIDTH, LogQuery, parse_chunk,
+                                       read_block, timestamp_to_epoch)
+
+ORDER_SLACK = 5
+ORDER_PROBES = 16
+PROBE_LINES = 4
+SEEK_GRANULARITY = 64 * 1024
+SEEK_CHUNK_SIZE = 8 * 1024 * 1024
+
+_TIMESTAMP = re.compile(rb"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d")
+
+
+def _stamps_at(file: BinaryIO, offset: int, limit: int = 1) -> list[str]:
+    """
+    Читает метки времени первых целых строк начиная со смещения.
+
+    Строка, в которую попало смещение, пропускается, как в read_block;
+    строки без метки времени (продолжение трассировки) пропускаются.
+
+    :param file: Файл, открытый в бинарном режиме
+    :param offset: Смещение пробы
+    :param limit: Сколько меток прочитать
+    :return: Метки вида 'YYYY-MM-DD HH:MM:SS' (меньше limit у конца файла)
+    """
+    file.seek(max(offset - 1, 0))
+    if offset > 0 and file.read(1) != b"\n":
+        file.readline()
+    stamps: list[str] = []
+    for raw in file:
+        stamp = raw.lstrip()[:TIMESTAMP_WIDTH]
+        if _TIMESTAMP.fullmatch(stamp):
+            stamps.append(stamp.decode("ascii"))
+            if len(stamps) == limit:
+                break
+    return stamps
+
+
+def looks_ordered(file: BinaryIO, size: int) -> bool:
+    """
+    Проверяет пробами, что строки файла идут в порядке времени.
+
+    В ORDER_PROBES равномерно расположенных точках читается по
+    PROBE_LINES меток; метка может отставать от предыдущих
+    не больше чем на ORDER_SLACK секунд.
+
+    :param file: Файл, открытый в бинарном режиме
+    :param size: Размер файла
+    :return: True, если нарушений порядка не найдено
+    """
+    latest = None
+    for number in range(ORDER_PROBES):
+        for stamp in _stamps_at(
+            file, size * number // ORDER_PROBES, PROBE_LINES
+        ):
+            epoch = timestamp_to_epoch(stamp)
+            if latest is not None and epoch < latest - ORDER_SLACK:
+                return False
+            latest = epoch if latest is None else max(latest, epoch)
+    return True
+
+
+def _bisect(file: BinaryIO, size: int, stamp: str) -> tuple[int, int]:
+    """
+    Ищет бинарным поиском смещение, где метки доходят до stamp.
+
+    :param file: Файл, открытый в бинарном режиме
+    :param size: Размер файла
+    :param stamp: Искомая метка
+    :return: Смещения (lo, hi): первая целая строка после lo
+             раньше stamp (или lo = 0), после hi — не раньше stamp
+             (или hi = size); hi - lo не больше SEEK_GRANULARITY
+    """
+    lo, hi = 0, size
+    while hi - lo > SEEK_GRANULARITY:
+        mid = (lo + hi) // 2
+        found = _stamps_at(file, mid)
+        if not found or found[0] >= stamp:
+            hi = mid
+        else:
+            lo = mid
+    return lo, hi
+
+
+def _shift(stamp: str, seconds: int) -> str:
+    """
+    Сдвигает метку времени на заданное число секунд.
+
+    :param stamp: Метка вида 'YYYY-MM-DD HH:MM:SS'
+    :param seconds: Сдвиг в секундах
+    :return: Сдвинутая метка того же вида
+    """
+    moved = datetime.strptime(stamp, TIMESTAMP_FORMAT)
+    return (moved + timedelta(seconds=seconds)).strftime(TIMESTAMP_FORMAT)
+
+
+def seek_window(
+    file: BinaryIO, size: int, query: LogQuery
+) -> tuple[int, int] | None:
+    """
+    Находит диапазон байтов со строками интервала [since, until).
+
+    :param file: Файл, открытый в бинарном режиме
+    :param size: Размер файла
+    :param query: Условия отбора с границами времени
+    :return: Диапазон (начало, конец) или None для неупорядоченного файла
+    """
+    if not looks_ordered(file, size):
+        return None
+    start, end = 0, size
+    if query.since:
+        start = _bisect(file, size, _shift(query.since, -ORDER_SLACK))[0]
+    if query.until:
+        end = _bisect(file, size, _shift(query.until, ORDER_SLACK))[1]
+    return start, max(start, end)
+
+
+def parse_time_window(
+    path: Path, query: LogQuery, kind: str = DEFAULT_KIND
+) -> list[dict[str, str]] | None:
+    """
+    Парсит только часть файла, попадающую в интервал времени.
+
+    Диапазон читается блоками по SEEK_CHUNK_SIZE, а строки внутри
+    него дополнительно проверяются по границам времени.
+    О неупорядоченном файле сообщается в stderr.
+
+    :param path: Путь к лог-файлу
+    :param query: Условия отбора записей
+    :param kind: Вид записей, ключ LINE_PARSERS
+    :return: Список записей или None, если нет границ времени
+             или файл не упорядочен и его нужно читать целиком
+    """
+    if not (query.since or query.until):
+        return None
+    with path.open(mode="rb") as file:
+        size = file.seek(0, os.SEEK_END)
+        span = seek_window(file, size, query)
+        if span is None:
+            print(f"Файл {path} не упорядочен по времени, "
+                  "читается целиком", file=sys.stderr)
+            return None
+        start, end = span
+        records = []
+        for offset in range(start, end, SEEK_CHUNK_SIZE):
+            records.extend(parse_chunk(
+                read_block(file, offset, min(offset + SEEK_CHUNK_SIZE, end)),
+                query, kind,
+            ))
+    return records
@@ -0,0 +1,412 @@
+"""
+Модуль долгоживущего режима serve с HTTP-API на localhost.
+
+LogWatcher держит в памяти отчёты по набору наблюдаемых логов
+и в фоновом потоке дочитывает только новые строки. HTTP-запросы
+отвечают из готовых агрегатов, а отрисованные ответы кешируются
+до следующего изменения данных, поэтому частый опрос
+дашбордами не вызывает повторного парсинга.
+"""
+
+import contextlib
+import heapq
+import io
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from logs_analyzer.logs_parser import parse_chunk
+from logs_analyzer.utils import (get_record_kind, get_report_class,
+                                 requires_time_order)
+
+POLL_INTERVAL = 1.0
+DEFAULT_PORT = 8765
+READ_BLOCK_SIZE = 8 * 1024 * 1024
+CACHE_SIZE = 256
+ORDERED_BATCH_SIZE = 10_000
+
+# print_report пишет в sys.stdout, общий для всех потоков: текстовые
+# ответы отрисовываются по одному, иначе вывод отчётов перемешается.
+_STDOUT_LOCK = threading.Lock()
+
+
+class QueryError(ValueError):
+    """Ошибка в параметрах запроса к серверу."""
+
+
+class LogWatcher:
+    """
+    Класс инкрементальных агрегатов по наблюдаемым логам.
+
+    Помнит смещение прочитанной части каждого файла и при обновлении
+    разбирает только дописанные полные строки. Если файл стал
+    короче (ротация или перезапись), агрегаты строятся заново.
+    Отчёты по времени (requires_order) получают новые записи
+    всех файлов, слитые по времени.
+    """
+
+    def __init__(
+        self,
+        log_files: list[Path],
+        report_names: list[str],
+        classes: dict[str, type] | None = None,
+    ) -> None:
+        """
+        Инициализирует пустые агрегаты.
+
+        Для каждого отчёта запоминается вид его записей.
+
+        :param log_files: Список наблюдаемых лог-файлов
+        :param report_names: Имена отчётов из REPORTS_REGISTRY
+        :param classes: Классы отчётов вместо классов из REPORTS_REGISTRY,
+                        например с другим порогом (None — без замен)
+        """
+        self.log_files = log_files
+        classes = classes or {}
+        self.reports = {
+            name: classes.get(name, get_report_class(report_name=name))()
+            for name in report_names
+        }
+        self.kinds = {
+            name: get_record_kind(type(report))
+            for name, report in self.reports.items()
+        }
+        self.lock = threading.Lock()
+        self.version = 0
+        self.offsets = dict.fromkeys(log_files, 0)
+        self._cache: OrderedDict[tuple, tuple[str, bytes]] = OrderedDict()
+
+    def _new_reports(self) -> dict[str, Any]:
+        """
+        Создаёт пустые экземпляры наблюдаемых отчётов.
+
+        :return: Словарь 'имя отчёта -> экземпляр' тех же классов
+        """
+        return {name: type(report)() for name, report in self.reports.items()}
+
+    @staticmethod
+    def _read_new(path: Path, offset: int, size: int) -> Iterator[bytes]:
+        """
+        Читает блоками полные строки, дописанные после смещения.
+
+        Блок не длиннее READ_BLOCK_SIZE, кроме случая, когда в него
+        не помещается одна строка; незавершённая последняя строка
+        не читается.
+
+        :param path: Путь к лог-файлу
+        :param offset: Смещение уже прочитанной части
+        :param size: Текущий размер файла
+        :return: Итератор блоков, оканчивающихся переводом строки
+        """
+        if size <= offset:
+            return
+        with path.open(mode="rb") as file:
+            file.seek(offset)
+            rest = b""
+            for start in range(offset, size, READ_BLOCK_SIZE):
+                chunk = rest + file.read(min(READ_BLOCK_SIZE, size - start))
+                end = chunk.rfind(b"\n") + 1
+                rest = chunk[end:]
+                if end:
+                    yield chunk[:end]
+
+    def _parse_new(
+        self, reports: dict[str, Any], path: Path, offsets: dict, size: int
+    ) -> Iterator[tuple[int, str, dict]]:
+        """
+        Разбирает дописанные блоки файла.
+
+        Разбор идёт без блокировки; под блокировкой записи только
+        добавляются в отчёты, чтобы запросы не ждали парсинга.
+        Отчёты, не зависящие от порядка, получают записи блока сразу,
+        а записи для отчётов по времени выдаются для слияния
+        с другими файлами.
+
+        :param reports: Отчёты, в которые добавляются записи
+        :param path: Путь к лог-файлу
+        :param offsets: Смещения прочитанных частей, обновляются по блокам
+        :param size: Текущий размер файла
+        :return: Итератор троек (время, вид записей, запись)
+                 по возрастанию времени внутри блока
+        """
+        ordered_kinds = {
+            self.kinds[name] for name, report in reports.items()
+            if requires_time_order(type(report))
+        }
+        for chunk in self._read_new(path, offsets[path], size):
+            records = {
+                kind: parse_chunk(chunk, None, kind)
+                for kind in set(self.kinds.values())
+            }
+            with self.lock:
+                for name, report in reports.items():
+                    if not requires_time_order(type(report)):
+                        report.add_data(records[self.kinds[name]])
+                offsets[path] += len(chunk)
+                self.version += 1
+                self._cache.clear()
+            yield from sorted(
+                (
+                    (record["time"], kind, record)
+                    for kind in ordered_kinds for record in records[kind]
+                ),
+                key=itemgetter(0),
+            )
+
+    def refresh(self) -> bool:
+        """
+        Дочитывает новые строки и обновляет агрегаты.
+
+        Дописанные строки читаются и добавляются блоками, поэтому
+        память не зависит от объёма новой части. Отчётам, которым
+        нужен порядок времени, новые записи всех файлов передаются
+        слиянием по времени пакетами по ORDERED_BATCH_SIZE.
+        При перестроении агрегаты собираются заново и подменяют
+        старые по завершении.
+
+        :return: True, если данные изменились
+        """
+        sizes = {
+            path: path.stat().st_size if path.exists() else 0
+            for path in self.log_files
+        }
+        rebuild = any(sizes[path] < self.offsets[path] for path in sizes)
+        reports = self._new_reports() if rebuild else self.reports
+        offsets = dict.fromkeys(self.log_files, 0) if rebuild else (
+            self.offsets
+        )
+        version = self.version
+        merged = heapq.merge(
+            *(
+                self._parse_new(reports, path, offsets, size)
+                for path, size in sizes.items()
+            ),
+            key=itemgetter(0),
+        )
+        ordered = [
+            name for name, report in reports.items()
+            if requires_time_order(type(report))
+        ]
+        while batch := list(islice(merged, ORDERED_BATCH_SIZE)):
+            with self.lock:
+                for name in ordered:
+                    reports[name].add_data([
+                        record for _, kind, record in batch
+                        if kind == self.kinds[name]
+                    ])
+                self.version += 1
+                self._cache.clear()
+        if rebuild:
+            with self.lock:
+                self.reports = reports
+                self.offsets = offsets
+                self.version += 1
+                self._cache.clear()
+        return self.version != version
+
+    @staticmethod
+    def _filtered(report: Any, handler_prefix: str, level: str) -> Any:
+        """
+        Строит отчёт по подмножеству обработчиков и уровней.
+
+        :param report: Отчёт с методом add_counts() и данными data
+        :param handler_prefix: Префикс пути обработчика
+        :param level: Уровень логирования (пустая строка — все уровни)
+        :return: Новый отчёт того же класса
+        :raises QueryError: Если отчёт не поддерживает фильтры
+        """
+        if not hasattr(report, "add_counts"):
+            raise QueryError("отчёт не поддерживает фильтры")
+        view = type(report)()
+        view.add_counts(
+            (handler, name, count)
+            for handler, levels in report.data.items()
+            if handler.startswith(handler_prefix)
+            for name, count in levels.items()
+            if not level or name == level
+        )
+        return view
+
+    def query(
+        self,
+        name: str,
+        fmt: str = "text",
+        handler_prefix: str = "",
+        level: str = "",
+    ) -> tuple[str, bytes]:
+        """
+        Возвращает отрисованный отчёт из памяти.
+
+        Ответ кешируется до следующего изменения агрегатов; в кеше
+        хранится не больше CACHE_SIZE последних ответов.
+
+        :param name: Имя отчёта
+        :param fmt: Формат ответа: 'text' или 'json'
+        :param handler_prefix: Префикс пути обработчика
+        :param level: Уровень логирования
+        :return: Тип содержимого и тело ответа
+        :raises QueryError: При неизвестном отчёте, формате или фильтре
+        """
+        if name not in self.reports:
+            raise QueryError(f"отчёт '{name}' не наблюдается")
+        if fmt not in ("text", "json"):
+            raise QueryError(f"неизвестный формат '{fmt}'")
+        key = (name, fmt, handler_prefix, level)
+        with self.lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+            report = self.reports[name]
+            if handler_prefix or level:
+                report = self._filtered(report, handler_prefix, level)
+            if fmt == "json":
+                payload = dict(report.as_dict(), version=self.version)
+                response = (
+                    "application/json",
+                    json.dumps(payload, ensure_ascii=False).encode(),
+                )
+            else:
+                buffer = io.StringIO()
+                with _STDOUT_LOCK, contextlib.redirect_stdout(buffer):
+                    report.print_report()
+                response = (
+                    "text/plain; charset=utf-8",
+                    buffer.getvalue().encode(),
+                )
+            self._cache[key] = response
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return response
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик HTTP-запросов к LogWatcher.
+
+    GET /report?name=handlers&format=json&handler_prefix=/api/&level=ERROR
+    """
+
+    server: "LogServer"
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """
+        Отвечает на запрос отчёта.
+
+        :return: None
+        """
+        url = urlparse(self.path)
+        if url.path != "/report":
+            self._respond(HTTPStatus.NOT_FOUND, "text/plain; charset=utf-8",
+                          "неизвестный путь\n".encode())
+            return
+        params = {
+            key: values[-1] for key, values in parse_qs(url.query).items()
+        }
+        try:
+            content_type, body = self.server.watcher.query(
+                name=params.get("name", "handlers"),
+                fmt=params.get("format", "text"),
+                handler_prefix=params.get("handler_prefix", ""),
+                level=params.get("level", "").upper(),
+            )
+        except QueryError as er:
+            self._respond(HTTPStatus.BAD_REQUEST, "text/plain; charset=utf-8",
+                          f"{er}\n".encode())
+            return
+        self._respond(HTTPStatus.OK, content_type, body)
+
+    def _respond(self, status: HTTPStatus, content_type: str,
+                 body: bytes) -> None:
+        """
+        Отправляет ответ с заданным статусом и телом.
+
+        :param status: HTTP-статус
+        :param content_type: Тип содержимого
+        :param body: Тело ответа
+        :return: None
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        """
+        Отключает журнал запросов в stderr.
+
+        :param args: Аргументы сообщения
+        :return: None
+        """
+
+
+class LogServer(ThreadingHTTPServer):
+    """HTTP-сервер, отвечающий из агрегатов LogWatcher."""
+
+    daemon_threads = True
+
+    def __init__(self, watcher: LogWatcher, host: str, port: int) -> None:
+        """
+        Инициализирует сервер.
+
+        :param watcher: Наблюдатель с агрегатами
+        :param host: Адрес для прослушивания
+        :param port: Порт (0 — выбрать свободный)
+        """
+        super().__init__((host, port), QueryHandler)
+        self.watcher = watcher
+
+
+def _poll(watcher: LogWatcher, interval: float, stop: threading.Event) -> None:
+    """
+    Периодически обновляет агрегаты до установки события stop.
+
+    :param watcher: Наблюдатель с агрегатами
+    :param interval: Интервал опроса файлов в секундах
+    :param stop: Событие остановки
+    :return: None
+    """
+    while not stop.wait(interval):
+        watcher.refresh()
+
+
+def serve(
+    watcher: LogWatcher,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    interval: float = POLL_INTERVAL,
+) -> None:
+    """
+    Запускает сервер и фоновое обновление агрегатов.
+
+    Работает до прерывания с клавиатуры.
+
+    :param watcher: Наблюдатель с пустыми агрегатами отчётов
+    :param host: Адрес для прослушивания
+    :param port: Порт
+    :param interval: Интервал опроса файлов в секундах
+    :return: None
+    """
+    watcher.refresh()
+    stop = threading.Event()
+    poller = threading.Thread(
+        target=_poll, args=(watcher, interval, stop), daemon=True
+    )
+    poller.start()
+    with LogServer(watcher, host, port) as server:
+        print(f"Сервер отчётов: http://{host}:{server.server_port}/report")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop.set()
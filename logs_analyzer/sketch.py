@@ -0,0 +1,189 @@
+"""
+Модуль квантильного скетча DDSketch.
+
+Положительные значения раскладываются по логарифмическим корзинам
+с основанием gamma = (1 + a) / (1 - a), поэтому любой квантиль
+оценивается с относительной погрешностью не больше a. Скетч хранит
+только счётчики корзин, а не сами значения, и два скетча с одной
+точностью объединяются сложением счётчиков — результат совпадает
+со скетчем, построенным по объединённым данным.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import cached_property
+
+RELATIVE_ACCURACY = 0.01
+MAX_BINS = 2048
+MIN_VALUE = 1e-9
+
+
+@dataclass(frozen=True)
+class SketchConfig:
+    """
+    Параметры скетча и отображение значений на корзины.
+
+    relative_accuracy — относительная погрешность квантилей,
+    max_bins — максимальное число корзин.
+    """
+
+    relative_accuracy: float = RELATIVE_ACCURACY
+    max_bins: int = MAX_BINS
+
+    def __post_init__(self) -> None:
+        """
+        Проверяет погрешность.
+
+        :raises ValueError: Если погрешность вне (0, 1)
+        """
+        if not 0 < self.relative_accuracy < 1:
+            raise ValueError(
+                f"погрешность должна быть в (0, 1): {self.relative_accuracy}"
+            )
+
+    @cached_property
+    def gamma(self) -> float:
+        """
+        Возвращает основание логарифмических корзин.
+
+        :return: (1 + a) / (1 - a)
+        """
+        return (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+
+    @cached_property
+    def log_gamma(self) -> float:
+        """
+        Возвращает натуральный логарифм основания корзин.
+
+        :return: ln(gamma)
+        """
+        return math.log(self.gamma)
+
+    def key(self, value: float) -> int:
+        """
+        Находит корзину положительного значения.
+
+        :param value: Значение не меньше MIN_VALUE
+        :return: Номер корзины
+        """
+        return math.ceil(math.log(value) / self.log_gamma)
+
+    def value(self, key: int) -> float:
+        """
+        Оценивает значение корзины с погрешностью не больше a.
+
+        :param key: Номер корзины
+        :return: Середина корзины в относительной мере
+        """
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+
+class DDSketch:
+    """
+    Класс скетча для оценки квантилей неотрицательных значений.
+
+    Число корзин ограничено max_bins: при переполнении младшие
+    корзины сливаются, и погрешность теряется только для самых
+    малых квантилей.
+    """
+
+    __slots__ = (
+        "config", "bins", "zero_count", "count", "total", "min", "max",
+    )
+
+    def __init__(
+        self,
+        relative_accuracy: float = RELATIVE_ACCURACY,
+        max_bins: int = MAX_BINS,
+    ) -> None:
+        """
+        Инициализирует пустой скетч.
+
+        :param relative_accuracy: Относительная погрешность квантилей
+        :param max_bins: Максимальное число корзин
+        :raises ValueError: Если погрешность вне (0, 1)
+        """
+        self.config = SketchConfig(relative_accuracy, max_bins)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """
+        Добавляет значение в скетч.
+
+        :param value: Неотрицательное значение
+        :return: None
+        :raises ValueError: Если значение отрицательное
+        """
+        if value < 0:
+            raise ValueError(f"значение не может быть отрицательным: {value}")
+        if value < MIN_VALUE:
+            self.zero_count += 1
+        else:
+            key = self.config.key(value)
+            self.bins[key] = self.bins.get(key, 0) + 1
+            if len(self.bins) > self.config.max_bins:
+                self._collapse()
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self) -> None:
+        """
+        Сливает младшие корзины, пока их число не уложится в max_bins.
+
+        :return: None
+        """
+        keys = sorted(self.bins)
+        excess = len(keys) - self.config.max_bins
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.bins[target] += self.bins.pop(key)
+
+    def merge(self, other: "DDSketch") -> None:
+        """
+        Добавляет в скетч данные другого скетча.
+
+        :param other: Скетч с той же точностью
+        :return: None
+        :raises ValueError: Если точность скетчей различается
+        """
+        if other.config.gamma != self.config.gamma:
+            raise ValueError("нельзя объединить скетчи разной точности")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.config.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """
+        Оценивает квантиль.
+
+        :param q: Уровень квантиля от 0 до 1
+        :return: Оценка квантиля (0.0 для пустого скетча)
+        :raises ValueError: Если уровень вне [0, 1]
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"уровень квантиля должен быть в [0, 1]: {q}")
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                estimate = self.config.value(key)
+                return min(max(estimate, self.min), self.max)
+        return self.max
@@ -0,0 +1,235 @@
+"""
+Модуль снимков отчёта и сравнения с ними.
+
+Снимок — компактный JSON с агрегатом отчёта (as_dict), а не с
+записями логов, поэтому сравнение с базовой линией не требует
+повторного разбора старых логов: разбирается только текущее окно,
+а разница считается за один проход по обработчикам.
+
+Сохраняться могут отчёты, реализующие as_dict() и from_dict(data).
+"""
+
+import json
+import os
+import sys
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from logs_analyzer.logs_parser import LogQuery
+from logs_analyzer.reports.handlers import LOG_LEVELS
+
+SNAPSHOT_VERSION = 1
+
+
+def supports_snapshot(report_class: type) -> bool:
+    """
+    Проверяет, можно ли сохранить отчёт в снимок и сравнить с ним.
+
+    :param report_class: Класс отчёта
+    :return: True, если отчёт сохраняется и восстанавливается
+    """
+    return hasattr(report_class, "as_dict") and hasattr(
+        report_class, "from_dict"
+    )
+
+
+def _query_dict(query: LogQuery | None) -> dict[str, Any]:
+    """
+    Переводит условия отбора в словарь без пустых полей.
+
+    :param query: Условия отбора записей (None — без отбора)
+    :return: Словарь заданных условий
+    """
+    if query is None:
+        return {}
+    return {
+        name: value for name, value in asdict(query).items()
+        if value is not None
+    }
+
+
+@dataclass
+class Snapshot:
+    """Снимок отчёта с метаданными."""
+
+    report_name: str
+    report: Any
+    created: str
+    query: dict[str, Any]
+
+
+def save_snapshot(
+    path: Path,
+    report_name: str,
+    report: Any,
+    query: LogQuery | None = None,
+) -> None:
+    """
+    Сохраняет агрегат отчёта в файл снимка.
+
+    Файл записывается во временный файл рядом и затем заменяется,
+    поэтому прерванное сохранение не портит прошлый снимок.
+
+    :param path: Путь к файлу снимка
+    :param report_name: Имя отчёта в REPORTS_REGISTRY
+    :param report: Экземпляр отчёта
+    :param query: Условия отбора, с которыми построен отчёт
+    :return: None
+    """
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "report": report_name,
+        "created": datetime.now().isoformat(sep=" ", timespec="seconds"),
+        "query": _query_dict(query),
+        "data": report.as_dict(),
+    }
+    handle, name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(handle, mode="w", encoding="utf-8") as file:
+            json.dump(payload, file, ensure_ascii=False,
+                      separators=(",", ":"))
+        os.replace(name, path)
+    except BaseException:
+        Path(name).unlink(missing_ok=True)
+        raise
+
+
+def load_snapshot(
+    path: Path, report_name: str, report_class: type
+) -> Snapshot:
+    """
+    Загружает снимок отчёта.
+
+    :param path: Путь к файлу снимка
+    :param report_name: Имя ожидаемого отчёта
+    :param report_class: Класс ожидаемого отчёта
+    :return: Снимок с восстановленным отчётом
+    :raises ValueError: Если файл не является снимком этого отчёта
+    """
+    try:
+        with path.open(mode="r", encoding="utf-8") as file:
+            payload = json.load(file)
+    except json.JSONDecodeError as er:
+        raise ValueError(f"{path} не является снимком: {er}") from er
+    if not isinstance(payload, dict) or (
+        payload.get("version") != SNAPSHOT_VERSION
+    ):
+        raise ValueError(f"{path}: неподдерживаемая версия снимка")
+    if payload.get("report") != report_name:
+        raise ValueError(
+            f"{path}: снимок отчёта {payload.get('report')}, "
+            f"а не {report_name}"
+        )
+    return Snapshot(
+        report_name=report_name,
+        report=report_class.from_dict(payload.get("data")),
+        created=str(payload.get("created", "")),
+        query=payload.get("query") or {},
+    )
+
+
+class SnapshotDiff:
+    """
+    Класс сравнения отчёта по обработчикам с базовым снимком.
+
+    Для каждой пары (обработчик, уровень), счётчик которой изменился,
+    хранит значения до и после; обработчики, которых нет в одном
+    из отчётов, помечаются как новые или исчезнувшие.
+    """
+
+    def __init__(
+        self,
+        baseline: Snapshot,
+        current: Any,
+        query: LogQuery | None = None,
+    ) -> None:
+        """
+        Сравнивает отчёты за один проход по обработчикам.
+
+        :param baseline: Базовый снимок
+        :param current: Текущий отчёт по обработчикам
+        :param query: Условия отбора текущего отчёта
+        """
+        self.baseline = baseline
+        self.total_before = baseline.report.total_requests
+        self.total_after = current.total_requests
+        self.same_query = baseline.query == _query_dict(query)
+        self.new: set[str] = set()
+        self.vanished: set[str] = set()
+        self.rows: list[tuple[str, str, int, int]] = []
+        before_data = baseline.report.data
+        after_data = current.data
+        for handler in sorted(before_data.keys() | after_data.keys()):
+            before = before_data.get(handler)
+            after = after_data.get(handler)
+            if before is None:
+                self.new.add(handler)
+            elif after is None:
+                self.vanished.add(handler)
+            for level in LOG_LEVELS:
+                old = before.get(level, 0) if before else 0
+                value = after.get(level, 0) if after else 0
+                if old != value:
+                    self.rows.append((handler, level, old, value))
+
+    @property
+    def changed(self) -> int:
+        """
+        Возвращает число изменившихся обработчиков из обоих отчётов.
+
+        :return: Количество обработчиков
+        """
+        return len(
+            {row[0] for row in self.rows} - self.new - self.vanished
+        )
+
+    def _change(self, handler: str, old: int, value: int) -> str:
+        """
+        Форматирует относительное изменение счётчика.
+
+        :param handler: Обработчик
+        :param old: Значение в снимке
+        :param value: Текущее значение
+        :return: Процент изменения или пометка new/vanished/n/a
+        """
+        if handler in self.new:
+            return "new"
+        if handler in self.vanished:
+            return "vanished"
+        if not old:
+            return "n/a"
+        return f"{(value - old) / old:+.1%}"
+
+    def print_report(self) -> None:
+        """
+        Выводит изменения счётчиков по обработчикам и уровням.
+
+        :return: None
+        """
+        if not self.same_query:
+            print("Снимок построен с другими фильтрами: "
+                  f"{self.baseline.query}", file=sys.stderr)
+        total = self._change("", self.total_before, self.total_after)
+        print(f"\nBaseline: {self.baseline.created}")
+        print(f"Total requests: {self.total_before} -> {self.total_after} "
+              f"({self.total_after - self.total_before:+d}, {total})")
+        print(f"Handlers: {len(self.new)} new, {len(self.vanished)} "
+              f"vanished, {self.changed} changed\n")
+        handler_width = 20
+        level_width = 10
+        print(f"{'HANDLER'.ljust(handler_width)}"
+              + "".join(column.ljust(level_width) for column in
+                        ("LEVEL", "BEFORE", "AFTER", "CHANGE"))
+              + "CHANGE %")
+        for handler, level, old, value in self.rows:
+            print(f"{handler.ljust(handler_width)}"
+                  f"{level.ljust(level_width)}"
+                  f"{str(old).ljust(level_width)}"
+                  f"{str(value).ljust(level_width)}"
+                  f"{f'{value - old:+d}'.ljust(level_width)}"
+                  f"{self._change(handler, old, value)}")
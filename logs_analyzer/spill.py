@@ -0,0 +1,245 @@
+"""
+Модуль агрегации с ограничением памяти и сбросом на диск.
+
+Частичные отчёты разбора объединяются в памяти, пока оценка
+их размера не превысит бюджет. Тогда агрегат записывается
+отсортированным прогоном во временный файл и начинается заново.
+В конце прогоны и остаток в памяти сливаются кучей по ключу
+(внешняя сортировка слиянием), а равные ключи объединяются,
+поэтому результат точный, а в памяти одновременно находится
+не больше бюджета и по одной записи на прогон. Если прогонов больше
+MERGE_FAN_IN, они предварительно сливаются проходами в промежуточные
+прогоны, чтобы не открывать все файлы сразу.
+
+Сбрасываться могут отчёты, реализующие протокол:
+- memory_usage() — оценка размера агрегата в байтах;
+- spill_items() — пары (ключ, значение для JSON), отсортированные по ключу;
+- combine(first, second) — объединение значений одного ключа;
+- print_items(items) — вывод отчёта по функции, возвращающей
+  новый итератор отсортированных пар.
+"""
+
+import heapq
+import json
+import os
+import re
+import tempfile
+import weakref
+from collections.abc import Iterable, Iterator
+from functools import reduce
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Any
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+MERGE_FAN_IN = 64
+
+
+def parse_memory_limit(value: str) -> int:
+    """
+    Переводит размер вида '512M' или '2G' в байты.
+
+    :param value: Число с необязательным суффиксом K, M или G
+    :return: Размер в байтах
+    :raises ValueError: Если значение не является положительным размером
+    """
+    match = re.fullmatch(
+        r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)I?B?\s*", value.upper()
+    )
+    if not match or float(match.group(1)) <= 0:
+        raise ValueError(f"некорректный размер памяти: {value}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def supports_spill(report_class: type) -> bool:
+    """
+    Проверяет, реализует ли отчёт протокол сброса на диск.
+
+    :param report_class: Класс отчёта
+    :return: True, если отчёт можно агрегировать с ограничением памяти
+    """
+    return all(
+        hasattr(report_class, name)
+        for name in ("merge", "memory_usage", "spill_items",
+                     "combine", "print_items")
+    )
+
+
+def _remove_runs(runs: list[Path]) -> None:
+    """
+    Удаляет файлы прогонов и очищает их список.
+
+    :param runs: Пути к файлам прогонов
+    :return: None
+    """
+    for path in runs:
+        path.unlink(missing_ok=True)
+    runs.clear()
+
+
+class SpillStore:
+    """
+    Класс набора отсортированных прогонов во временных файлах.
+
+    Каждая строка прогона — JSON-массив [ключ, значение].
+    Файлы удаляются методом close(), а оставшиеся — при сборке
+    мусора или завершении процесса.
+    """
+
+    def __init__(
+        self, report_class: type, directory: Path | None = None
+    ) -> None:
+        """
+        Инициализирует пустой набор прогонов.
+
+        :param report_class: Класс отчёта с протоколом сброса
+        :param directory: Каталог временных файлов (None — системный)
+        """
+        self.report_class = report_class
+        self.directory = directory
+        self.runs: list[Path] = []
+        weakref.finalize(self, _remove_runs, self.runs)
+
+    def _write_run(self, items: Iterable[tuple[str, Any]]) -> Path:
+        """
+        Записывает отсортированные пары во временный файл.
+
+        Недописанный файл удаляется.
+
+        :param items: Пары (ключ, значение) по возрастанию ключа
+        :return: Путь к файлу прогона
+        """
+        handle, name = tempfile.mkstemp(
+            prefix="logs_analyzer_", suffix=".run", dir=self.directory
+        )
+        try:
+            with os.fdopen(handle, mode="w", encoding="utf-8") as file:
+                for item in items:
+                    file.write(json.dumps(item, ensure_ascii=False))
+                    file.write("\n")
+        except BaseException:
+            Path(name).unlink(missing_ok=True)
+            raise
+        return Path(name)
+
+    def spill(self, report: Any) -> None:
+        """
+        Записывает агрегат отчёта отсортированным прогоном.
+
+        :param report: Экземпляр отчёта
+        :return: None
+        """
+        self.runs.append(self._write_run(report.spill_items()))
+
+    @staticmethod
+    def _read_run(path: Path) -> Iterator[tuple[str, Any]]:
+        """
+        Читает прогон построчно.
+
+        :param path: Путь к файлу прогона
+        :return: Итератор пар (ключ, значение)
+        """
+        with path.open(mode="r", encoding="utf-8") as file:
+            for line in file:
+                key, value = json.loads(line)
+                yield key, value
+
+    def _combined(
+        self, streams: list[Iterator[tuple[str, Any]]]
+    ) -> Iterator[tuple[str, Any]]:
+        """
+        Сливает отсортированные потоки, объединяя равные ключи.
+
+        :param streams: Итераторы пар (ключ, значение) по возрастанию ключа
+        :return: Итератор пар (ключ, значение) с уникальными ключами
+        """
+        combine = self.report_class.combine
+        for key, group in groupby(
+            heapq.merge(*streams, key=itemgetter(0)), key=itemgetter(0)
+        ):
+            yield key, reduce(combine, (value for _, value in group))
+
+    def compact(self) -> None:
+        """
+        Сливает прогоны проходами, пока их не станет меньше MERGE_FAN_IN.
+
+        За один проход открывается не больше MERGE_FAN_IN файлов; одно
+        место остаётся для остатка в памяти при итоговом слиянии.
+
+        :return: None
+        """
+        while len(self.runs) >= MERGE_FAN_IN:
+            batch = self.runs[:MERGE_FAN_IN]
+            run = self._write_run(self._combined(
+                [self._read_run(path) for path in batch]
+            ))
+            del self.runs[:MERGE_FAN_IN]
+            self.runs.append(run)
+            _remove_runs(batch)
+
+    def merged(self, report: Any) -> Iterator[tuple[str, Any]]:
+        """
+        Сливает прогоны и остаток в памяти в один поток по ключу.
+
+        :param report: Экземпляр отчёта с несброшенным остатком
+        :return: Итератор пар (ключ, значение) с уникальными ключами
+        """
+        self.compact()
+        streams = [self._read_run(path) for path in self.runs]
+        streams.append(iter(report.spill_items()))
+        return self._combined(streams)
+
+    def close(self) -> None:
+        """
+        Удаляет файлы прогонов.
+
+        :return: None
+        """
+        _remove_runs(self.runs)
+
+
+class SpilledReport:
+    """
+    Класс отчёта, часть которого сброшена на диск.
+
+    Выводится потоковым слиянием прогонов, поэтому при выводе
+    в памяти не собирается весь агрегат.
+    """
+
+    def __init__(self, store: SpillStore, report: Any) -> None:
+        """
+        Инициализирует отчёт.
+
+        :param store: Набор прогонов
+        :param report: Несброшенный остаток агрегата
+        """
+        self.store = store
+        self.report = report
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        """
+        Возвращает новый итератор по всем ключам отчёта.
+
+        :return: Итератор пар (ключ, значение) по возрастанию ключа
+        """
+        return self.store.merged(self.report)
+
+    def close(self) -> None:
+        """
+        Удаляет временные файлы отчёта.
+
+        :return: None
+        """
+        self.store.close()
+
+    def print_report(self) -> None:
+        """
+        Выводит отчёт и удаляет временные файлы.
+
+        :return: None
+        """
+        try:
+            self.store.report_class.print_items(self.items)
+        finally:
+            self.close()
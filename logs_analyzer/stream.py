@@ -0,0 +1,180 @@
+"""Модуль конвейерной обработки stdin и именованных каналов."""
+
+import multiprocessing
+import os
+import sys
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import (Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from dataclasses import dataclass
+from pathlib import Path
+from queue import Queue
+from threading import Thread
+from typing import Any, BinaryIO
+
+from logs_analyzer.dedupe import ScalableBloomFilter
+from logs_analyzer.logs_parser import DEFAULT_KIND, LogQuery, parse_chunk
+
+STDIN_MARKER = "-"
+BATCH_SIZE = 4 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class StreamOptions:
+    """
+    Параметры чтения потока конвейером.
+
+    workers — количество воркеров (None — число ядер),
+    batch_size — примерный размер блока в байтах,
+    dedupe — фильтр уже встречавшихся строк (None — без фильтра).
+    """
+
+    workers: int | None = None
+    batch_size: int = BATCH_SIZE
+    dedupe: ScalableBloomFilter | None = None
+
+
+def is_stream_input(path: Path) -> bool:
+    """
+    Проверяет, является ли путь потоковым источником.
+
+    Потоковым источником считается '-' (стандартный ввод)
+    и именованный канал (FIFO).
+
+    :param path: Путь, переданный в командной строке
+    :return: True, если источник читается как поток
+    """
+    return str(path) == STDIN_MARKER or path.is_fifo()
+
+
+def iter_batches(
+    stream: BinaryIO, batch_size: int = BATCH_SIZE
+) -> Iterator[bytes]:
+    """
+    Нарезает поток на крупные блоки, выровненные по границе строк.
+
+    Незавершённый хвост блока переносится в следующий, поэтому
+    ни одна строка не разрывается между двумя блоками.
+
+    :param stream: Бинарный поток для чтения
+    :param batch_size: Примерный размер блока в байтах
+    :return: Итератор блоков байтов
+    """
+    tail = b""
+    while block := stream.read(batch_size):
+        block = tail + block
+        cut = block.rfind(b"\n") + 1
+        if not cut:
+            tail = block
+            continue
+        tail = block[cut:]
+        yield block[:cut]
+    if tail:
+        yield tail
+
+
+def _read_batches(
+    stream: BinaryIO,
+    batches: Queue,
+    batch_size: int,
+    dedupe: ScalableBloomFilter | None = None,
+) -> None:
+    """
+    Читает поток в отдельном потоке и складывает блоки в очередь.
+
+    Очередь ограничена, поэтому чтение приостанавливается,
+    пока воркеры не разберут уже прочитанные блоки.
+    В конце в очередь помещается None как признак окончания.
+
+    :param stream: Бинарный поток для чтения
+    :param batches: Ограниченная очередь блоков
+    :param batch_size: Примерный размер блока в байтах
+    :param dedupe: Фильтр уже встречавшихся строк (None — без фильтра)
+    :return: None
+    """
+    source = None if dedupe is None else dedupe.source()
+    try:
+        for batch in iter_batches(stream, batch_size):
+            if source is not None:
+                batch = source.unique_chunk(batch)
+            batches.put(batch)
+    finally:
+        batches.put(None)
+
+
+def is_free_threaded() -> bool:
+    """
+    Проверяет, выполняется ли интерпретатор без GIL.
+
+    На сборках 3.13t/3.14t потоки разбирают блоки параллельно,
+    и пул потоков не тратит время на запуск процессов и передачу
+    данных между ними.
+
+    :return: True, если GIL отключён
+    """
+    return not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def make_executor(workers: int) -> Executor:
+    """
+    Создаёт пул воркеров для разбора блоков.
+
+    Без GIL используется пул потоков, иначе — пул процессов
+    с контекстом 'spawn': читающий поток уже запущен,
+    а fork многопоточного процесса небезопасен.
+
+    :param workers: Количество воркеров
+    :return: Пул потоков или процессов
+    """
+    if is_free_threaded():
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def analyze_stream(
+    stream: BinaryIO,
+    report: Any,
+    query: LogQuery | None = None,
+    kind: str = DEFAULT_KIND,
+    options: StreamOptions = StreamOptions(),
+) -> Any:
+    """
+    Анализирует поток конвейером 'чтение -> разбор -> агрегация'.
+
+    Читающий поток нарезает вход на блоки, воркеры разбирают их
+    параллельно, а записи добавляются в отчёт в исходном порядке.
+    Число блоков в очереди и в работе ограничено, поэтому память
+    не растёт при медленных воркерах, а данные не пишутся на диск.
+
+    :param stream: Бинарный поток (stdin или именованный канал)
+    :param report: Экземпляр отчёта с методом add_data()
+    :param query: Условия отбора записей (None — без отбора)
+    :param kind: Вид записей, ключ LINE_PARSERS
+    :param options: Параметры конвейера и фильтр повторов
+    :return: Переданный экземпляр отчёта
+    """
+    workers = options.workers or os.cpu_count() or 1
+    in_flight = workers * 2
+    batches: Queue = Queue(maxsize=in_flight)
+    reader = Thread(
+        target=_read_batches,
+        args=(stream, batches, options.batch_size, options.dedupe),
+        daemon=True,
+    )
+    reader.start()
+    pending: deque = deque()
+    with make_executor(workers) as executor:
+        while (batch := batches.get()) is not None:
+            pending.append(executor.submit(
+                parse_chunk, batch, query, kind
+            ))
+            if len(pending) >= in_flight:
+                report.add_data(pending.popleft().result())
+        while pending:
+            report.add_data(pending.popleft().result())
+    reader.join()
+    return report
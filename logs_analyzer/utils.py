@@ -1,5 +1,8 @@
 """Модуль utils содержит вспомогательные функции для работы с отчетами."""
 
+import inspect
+
+from logs_analyzer.logs_parser import DEFAULT_KIND
 from logs_analyzer.reports import REPORTS_REGISTRY
 
 
@@ -15,3 +18,31 @@ def get_report_class(report_name: str) -> type:
     if not report_class:
         raise ValueError(f"Отчёт '{report_name}' не найден.")
     return report_class
+
+
+def get_record_kind(report_class: type) -> str:
+    """
+    Получить вид записей, которые нужны отчёту.
+
+    Вид задаётся атрибутом класса record_kind и является ключом
+    LINE_PARSERS; отчёты без атрибута получают записи запросов.
+
+    :param report_class: Класс отчёта
+    :return: Вид записей
+    """
+    return inspect.getattr_static(report_class, "record_kind", DEFAULT_KIND)
+
+
+def requires_time_order(report_class: type) -> bool:
+    """
+    Проверить, нужны ли отчёту записи в порядке времени.
+
+    Такие отчёты задают атрибут класса requires_order = True
+    и строятся слиянием логов по времени.
+
+    :param report_class: Класс отчёта
+    :return: True, если отчёт зависит от порядка записей
+    """
+    return bool(
+        inspect.getattr_static(report_class, "requires_order", False)
+    )
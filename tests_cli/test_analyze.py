@@ -8,11 +8,16 @@
 Пустые списки и взаимодействие с моками.
 """
 
+import math
 from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
-from logs_analyzer.analyze import analyze_logs
+from logs_analyzer.analyze import (
+    DeadlineOptions,
+    analyze_logs,
+    analyze_with_deadline,
+)
 from logs_analyzer.reports.handlers import HandlerReport
 
 
@@ -125,3 +130,72 @@ def test_analyze_logs_with_mock(monkeypatch):
     mock_report_instance.add_data.assert_any_call(
         [{"handler": "/mock/", "level": "INFO"}]
     )
+
+
+def test_analyze_with_deadline_completes_in_time(create_log_file):
+    """
+    При достаточном сроке анализ с дедлайном проходит полностью.
+
+    Отчёт совпадает с обычным анализом, покрытие равно 100%.
+    """
+    content = ("2025-04-27 20:15:10,123 INFO django.request:"
+               " GET /api/v1/test/ 200 OK [192.168.1.1]\n") * 200
+    log_files = [create_log_file(content, filename=f"t{i}.log")
+                 for i in range(3)]
+
+    report, coverage = analyze_with_deadline(
+        log_files, HandlerReport, deadline=60,
+        options=DeadlineOptions(chunk_size=1000),
+    )
+
+    assert report.total_requests == 600
+    assert coverage.files_done == coverage.files_total == 3
+    assert coverage.fraction == 1.0
+
+
+def test_analyze_with_expired_deadline_returns_partial(create_log_file,
+                                                       capsys):
+    """
+    При истёкшем сроке возвращается частичный отчёт.
+
+    Покрытие показывает, что разобрана не вся работа.
+    """
+    content = ("2025-04-27 20:15:10,123 INFO django.request:"
+               " GET /api/v1/test/ 200 OK [192.168.1.1]\n") * 200
+    log_file = create_log_file(content)
+
+    report, coverage = analyze_with_deadline(
+        [log_file], HandlerReport, deadline=1e-9,
+        options=DeadlineOptions(chunk_size=100),
+    )
+    coverage.print_coverage()
+
+    assert report.total_requests < 200
+    assert coverage.fraction < 1.0
+    assert coverage.files_done == 0
+    assert "Coverage: files 0/1" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("deadline", [0, -1, math.nan, math.inf])
+def test_analyze_with_deadline_rejects_invalid(create_log_file, deadline):
+    """Срок должен быть положительным конечным числом."""
+    log_file = create_log_file("")
+    with pytest.raises(ValueError):
+        analyze_with_deadline([log_file], HandlerReport, deadline=deadline)
+
+
+def test_analyze_logs_free_threaded_ranges(create_log_file, monkeypatch):
+    """
+    Без GIL файлы делятся на диапазоны с частичными отчётами.
+
+    Результат совпадает с разбором целых файлов.
+    """
+    content = ("2025-04-27 20:15:10,123 INFO django.request:"
+               " GET /api/v1/test/ 200 OK [192.168.1.1]\n") * 300
+    log_file = create_log_file(content)
+    monkeypatch.setattr("logs_analyzer.analyze.is_free_threaded", lambda: True)
+    monkeypatch.setattr("logs_analyzer.analyze.FREE_THREADED_CHUNK_SIZE", 1000)
+
+    report = analyze_logs([log_file], HandlerReport)
+
+    assert report.total_requests == 300
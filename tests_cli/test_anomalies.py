@@ -0,0 +1,108 @@
+"""
+Модуль тестов для класса AnomalyReport.
+
+Проверяет обнаружение всплеска доли ошибок, ограничение памяти,
+настройку порога и работу в режиме serve.
+"""
+
+import json
+import sys
+
+import pytest
+
+from logs_analyzer import main as log_analyzer_main
+from logs_analyzer.reports.anomalies import (
+    MAX_ANOMALIES,
+    WARMUP_MINUTES,
+    AnomalyReport,
+)
+from logs_analyzer.server import LogWatcher
+
+START = 1743163200
+
+
+def _minute(minute: int, requests: int, errors: int) -> list[dict]:
+    """Записи обработчика /api/ за одну минуту."""
+    return [
+        {"handler": "/api/", "time": START + minute * 60 + second,
+         "level": "ERROR" if second < errors else "INFO"}
+        for second in range(requests)
+    ]
+
+
+def test_spike_is_flagged():
+    """Минута с резко выросшей долей ошибок отмечается как аномалия."""
+    report = AnomalyReport()
+    for minute in range(WARMUP_MINUTES + 5):
+        report.add_data(_minute(minute, 10, minute % 2))
+    report.add_data(_minute(20, 10, 8))
+    report.add_data(_minute(21, 10, 0))
+    anomalies = report.as_dict()["anomalies"]
+    assert [anomaly["errors"] for anomaly in anomalies] == [8]
+    assert anomalies[0]["minute"] == "2025-03-28 12:20:00"
+
+
+def test_no_flags_during_warmup_and_steady_state():
+    """Во время прогрева и при ровной доле ошибок аномалий нет."""
+    report = AnomalyReport()
+    report.add_data(_minute(0, 10, 9))
+    for minute in range(1, 30):
+        report.add_data(_minute(minute, 10, 1))
+    assert report.as_dict()["anomalies"] == []
+
+
+def test_state_is_bounded():
+    """Число хранимых аномалий обработчика ограничено."""
+    report = AnomalyReport.configured(0.1)()
+    for minute in range(0, 400, 2):
+        report.add_data(_minute(minute, 10, 0))
+        report.add_data(_minute(minute + 1, 10, 10))
+    assert len(report.data["/api/"].anomalies) == MAX_ANOMALIES
+    with pytest.raises(ValueError):
+        AnomalyReport.configured(0)
+
+
+def test_serve_mode_updates_anomalies(tmp_path):
+    """В режиме serve норма обновляется по дописанным строкам."""
+    log = tmp_path / "app.log"
+
+    def write(minute: int, errors: int) -> None:
+        with log.open(mode="a", encoding="utf-8") as file:
+            for second in range(10):
+                level = "ERROR" if second < errors else "INFO"
+                file.write(f"2025-03-28 12:{minute:02d}:{second:02d},000 "
+                           f"{level} django.request: GET /api/ 200 OK\n")
+
+    for minute in range(WARMUP_MINUTES + 2):
+        write(minute, 0)
+    watcher = LogWatcher([log], ["anomalies"])
+    watcher.refresh()
+    write(30, 9)
+    write(31, 0)
+    watcher.refresh()
+    _, body = watcher.query("anomalies", fmt="json")
+    assert [item["minute"] for item in json.loads(body)["anomalies"]] == [
+        "2025-03-28 12:30:00"
+    ]
+
+
+def test_serve_anomaly_z_option(monkeypatch, tmp_path):
+    """Подкоманда serve передаёт порог --anomaly-z отчёту anomalies."""
+    log = tmp_path / "app.log"
+    log.write_text("", encoding="utf-8")
+    served = []
+    monkeypatch.setattr(log_analyzer_main, "serve",
+                        lambda watcher, **_: served.append(watcher))
+    monkeypatch.setattr(sys, "argv", [
+        "prog", "serve", str(log), "--report", "handlers", "anomalies",
+        "--anomaly-z", "2.5",
+    ])
+    log_analyzer_main.main()
+    assert served[0].reports["anomalies"].threshold == 2.5
+    monkeypatch.setattr(sys, "argv", [
+        "prog", "serve", str(log), "--report", "handlers",
+        "--anomaly-z", "2.5",
+    ])
+    with pytest.raises(SystemExit) as er:
+        log_analyzer_main.main()
+    assert er.value.code == 2
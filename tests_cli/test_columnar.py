@@ -0,0 +1,111 @@
+"""
+Модуль тестов для колоночного движка из модуля columnar.
+
+Проверяет разбор логов в колонки и векторные агрегаты.
+Совпадение отчёта с построчным анализом.
+Сохранение и загрузку набора данных .npz.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from logs_analyzer import main as log_analyzer_main
+from logs_analyzer.analyze import analyze_logs
+from logs_analyzer.logs_parser import LogQuery
+from logs_analyzer.reports.handlers import HandlerReport
+
+np = pytest.importorskip("numpy")
+
+# pylint: disable=wrong-import-position
+from logs_analyzer.columnar import ColumnarDataset  # noqa: E402
+
+LOGS_DIR = Path(__file__).parent.parent / "logs_analyzer" / "logs"
+
+
+@pytest.fixture
+def fixture_logs() -> list[Path]:
+    """
+    Фикстура со списком логов из каталога logs.
+
+    :return: Список путей к лог-файлам
+    """
+    return sorted(LOGS_DIR.glob("*.log"))
+
+
+def test_columns_have_expected_dtypes(fixture_logs):
+    """Колонки имеют компактные типы и одинаковую длину."""
+    columns = ColumnarDataset.from_files(fixture_logs)
+    assert columns.handler_id.dtype == np.int32
+    assert columns.level.dtype == np.int8
+    assert columns.ts.dtype == np.int64
+    assert columns.status.dtype == np.uint16
+    assert len(columns) == len(columns.ts) == len(columns.status)
+
+
+@pytest.mark.parametrize("query", [
+    None,
+    LogQuery(handler="/api/v1/support/"),
+    LogQuery(since="2025-03-28 12:30:00"),
+    LogQuery(since="2025-03-28 12:10:00", until="2025-03-28 12:40:00"),
+    LogQuery(level="ERROR", handler_prefix="/api/"),
+    LogQuery(status=201),
+])
+def test_to_report_matches_row_analysis(fixture_logs, query):
+    """Векторный отчёт совпадает с построчным анализом."""
+    columns = ColumnarDataset.from_files(fixture_logs)
+    report = columns.filter(query).to_report(HandlerReport)
+    expected = analyze_logs(fixture_logs, HandlerReport, query)
+    assert report.total_requests == expected.total_requests
+    assert report.data == expected.data
+
+
+def test_invalid_status_is_dropped():
+    """Код вне диапазона HTTP-статусов не ломает колонку uint16."""
+    columns = ColumnarDataset.from_lines([
+        "2025-03-28 12:44:46,000 INFO django.request:"
+        " GET /api/v1/reviews/ 204 OK [192.168.1.59]\n",
+        "2025-03-28 12:44:47,000 INFO django.request:"
+        " GET /api/v1/reviews/ 70000 OK [192.168.1.59]\n",
+        "2025-03-28 12:11:57,000 ERROR django.request:"
+        " Internal Server Error: /admin/dashboard/"
+        " [192.168.1.29] - ValueError: Invalid input data\n",
+    ])
+    assert columns.status.tolist() == [204, 0, 0]
+    assert columns.filter(LogQuery(status=204)).to_report(
+        HandlerReport
+    ).total_requests == 1
+
+
+def test_save_and_load_roundtrip(tmp_path, fixture_logs):
+    """Набор данных сохраняется в .npz и загружается без изменений."""
+    columns = ColumnarDataset.from_files(fixture_logs)
+    path = tmp_path / "logs.npz"
+    columns.save(path)
+    loaded = ColumnarDataset.load(path)
+    assert loaded.handlers == columns.handlers
+    assert np.array_equal(loaded.handler_level_counts(),
+                          columns.handler_level_counts())
+    assert np.array_equal(loaded.ts, columns.ts)
+
+
+def test_main_numpy_engine_and_dataset(monkeypatch, tmp_path, fixture_logs,
+                                       capsys):
+    """Движок numpy сохраняет набор данных, а --dataset строит по нему."""
+    path = tmp_path / "logs.npz"
+    expected = analyze_logs(fixture_logs, HandlerReport).total_requests
+    monkeypatch.setattr(sys, "argv", ["prog", "--report", "handlers",
+                                      "--save-dataset", str(path)]
+                        + [str(f) for f in fixture_logs])
+    log_analyzer_main.main()
+    assert f"Total requests: {expected}" in capsys.readouterr().out
+    monkeypatch.setattr(sys, "argv", ["prog", "--report", "handlers",
+                                      "--dataset", str(path)])
+    log_analyzer_main.main()
+    assert f"Total requests: {expected}" in capsys.readouterr().out
+    monkeypatch.setattr(sys, "argv", ["prog", "--report", "handlers",
+                                      "--dataset", str(path),
+                                      str(fixture_logs[0])])
+    with pytest.raises(SystemExit):
+        log_analyzer_main.main()
+    assert "--dataset" in capsys.readouterr().err
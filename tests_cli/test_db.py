@@ -0,0 +1,73 @@
+"""
+Модуль тестов для класса DBReport.
+
+Проверяет разбор строк django.db.backends (в том числе пропуск
+некорректных длительностей), нормализацию запросов,
+объединение частичных отчётов и анализ логов с record_kind='db'.
+"""
+
+from pathlib import Path
+
+from logs_analyzer.analyze import analyze_logs
+from logs_analyzer.logs_parser import normalize_query, parse_db_lines
+from logs_analyzer.reports.db import DBReport
+
+LOGS_DIR = Path(__file__).parent.parent / "logs_analyzer" / "logs"
+
+
+def test_normalize_query_keeps_table_names():
+    """Литералы заменяются на '?', имена таблиц сохраняются."""
+    assert normalize_query("SELECT * FROM 'products' WHERE id = 4;") == (
+        "SELECT * FROM 'products' WHERE id = ?"
+    )
+    assert normalize_query(
+        "SELECT a FROM t WHERE name = 'bob' AND id IN (1, 2, 3)"
+    ) == "SELECT a FROM t WHERE name = ? AND id IN (?)"
+
+
+def test_parse_db_lines():
+    """Из строки извлекаются длительность и форма запроса."""
+    records = parse_db_lines([
+        "2025-03-28 12:25:45,000 DEBUG django.db.backends: "
+        "(0.41) SELECT * FROM 'products' WHERE id = 4;",
+        "2025-03-28 12:25:46,000 INFO django.request: GET /api/ 200 OK",
+    ])
+    assert records == [
+        {"shape": "SELECT * FROM 'products' WHERE id = ?", "duration": 0.41}
+    ]
+
+
+def test_parse_db_lines_skips_invalid_durations():
+    """Длительности inf, nan и отрицательные пропускаются."""
+    records = parse_db_lines([
+        f"2025-03-28 12:25:45,000 DEBUG django.db.backends: ({duration}) "
+        "SELECT 1;"
+        for duration in ("inf", "nan", "-0.5", "-inf", "1e400", "0.0", "0.2")
+    ])
+    assert [record["duration"] for record in records] == [0.0, 0.2]
+
+
+def test_merge_partial_reports():
+    """Объединённые частичные отчёты совпадают с общим отчётом."""
+    records = [
+        {"shape": "SELECT ?", "duration": 0.01 * step}
+        for step in range(1, 100)
+    ]
+    whole, left, right = DBReport(), DBReport(), DBReport()
+    whole.add_data(records)
+    left.add_data(records[::2])
+    right.add_data(records[1::2])
+    left.merge(right)
+    assert left.as_dict() == whole.as_dict()
+
+
+def test_analyze_logs_db_report(capsys):
+    """Отчёт db строится по всем строкам django.db.backends."""
+    report = analyze_logs([LOGS_DIR / "app1.log"], DBReport)
+    expected = sum(
+        "django.db.backends" in line
+        for line in (LOGS_DIR / "app1.log").read_text().splitlines()
+    )
+    assert report.total_queries == expected
+    report.print_report()
+    assert f"Total queries: {expected}" in capsys.readouterr().out
@@ -0,0 +1,132 @@
+"""
+Модуль тестов для исключения повторов из модуля dedupe.
+
+Проверяет поиск одинаковых файлов.
+Масштабируемый фильтр Блума и его долю ложных срабатываний.
+Однократный подсчёт пересекающихся логов при сохранении повторов
+внутри одного файла.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from logs_analyzer import main as log_analyzer_main
+from logs_analyzer.analyze import analyze_logs
+from logs_analyzer.dedupe import ScalableBloomFilter, drop_duplicate_files
+from logs_analyzer.reports.handlers import HandlerReport
+
+
+def _lines(start: int, stop: int) -> str:
+    """
+    Формирует уникальные строки django.request с номерами в IP.
+
+    :param start: Первый номер
+    :param stop: Номер после последнего
+    :return: Текст лога
+    """
+    return "".join(
+        f"2025-03-28 12:{i // 60 % 60:02d}:{i % 60:02d},{i % 1000:03d}"
+        f" INFO django.request: GET /api/v1/users/ 200 OK [10.0.{i}]\n"
+        for i in range(start, stop)
+    )
+
+
+def test_drop_duplicate_files(tmp_path: Path, capsys):
+    """Файл-копия пропускается, файл того же размера с другим текстом — нет."""
+    original = tmp_path / "app.log"
+    original.write_text(_lines(0, 100), encoding="utf-8")
+    copy = tmp_path / "app.log.copy"
+    copy.write_bytes(original.read_bytes())
+    other = tmp_path / "other.log"
+    other.write_text(
+        original.read_text(encoding="utf-8").replace("users", "orders"),
+        encoding="utf-8",
+    )
+    assert drop_duplicate_files([original, copy, other]) == [original, other]
+    assert f"Пропущен дубликат {copy}" in capsys.readouterr().err
+
+
+def test_bloom_filter_scales_with_bounded_error():
+    """
+    Фильтр добавляет слои при заполнении.
+
+    Доля ложных срабатываний остаётся порядка заданной.
+    """
+    bloom = ScalableBloomFilter(error_rate=0.01, initial_capacity=500)
+    false_positives = sum(
+        not bloom.add(f"line {i}".encode()) for i in range(20_000)
+    )
+    assert len(bloom.filters) > 1
+    assert false_positives <= 20_000 * 0.01 * 1.5
+    assert not bloom.add(b"line 42")
+
+
+def test_bloom_filter_rejects_invalid_rate():
+    """Вероятность ошибки вне (0, 1) отклоняется."""
+    with pytest.raises(ValueError):
+        ScalableBloomFilter(error_rate=1.5)
+
+
+def test_overlapping_logs_are_counted_once(tmp_path: Path):
+    """Пересекающиеся ротации учитываются ровно один раз."""
+    current = tmp_path / "app.log"
+    current.write_text(_lines(500, 1500), encoding="utf-8")
+    rotated = tmp_path / "app.log.1"
+    rotated.write_text(_lines(0, 1000), encoding="utf-8")
+    report = analyze_logs(
+        [current, rotated], HandlerReport, dedupe=ScalableBloomFilter()
+    )
+    assert report.total_requests == 1500
+
+
+def test_repeats_within_file_are_kept(tmp_path: Path):
+    """
+    Одинаковые события внутри файла не считаются повторами.
+
+    Строка, встреченная в файлах 3 и 5 раз, учитывается 5 раз.
+    """
+    line = _lines(0, 1)
+    first = tmp_path / "app.log"
+    first.write_text(line * 3 + _lines(1, 4), encoding="utf-8")
+    second = tmp_path / "app.log.1"
+    second.write_text(_lines(1, 3) + line * 5, encoding="utf-8")
+    report = analyze_logs(
+        [first, second], HandlerReport, dedupe=ScalableBloomFilter()
+    )
+    assert report.total_requests == 8
+    fixture = Path(__file__).parent.parent / "logs_analyzer" / "logs"
+    log = fixture / "app1.log"
+    assert analyze_logs(
+        [log], HandlerReport, dedupe=ScalableBloomFilter()
+    ).total_requests == analyze_logs([log], HandlerReport).total_requests
+
+
+def test_source_filter_numbers_occurrences():
+    """
+    Вхождения строки нумеруются пробами фильтра источника.
+
+    Во втором источнике новыми считаются только вхождения сверх
+    встреченных в первом.
+    """
+    shared = ScalableBloomFilter()
+    first, second = shared.source(), shared.source()
+    assert [first.add(b"line") for _ in range(3)] == [True] * 3
+    assert [second.add(b"line") for _ in range(5)] == (
+        [False] * 3 + [True] * 2
+    )
+
+
+def test_main_dedupe_option(monkeypatch, tmp_path: Path, capsys):
+    """Ключ --dedupe пропускает копию файла, но не повторы внутри файла."""
+    log = tmp_path / "app.log"
+    log.write_text(_lines(0, 10) * 2, encoding="utf-8")
+    copy = tmp_path / "copy.log"
+    copy.write_bytes(log.read_bytes())
+    monkeypatch.setattr(sys, "argv", [
+        "prog", str(log), str(copy), "--report", "handlers", "--dedupe",
+    ])
+    log_analyzer_main.main()
+    captured = capsys.readouterr()
+    assert "Total requests: 20" in captured.out
+    assert "Пропущен дубликат" in captured.err
@@ -0,0 +1,54 @@
+"""
+Модуль тестов для майнера шаблонов DrainMiner.
+
+Проверяет объединение похожих сообщений в один шаблон.
+Разделение разных исключений и ограничения дерева.
+"""
+
+from logs_analyzer.drain import WILDCARD, DrainConfig, DrainMiner
+
+
+def test_variable_tokens_become_wildcards():
+    """Сообщения, различающиеся переменной частью, дают общий шаблон."""
+    miner = DrainMiner()
+    first = miner.add("Timeout after 30 seconds on host db1")
+    second = miner.add("Timeout after 45 seconds on host db2")
+    assert first is second
+    assert first.size == 2
+    assert first.template == (
+        f"Timeout after {WILDCARD} seconds on host {WILDCARD}"
+    )
+    assert miner.template(first.cluster_id) == first.template
+
+
+def test_different_exceptions_are_separate_clusters():
+    """Разные исключения одинаковой длины не смешиваются."""
+    miner = DrainMiner()
+    deadlock = miner.add("DatabaseError: Deadlock detected")
+    invalid = miner.add("ValueError: Invalid input data")
+    assert deadlock is not invalid
+    assert len(miner.clusters) == 2
+
+
+def test_repeated_message_hits_cache():
+    """Повтор сообщения возвращает тот же кластер и увеличивает счётчик."""
+    miner = DrainMiner(DrainConfig(cache_size=1))
+    cluster = miner.add("OSError: No space left on device")
+    for _ in range(5):
+        assert miner.add("OSError: No space left on device") is cluster
+    assert cluster.size == 6
+
+
+def test_leaf_cluster_limit_bounds_growth():
+    """
+    Число кластеров в листе ограничено.
+
+    Непохожие сообщения сверх лимита присоединяются к ближайшему.
+    """
+    miner = DrainMiner(
+        DrainConfig(depth=3, similarity=0.9, max_clusters=2)
+    )
+    for word in ("alpha", "beta", "gamma", "delta"):
+        miner.add(f"Error {word} {word}x {word}y")
+    assert len(miner.clusters) == 2
+    assert sum(cluster.size for cluster in miner.clusters) == 4
@@ -0,0 +1,87 @@
+"""
+Модуль тестов для класса ErrorReport.
+
+Проверяет группировку ошибок в сигнатуры по обработчикам.
+Вывод самых частых сигнатур и анализ логов с record_kind='errors'.
+"""
+
+from pathlib import Path
+
+from logs_analyzer.analyze import analyze_logs
+from logs_analyzer.reports.errors import TOP_SIGNATURES, ErrorReport
+
+LOGS_DIR = Path(__file__).parent.parent / "logs_analyzer" / "logs"
+
+
+def test_add_data_groups_by_signature():
+    """Одинаковые исключения одного обработчика попадают в одну сигнатуру."""
+    report = ErrorReport()
+    report.add_data([
+        {"handler": "/api/v1/orders/", "level": "ERROR",
+         "message": "OrderError: order 17 not found"},
+        {"handler": "/api/v1/orders/", "level": "ERROR",
+         "message": "OrderError: order 42 not found"},
+        {"handler": "django.core.management", "level": "CRITICAL",
+         "message": "DatabaseError: Deadlock detected"},
+    ])
+    assert report.total_errors == 3
+    assert list(report.data["/api/v1/orders/"].values()) == [2]
+    assert len(report.miner.clusters) == 2
+
+
+def test_print_report_limits_signatures(capsys):
+    """Для обработчика выводится не больше TOP_SIGNATURES сигнатур."""
+    report = ErrorReport()
+    report.add_data([
+        {"handler": "/api/", "level": "ERROR", "message": f"{name}Error: x"}
+        for name in ("Key", "Type", "Value", "Lookup", "Index")
+    ])
+    report.print_report()
+    output = capsys.readouterr().out
+    assert "Total errors: 5" in output
+    assert sum("Error" in line for line in output.splitlines()) == (
+        TOP_SIGNATURES
+    )
+
+
+def test_equal_counts_are_ordered_by_template():
+    """Сигнатуры с равным количеством упорядочены по тексту шаблона."""
+    report = ErrorReport()
+    report.add_data([
+        {"handler": "/api/", "level": "ERROR", "message": f"{name}Error: x"}
+        for name in ("Value", "Key", "Type")
+    ])
+    assert report.top_signatures("/api/") == [
+        ("KeyError: x", 1), ("TypeError: x", 1), ("ValueError: x", 1),
+    ]
+
+
+def test_analyze_logs_collects_error_lines():
+    """analyze_logs передаёт отчёту записи ошибок из логов."""
+    report = analyze_logs(sorted(LOGS_DIR.glob("*.log")), ErrorReport)
+    assert report.total_errors > 0
+    assert "django.core.management" in report.data
+    templates = {cluster.template for cluster in report.miner.clusters}
+    assert "DatabaseError: Deadlock detected" in templates
+
+
+def test_merge_remaps_signatures():
+    """
+    Сигнатуры другого отчёта относятся к кластерам этого отчёта.
+
+    Размер кластера растёт на число сообщений, а не на единицу.
+    """
+    left, right = ErrorReport(), ErrorReport()
+    left.add_data([{"handler": "/api/", "level": "ERROR",
+                    "message": "KeyError: missing"}])
+    right.add_data([
+        {"handler": "/api/", "level": "ERROR", "message": "TypeError: bad"},
+        {"handler": "/api/", "level": "ERROR", "message": "KeyError: missing"},
+        {"handler": "/api/", "level": "ERROR", "message": "KeyError: missing"},
+    ])
+    left.merge(right)
+    assert left.total_errors == 4
+    assert dict(left.top_signatures("/api/")) == {
+        "KeyError: missing": 3, "TypeError: bad": 1
+    }
+    assert sorted(cluster.size for cluster in left.miner.clusters) == [1, 3]
@@ -164,3 +164,35 @@ def test_print_report_handlers_sorted_alphabetically(capsys):
 
     # Проверяем, что список отсортирован по алфавиту
     assert handlers_in_output == sorted(handlers_in_output)
+
+
+def test_add_counts_accumulates_aggregates():
+    """
+    Агрегированные счётчики добавляются без разворачивания в записи.
+
+    Неизвестные уровни игнорируются.
+    """
+    report = HandlerReport()
+    report.add_counts([
+        ("/api/v1/users/", "INFO", 5),
+        ("/api/v1/users/", "ERROR", 2),
+        ("/api/v1/users/", "UNKNOWN", 7),
+    ])
+    assert report.total_requests == 7
+    assert report.data["/api/v1/users/"]["INFO"] == 5
+    assert "UNKNOWN" not in report.data["/api/v1/users/"]
+
+
+def test_merge_combines_partial_reports():
+    """Объединение частичных отчётов складывает счётчики и итоги."""
+    left, right = HandlerReport(), HandlerReport()
+    left.add_data([{"handler": "/a/", "level": "INFO"}])
+    right.add_data([
+        {"handler": "/a/", "level": "INFO"},
+        {"handler": "/b/", "level": "ERROR"},
+    ])
+    left.merge(right)
+    assert left.total_requests == 3
+    assert left.as_dict()["handlers"] == {
+        "/a/": {"INFO": 2}, "/b/": {"ERROR": 1}
+    }
@@ -0,0 +1,140 @@
+"""
+Модуль тестов для индексных файлов из модуля index.
+
+Проверяет построение и дополнение индекса.
+Выбор блоков по обработчику и времени.
+Совпадение результатов с полным парсингом и отказ от устаревшего индекса.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from logs_analyzer import main as log_analyzer_main
+from logs_analyzer.index import (
+    build_index,
+    index_path,
+    load_index,
+    parse_indexed,
+    select_blocks,
+)
+from logs_analyzer.logs_parser import LogQuery, parse_log_file
+
+
+def _line(minute: int, handler: str, level: str = "INFO") -> str:
+    """
+    Формирует строку лога django.request.
+
+    :param minute: Минута в пределах часа 12:00
+    :param handler: Путь обработчика
+    :param level: Уровень логирования
+    :return: Строка лога с переводом строки
+    """
+    return (f"2025-03-28 12:{minute:02d}:00,000 {level} django.request:"
+            f" GET {handler} 200 OK [192.168.1.1]\n")
+
+
+@pytest.fixture
+def ordered_log(tmp_path: Path) -> Path:
+    """
+    Фикстура лога, где каждый обработчик встречается в своей части файла.
+
+    :param tmp_path: Временная директория pytest
+    :return: Путь к лог-файлу
+    """
+    lines = [_line(m, "/api/v1/users/") for m in range(20)]
+    lines += [_line(m, "/api/v1/orders/", "ERROR") for m in range(20, 40)]
+    lines += ["2025-03-28 12:40:00,000 DEBUG django.db.backends: (0.1)\n"]
+    file = tmp_path / "app.log"
+    file.write_text("".join(lines), encoding="utf-8")
+    return file
+
+
+def test_build_index_writes_sidecar(ordered_log):
+    """Индекс записывается рядом с логом и покрывает весь файл."""
+    index = build_index(ordered_log, block_size=500)
+    assert index_path(ordered_log).is_file()
+    assert index["size"] == ordered_log.stat().st_size
+    assert set(index["handlers"]) == {"/api/v1/users/", "/api/v1/orders/"}
+    assert len(index["blocks"]) > 2
+    assert load_index(ordered_log) == index
+
+
+def test_select_blocks_by_handler_and_since(ordered_log):
+    """Для узкого запроса читается только часть блоков."""
+    index = build_index(ordered_log, block_size=500)
+    total = index["size"]
+    by_handler = select_blocks(index, LogQuery(handler="/api/v1/users/"))
+    assert sum(end - start for start, end in by_handler) < total
+    by_since = select_blocks(index, LogQuery(since="2025-03-28 12:30:00"))
+    assert sum(end - start for start, end in by_since) < total
+    assert not select_blocks(index, LogQuery(handler="/missing/"))
+    by_prefix = select_blocks(index, LogQuery(handler_prefix="/api/v1/o"))
+    assert sum(end - start for start, end in by_prefix) < total
+    assert not select_blocks(index, LogQuery(handler_prefix="/admin/"))
+
+
+@pytest.mark.parametrize("query", [
+    LogQuery(handler="/api/v1/orders/"),
+    LogQuery(since="2025-03-28 12:15:00"),
+    LogQuery(handler="/api/v1/users/", since="2025-03-28 12:10:00"),
+    LogQuery(since="2025-03-28 12:10:00", until="2025-03-28 12:20:00"),
+    LogQuery(handler_prefix="/api/v1/o", level="ERROR"),
+])
+def test_parse_indexed_matches_full_scan(ordered_log, query):
+    """Выборочное чтение даёт те же записи, что и полный парсинг."""
+    build_index(ordered_log, block_size=300)
+    assert parse_indexed(ordered_log, query) == parse_log_file(
+        ordered_log, query
+    )
+
+
+def test_index_appends_new_lines(ordered_log):
+    """
+    Дописанный хвост учитывается без переиндексации и дополняет индекс.
+
+    Старые блоки сохраняются, новые добавляются в конец.
+    """
+    first = build_index(ordered_log, block_size=500)
+    with ordered_log.open(mode="a", encoding="utf-8") as file:
+        file.write(_line(50, "/api/v1/new/"))
+    query = LogQuery(handler="/api/v1/new/")
+    assert parse_indexed(ordered_log, query) == [
+        {"handler": "/api/v1/new/", "level": "INFO"}
+    ]
+    second = build_index(ordered_log, block_size=500)
+    assert second["blocks"][:len(first["blocks"])] == first["blocks"]
+    assert "/api/v1/new/" in second["handlers"]
+
+
+def test_rewritten_log_invalidates_index(ordered_log, capsys):
+    """Перезаписанный лог не использует устаревший индекс."""
+    build_index(ordered_log, block_size=500)
+    ordered_log.write_text(_line(1, "/other/"), encoding="utf-8")
+    os.utime(ordered_log, ns=(1, 1))
+    assert parse_indexed(ordered_log, LogQuery(handler="/other/")) is None
+    assert "устарел" in capsys.readouterr().err
+
+
+def test_index_subcommand(monkeypatch, ordered_log, capsys):
+    """Подкоманда index создаёт индекс и выводит сводку."""
+    monkeypatch.setattr(
+        sys, "argv", ["prog", "index", str(ordered_log), "--block-size", "500"]
+    )
+    log_analyzer_main.main()
+    assert index_path(ordered_log).is_file()
+    assert "обработчиков 2" in capsys.readouterr().out
+
+
+def test_main_handler_filter_uses_index(monkeypatch, ordered_log, capsys):
+    """Отчёт с --handler и --since строится по индексу."""
+    build_index(ordered_log, block_size=500)
+    monkeypatch.setattr(sys, "argv", [
+        "prog", str(ordered_log), "--report", "handlers",
+        "--handler", "/api/v1/orders/", "--since", "2025-03-28 12:30",
+    ])
+    log_analyzer_main.main()
+    output = capsys.readouterr().out
+    assert "Total requests: 10" in output
+    assert "/api/v1/users/" not in output
@@ -0,0 +1,175 @@
+"""
+Модуль тестов для загрузки логов в SQLite из модуля ingest.
+
+Проверяет схему базы и таблицу-словарь обработчиков.
+Построение индексов после загрузки.
+Совпадение отчёта по базе с отчётом по логам.
+Отклонение лог-файлов и режимов, несовместимых с --db.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+from logs_analyzer import main as log_analyzer_main
+from logs_analyzer.analyze import analyze_logs
+from logs_analyzer.ingest import ingest_logs, load_report
+from logs_analyzer.logs_parser import LogQuery
+from logs_analyzer.reports.handlers import HandlerReport
+
+LOGS_DIR = Path(__file__).parent.parent / "logs_analyzer" / "logs"
+
+
+@pytest.fixture
+def fixture_logs() -> list[Path]:
+    """
+    Фикстура со списком логов из каталога logs.
+
+    :return: Список путей к лог-файлам
+    """
+    return sorted(LOGS_DIR.glob("*.log"))
+
+
+def test_ingest_stores_rows_and_handler_dictionary(tmp_path, fixture_logs):
+    """
+    Все записи загружаются, а каждый обработчик хранится один раз.
+
+    Индексы создаются после загрузки.
+    """
+    db = tmp_path / "logs.sqlite"
+    total = ingest_logs(db, fixture_logs)
+    report = analyze_logs(fixture_logs, HandlerReport)
+    with sqlite3.connect(db) as connection:
+        rows = connection.execute("SELECT COUNT(*) FROM requests").fetchone()
+        paths = [row[0] for row in connection.execute(
+            "SELECT path FROM handlers"
+        )]
+        indexes = {row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )}
+        mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+    assert total == rows[0] == report.total_requests
+    assert sorted(paths) == sorted(set(paths)) == sorted(report.data)
+    assert {"requests_handler_level", "requests_ts"} <= indexes
+    assert mode == "wal"
+
+
+def test_ingest_extracts_request_fields(tmp_path):
+    """Метод, статус и IP сохраняются, если они есть в строке."""
+    log = tmp_path / "app.log"
+    log.write_text(
+        "2025-03-28 12:44:46,000 INFO django.request:"
+        " GET /api/v1/reviews/ 204 OK [192.168.1.59]\n"
+        "2025-03-28 12:11:57,000 ERROR django.request:"
+        " Internal Server Error: /admin/dashboard/"
+        " [192.168.1.29] - ValueError: Invalid input data\n",
+        encoding="utf-8",
+    )
+    db = tmp_path / "logs.sqlite"
+    ingest_logs(db, [log])
+    with sqlite3.connect(db) as connection:
+        rows = connection.execute(
+            "SELECT r.ts, r.level, h.path, r.method, r.status, r.ip "
+            "FROM requests AS r JOIN handlers AS h ON h.id = r.handler_id "
+            "ORDER BY r.ts"
+        ).fetchall()
+    assert rows == [
+        (1743163917, "ERROR", "/admin/dashboard/", None, None,
+         "192.168.1.29"),
+        (1743165886, "INFO", "/api/v1/reviews/", "GET", 204,
+         "192.168.1.59"),
+    ]
+
+
+def test_load_report_matches_parsed_report(tmp_path, fixture_logs):
+    """Отчёт по базе совпадает с отчётом по логам, в том числе с отбором."""
+    db = tmp_path / "logs.sqlite"
+    ingest_logs(db, fixture_logs)
+    for query in (None,
+                  LogQuery(handler="/api/v1/support/",
+                           since="2025-03-28 12:30:00"),
+                  LogQuery(level="ERROR", handler_prefix="/api/"),
+                  LogQuery(method="GET", status=204),
+                  LogQuery(since="2025-03-28 12:10:00",
+                           until="2025-03-28 12:40:00")):
+        from_db = load_report(db, HandlerReport, query)
+        parsed = analyze_logs(fixture_logs, HandlerReport, query)
+        assert from_db.total_requests == parsed.total_requests
+        assert from_db.data == parsed.data
+
+
+def test_repeated_ingest_skips_loaded_files(tmp_path, fixture_logs,
+                                            capsys):
+    """Уже загруженный файл и его копия повторно не загружаются."""
+    db = tmp_path / "logs.sqlite"
+    copy = tmp_path / "copy.log"
+    copy.write_bytes(fixture_logs[0].read_bytes())
+    first = ingest_logs(db, fixture_logs[:1])
+    assert ingest_logs(db, [fixture_logs[0], copy]) == 0
+    assert capsys.readouterr().err.count("Пропущен") == 2
+    report = load_report(db, HandlerReport)
+    assert report.total_requests == first
+
+
+def test_changed_file_is_replaced(tmp_path):
+    """Записи изменившегося файла заменяются, а не дописываются."""
+    db = tmp_path / "logs.sqlite"
+    log = tmp_path / "app.log"
+    line = ("2025-03-28 12:44:46,000 INFO django.request:"
+            " GET /api/v1/reviews/ 204 OK [192.168.1.59]\n")
+    log.write_text(line, encoding="utf-8")
+    ingest_logs(db, [log])
+    log.write_text(line * 3, encoding="utf-8")
+    assert ingest_logs(db, [log]) == 3
+    assert load_report(db, HandlerReport).total_requests == 3
+
+
+def test_load_report_is_read_only(tmp_path):
+    """Отчёт по базе без схемы ingest не создаёт таблиц и падает явно."""
+    db = tmp_path / "other.sqlite"
+    sqlite3.connect(db).close()
+    with pytest.raises(ValueError, match="ingest"):
+        load_report(db, HandlerReport)
+    with sqlite3.connect(db) as connection:
+        assert not connection.execute(
+            "SELECT name FROM sqlite_master"
+        ).fetchall()
+
+
+def test_ingest_subcommand_and_db_report(monkeypatch, tmp_path, fixture_logs,
+                                         capsys):
+    """Подкоманда ingest и отчёт с --db работают из командной строки."""
+    db = tmp_path / "logs.sqlite"
+    monkeypatch.setattr(sys, "argv", ["prog", "ingest", "--db", str(db)]
+                        + [str(f) for f in fixture_logs])
+    log_analyzer_main.main()
+    assert "Загружено записей" in capsys.readouterr().out
+    monkeypatch.setattr(sys, "argv",
+                        ["prog", "--db", str(db), "--report", "handlers"])
+    log_analyzer_main.main()
+    expected = analyze_logs(fixture_logs, HandlerReport).total_requests
+    assert f"Total requests: {expected}" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("options", [
+    ["{log}"],
+    ["--save-dataset", "{tmp}/logs.npz"],
+    ["--engine", "numpy"],
+    ["--sample", "0.5"],
+])
+def test_db_rejects_ignored_options(monkeypatch, tmp_path, fixture_logs,
+                                    options):
+    """С --db нельзя задать лог-файлы и режимы, которые база не учтёт."""
+    db = tmp_path / "logs.sqlite"
+    ingest_logs(db, fixture_logs[:1])
+    monkeypatch.setattr(sys, "argv", [
+        "prog", "--db", str(db), "--report", "handlers",
+    ] + [
+        option.format(log=fixture_logs[0], tmp=tmp_path)
+        for option in options
+    ])
+    with pytest.raises(SystemExit) as er:
+        log_analyzer_main.main()
+    assert er.value.code == 2
+    assert not (tmp_path / "logs.npz").exists()
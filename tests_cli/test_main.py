@@ -255,3 +255,39 @@ def test_main_entry_point(monkeypatch, valid_log_files) -> None:
     )
     sys.modules.pop("logs_analyzer.main", None)  # Удаляем из кэша импортов
     runpy.run_module("logs_analyzer.main", run_name="__main__")
+
+
+def test_unsupported_filter_for_report(monkeypatch, valid_log_files, capsys):
+    """
+    Фильтр, не применимый к виду записей отчёта, отклоняется.
+
+    :param monkeypatch: фикстура для изменения argv
+    :param valid_log_files: фикстура с путями к логам
+    :param capsys: фикстура для захвата вывода
+    """
+    monkeypatch.setattr(
+        sys, "argv",
+        ["main.py", *map(str, valid_log_files), "--report", "db",
+         "--handler-prefix", "/api/"]
+    )
+    with pytest.raises(SystemExit):
+        log_analyzer_main.main()
+    assert "не поддерживает --handler-prefix" in capsys.readouterr().err
+
+
+def test_since_after_until(monkeypatch, valid_log_files, capsys):
+    """
+    Пустой интервал времени отклоняется.
+
+    :param monkeypatch: фикстура для изменения argv
+    :param valid_log_files: фикстура с путями к логам
+    :param capsys: фикстура для захвата вывода
+    """
+    monkeypatch.setattr(
+        sys, "argv",
+        ["main.py", *map(str, valid_log_files), "--report", "handlers",
+         "--since", "2025-03-28 13:00", "--until", "2025-03-28 12:00"]
+    )
+    with pytest.raises(SystemExit):
+        log_analyzer_main.main()
+    assert "--since должен быть раньше --until" in capsys.readouterr().err
@@ -0,0 +1,91 @@
+"""
+Модуль тестов слияния логов по времени.
+
+Проверяет упорядочивание строк в пределах окна, учёт опоздавших строк,
+слияние нескольких файлов и анализ в порядке времени,
+в том числе сообщения о несовместимых режимах из командной строки.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from logs_analyzer import main as log_analyzer_main
+from logs_analyzer.merge import MergedLogs, ReorderedLines, analyze_ordered
+from logs_analyzer.reports.timeline import TimelineReport
+
+
+def _line(second: int, level: str = "INFO", handler: str = "/api/") -> str:
+    """Строка лога django.request с заданной секундой."""
+    return (f"2025-03-28 12:00:{second:02d},000 {level} django.request: "
+            f"GET {handler} 200 OK [192.168.1.1]\n")
+
+
+def _write(path: Path, seconds: list[int]) -> Path:
+    """Записывает файл со строками в заданные секунды."""
+    path.write_text("".join(_line(second) for second in seconds))
+    return path
+
+
+def test_reorder_within_window():
+    """Строки, отстающие не больше окна, выдаются по порядку."""
+    source = ReorderedLines([_line(s) for s in (2, 1, 4, 3, 5)], window=2)
+    assert [item[0] % 60 for item in source] == [1, 2, 3, 4, 5]
+    assert source.late == 0
+
+
+def test_reorder_counts_late_lines():
+    """Строки, опоздавшие больше окна, выдаются сразу и считаются."""
+    source = ReorderedLines([_line(s) for s in (10, 20, 30, 1)], window=0)
+    assert [item[0] % 60 for item in source] == [10, 20, 30, 1]
+    assert source.late == 1
+
+
+def test_continuation_lines_keep_previous_time():
+    """Строки без метки времени идут следом за своей строкой."""
+    lines = [_line(5), "Traceback (most recent call last):\n", _line(6)]
+    assert [item[2] for item in ReorderedLines(lines, window=1)] == lines
+
+
+def test_merge_files_by_time(tmp_path):
+    """Строки нескольких файлов сливаются в общий порядок времени."""
+    first = _write(tmp_path / "a.log", [1, 4, 7])
+    second = _write(tmp_path / "b.log", [2, 3, 8])
+    merged = MergedLogs([first, second], window=0)
+    seconds = [int(line[17:19]) for line in merged]
+    assert seconds == [1, 2, 3, 4, 7, 8]
+    assert merged.late == 0
+
+
+def test_analyze_ordered_timeline(tmp_path):
+    """Всплески ошибок считаются по слитому потоку обоих файлов."""
+    first = tmp_path / "a.log"
+    first.write_text(_line(1, "ERROR") + _line(50, "ERROR"))
+    second = tmp_path / "b.log"
+    second.write_text(_line(30, "ERROR") + _line(40))
+    report = analyze_ordered([first, second], TimelineReport, window=0)
+    timeline = report.data["/api/"]
+    assert (timeline.requests, timeline.errors, timeline.bursts) == (4, 3, 1)
+
+
+def test_analyze_ordered_rejects_negative_window(tmp_path):
+    """Отрицательное окно слияния отклоняется."""
+    with pytest.raises(ValueError):
+        analyze_ordered([_write(tmp_path / "a.log", [1])], TimelineReport,
+                        window=-1)
+
+
+@pytest.mark.parametrize("options, message", [
+    (["--report", "timeline", "--deadline", "5"], "отчёт timeline"),
+    (["--report", "handlers", "--ordered", "--dedupe"], "--ordered"),
+])
+def test_main_names_source_of_ordering(monkeypatch, tmp_path, capsys,
+                                       options, message):
+    """Ошибка называет отчёт, если порядок времени нужен ему, а не ключу."""
+    log = _write(tmp_path / "a.log", [1])
+    monkeypatch.setattr(sys, "argv", ["prog", str(log)] + options)
+    with pytest.raises(SystemExit) as er:
+        log_analyzer_main.main()
+    assert er.value.code == 2
+    assert message in capsys.readouterr().err
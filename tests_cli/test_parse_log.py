@@ -7,7 +7,14 @@
 from pathlib import Path
 
 import pytest
-from logs_analyzer.logs_parser import parse_log_file
+from logs_analyzer.logs_parser import (
+    LogQuery,
+    compile_filter,
+    normalize_timestamp,
+    parse_error_lines,
+    parse_log_file,
+    read_block,
+)
 
 
 @pytest.fixture
@@ -158,3 +165,114 @@ def test_parse_log_file_various_levels(create_log_file1):
         {"handler": "/api/v1/profile/", "level": "DEBUG"},
     ]
     assert records == expected
+
+
+def test_read_block_splits_lines_between_ranges(tmp_path: Path):
+    """
+    Соседние диапазоны байтов делят строки без потерь и дублей.
+
+    Строка принадлежит диапазону, где находится её первый байт.
+    """
+    content = "".join(f"line {i}\n" for i in range(30)).encode()
+    file = tmp_path / "blocks.log"
+    file.write_bytes(content)
+    with file.open(mode="rb") as handle:
+        blocks = [
+            read_block(handle, start, min(start + 17, len(content)))
+            for start in range(0, len(content), 17)
+        ]
+    assert b"".join(blocks) == content
+
+
+def test_parse_log_file_with_query(create_log_file1):
+    """Условия отбора по обработчику и времени применяются при парсинге."""
+    content = (
+        "2025-03-28 12:05:13,000 INFO django.request:"
+        " GET /api/v1/reviews/ 201 OK [192.168.1.97]\n"
+        "2025-03-28 12:11:57,000 ERROR django.request:"
+        " Internal Server Error: /admin/dashboard/"
+        " [192.168.1.29] - ValueError: Invalid input data\n"
+        "2025-03-28 12:12:00,000 INFO django.request:"
+        " GET /api/v1/reviews/ 200 OK [192.168.1.97]\n"
+    )
+    log_file = create_log_file1(content)
+    since = normalize_timestamp("2025-03-28 12:10")
+    assert parse_log_file(log_file, LogQuery(since=since)) == [
+        {"handler": "/admin/dashboard/", "level": "ERROR"},
+        {"handler": "/api/v1/reviews/", "level": "INFO"},
+    ]
+    query = LogQuery(handler="/api/v1/reviews/", since=since)
+    assert parse_log_file(log_file, query) == [
+        {"handler": "/api/v1/reviews/", "level": "INFO"},
+    ]
+    until = normalize_timestamp("2025-03-28 12:12")
+    assert parse_log_file(log_file, LogQuery(since=since, until=until)) == [
+        {"handler": "/admin/dashboard/", "level": "ERROR"},
+    ]
+    assert parse_log_file(log_file, LogQuery(until=until)) == [
+        {"handler": "/api/v1/reviews/", "level": "INFO"},
+        {"handler": "/admin/dashboard/", "level": "ERROR"},
+    ]
+
+
+def test_parse_error_lines_extracts_messages():
+    """Строки ERROR и CRITICAL разбираются вместе с текстом исключения."""
+    lines = [
+        "2025-03-28 12:11:57,000 ERROR django.request:"
+        " Internal Server Error: /admin/dashboard/"
+        " [192.168.1.29] - ValueError: Invalid input data\n",
+        "2025-03-28 12:40:47,000 CRITICAL django.core.management:"
+        " DatabaseError: Deadlock detected\n",
+        "2025-03-28 12:44:46,000 INFO django.request:"
+        " GET /api/v1/reviews/ 204 OK [192.168.1.59]\n",
+    ]
+    assert parse_error_lines(lines) == [
+        {"handler": "/admin/dashboard/", "level": "ERROR",
+         "message": "ValueError: Invalid input data"},
+        {"handler": "django.core.management", "level": "CRITICAL",
+         "message": "DatabaseError: Deadlock detected"},
+    ]
+
+
+def test_compile_filter_checks_substrings_in_order():
+    """Проверка по подстрокам отсеивает строки без нужного уровня и пути."""
+    query = LogQuery(level="ERROR", handler_prefix="/api/")
+    assert query.needles("django.request") == (
+        " ERROR ", "django.request", " /api/"
+    )
+    matches = compile_filter(query, "django.request")
+    assert matches("2025-03-28 12:00:00,000 ERROR django.request: "
+                   "Internal Server Error: /api/v1/x/ [1.1.1.1]")
+    assert not matches("2025-03-28 12:00:00,000 INFO django.request: "
+                       "GET /api/v1/x/ 200 OK [1.1.1.1]")
+    assert compile_filter(None)("любая строка")
+
+
+def test_parse_log_file_with_pushdown_filters(create_log_file1):
+    """Фильтры уровня, префикса, метода и статуса применяются при разборе."""
+    content = (
+        "2025-03-28 12:00:00,000 INFO django.request: "
+        "GET /api/v1/users/ 200 OK [1.1.1.1]\n"
+        "2025-03-28 12:00:01,000 INFO django.request: "
+        "POST /api/v1/users/ 201 Created [1.1.1.1]\n"
+        "2025-03-28 12:00:02,000 INFO django.request: "
+        "GET /admin/ 200 OK [1.1.1.1]\n"
+        "2025-03-28 12:00:03,000 ERROR django.request: "
+        "Internal Server Error: /api/v1/users/ [1.1.1.1] - KeyError\n"
+        "2025-03-28 12:00:04,000 INFO django.request: "
+        "GET /api/v1/orders/ 404 Not Found [1.1.1.1] /api/v1/users/\n"
+    )
+    log_file = create_log_file1(content)
+    assert parse_log_file(log_file, LogQuery(level="ERROR")) == [
+        {"handler": "/api/v1/users/", "level": "ERROR"}
+    ]
+    assert len(parse_log_file(
+        log_file, LogQuery(handler_prefix="/api/v1/u")
+    )) == 3
+    assert parse_log_file(log_file, LogQuery(method="POST", status=201)) == [
+        {"handler": "/api/v1/users/", "level": "INFO"}
+    ]
+    assert parse_log_file(log_file, LogQuery(status=200,
+                                             handler_prefix="/api/")) == [
+        {"handler": "/api/v1/users/", "level": "INFO"}
+    ]
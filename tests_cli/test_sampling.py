@@ -0,0 +1,106 @@
+"""
+Модуль тестов для выборочного анализа из модуля sampling.
+
+Проверяет точность при полной выборке.
+Объём чтения при малой доле и доверительные интервалы,
+в том числе дисперсию общего числа запросов по итогам блоков.
+Запуск режима --sample из командной строки.
+"""
+
+import math
+import random
+import sys
+from pathlib import Path
+
+import pytest
+from logs_analyzer import main as log_analyzer_main
+from logs_analyzer.analyze import analyze_logs
+from logs_analyzer.reports.handlers import HandlerReport
+from logs_analyzer.sampling import sample_file, sample_logs
+
+LOGS_DIR = Path(__file__).parent.parent / "logs_analyzer" / "logs"
+
+
+@pytest.fixture
+def big_log(tmp_path: Path) -> Path:
+    """
+    Фикстура большого лога из многократно повторённых фикстур.
+
+    :param tmp_path: Временная директория pytest
+    :return: Путь к лог-файлу
+    """
+    content = "".join(
+        path.read_text(encoding="utf-8") for path in LOGS_DIR.glob("*.log")
+    )
+    file = tmp_path / "big.log"
+    file.write_text(content * 40, encoding="utf-8")
+    return file
+
+
+def test_full_rate_is_exact(big_log):
+    """При доле 1 оценки совпадают с точным отчётом, а интервалы нулевые."""
+    sampled = sample_logs([big_log], rate=1.0, seed=1)
+    exact = analyze_logs([big_log], HandlerReport)
+    assert sampled.coverage.bytes_read == sampled.coverage.bytes_total
+    for handler, levels in exact.data.items():
+        for level, count in levels.items():
+            estimate, variance = sampled.data[handler][level]
+            assert estimate == pytest.approx(count)
+            assert variance == pytest.approx(0.0)
+
+
+def test_small_rate_reads_fraction_and_covers_total(big_log):
+    """
+    Малая доля читает меньше данных.
+
+    Доверительный интервал общего числа запросов накрывает точное значение.
+    """
+    sampled = sample_logs([big_log], rate=0.2, seed=7)
+    exact = analyze_logs([big_log], HandlerReport).total_requests
+    assert sampled.coverage.bytes_read < sampled.coverage.bytes_total / 2
+    total, variance = sampled.total
+    assert abs(total - exact) <= 3 * math.sqrt(variance) + 1
+
+
+def test_sample_file_counts_blocks(big_log):
+    """Число прочитанных блоков соответствует доле выборки."""
+    sample = sample_file(big_log, 0.5, block_size=4096)
+    assert sample.coverage.blocks_read == math.ceil(
+        sample.coverage.blocks_total * 0.5
+    )
+
+
+def test_total_variance_uses_block_totals(tmp_path):
+    """
+    Дисперсия общего числа считается по итогам блоков.
+
+    В каждом блоке одинаковое число записей, но разные обработчики:
+    дисперсии ячеек положительны, а общее число известно точно.
+    """
+    rng = random.Random(3)
+    line = ("2025-03-28 12:00:00,000 INFO django.request: "
+            "GET /api/v1/{}/ 200 OK [192.168.1.1]\n")
+    lines = [line.format(rng.choice("ab")) for _ in range(4000)]
+    file = tmp_path / "app.log"
+    file.write_text("".join(lines), encoding="utf-8")
+    sample = sample_file(file, 0.1, rng=rng, block_size=len(lines[0]) * 40)
+    assert sample.total == pytest.approx((4000, 0.0))
+    assert sum(cell[1] for cell in sample.estimates.values()) > 0
+
+
+@pytest.mark.parametrize("rate", [0, -0.1, 1.5])
+def test_invalid_rate(rate):
+    """Доля выборки вне (0, 1] отклоняется."""
+    with pytest.raises(ValueError):
+        sample_logs([], rate=rate)
+
+
+def test_main_sample_option(monkeypatch, big_log, capsys):
+    """Ключ --sample выводит приближённый отчёт с интервалами."""
+    monkeypatch.setattr(sys, "argv", [
+        "prog", str(big_log), "--report", "handlers", "--sample", "0.5",
+    ])
+    log_analyzer_main.main()
+    output = capsys.readouterr().out
+    assert "Sampled" in output
+    assert "±" in output
@@ -0,0 +1,111 @@
+"""
+Модуль тестов поиска интервала времени в лог-файлах.
+
+Проверяет распознавание упорядоченных файлов, совпадение чтения
+найденного диапазона с полным парсингом (в том числе при небольшом
+беспорядке и строках трассировки) и полное чтение перемешанных логов.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from logs_analyzer import seek
+from logs_analyzer.analyze import analyze_logs
+from logs_analyzer.logs_parser import LogQuery, parse_log_file
+from logs_analyzer.reports.handlers import HandlerReport
+from logs_analyzer.seek import looks_ordered, parse_time_window, seek_window
+
+LOGS_DIR = Path(__file__).parent.parent / "logs_analyzer" / "logs"
+
+
+def _line(second: int, handler: str, level: str = "INFO") -> str:
+    """
+    Формирует строку лога django.request.
+
+    :param second: Секунда от 2025-03-28 12:00:00
+    :param handler: Путь обработчика
+    :param level: Уровень логирования
+    :return: Строка лога с переводом строки
+    """
+    minute, sec = divmod(second, 60)
+    hour, minute = divmod(minute, 60)
+    return (f"2025-03-28 {12 + hour:02d}:{minute:02d}:{sec:02d},000 "
+            f"{level} django.request: GET {handler} 200 OK "
+            "[192.168.1.1]\n")
+
+
+@pytest.fixture
+def ordered_log(tmp_path: Path, monkeypatch) -> Path:
+    """
+    Фикстура упорядоченного лога на два часа с трассировками.
+
+    Каждая пятая строка на 3 секунды отстаёт от соседних,
+    как при записи из нескольких процессов.
+
+    :param tmp_path: Временная директория pytest
+    :param monkeypatch: Фикстура для уменьшения шага поиска
+    :return: Путь к лог-файлу
+    """
+    monkeypatch.setattr(seek, "SEEK_GRANULARITY", 512)
+    monkeypatch.setattr(seek, "SEEK_CHUNK_SIZE", 4096)
+    lines = []
+    for second in range(0, 7200, 2):
+        late = 3 if second % 10 == 0 else 0
+        lines.append(_line(second - late, f"/api/v1/{second % 3}/"))
+        if second % 100 == 0:
+            lines.append(_line(second, "/api/v1/fail/", "ERROR"))
+            lines.append("Traceback (most recent call last):\n")
+            lines.append('  File "views.py", line 1, in view\n')
+    file = tmp_path / "app.log"
+    file.write_text("".join(lines), encoding="utf-8")
+    return file
+
+
+def test_looks_ordered(ordered_log):
+    """Упорядоченный лог распознаётся, перемешанные логи — нет."""
+    with ordered_log.open(mode="rb") as file:
+        assert looks_ordered(file, ordered_log.stat().st_size)
+    for log in sorted(LOGS_DIR.glob("*.log")):
+        with log.open(mode="rb") as file:
+            assert not looks_ordered(file, log.stat().st_size)
+
+
+def test_seek_window_reads_part_of_file(ordered_log):
+    """Для узкого интервала читается малая часть файла."""
+    size = ordered_log.stat().st_size
+    query = LogQuery(since="2025-03-28 13:00:00", until="2025-03-28 13:05:00")
+    with ordered_log.open(mode="rb") as file:
+        start, end = seek_window(file, size, query)
+    assert 0 < start < end < size
+    assert end - start < size // 8
+
+
+@pytest.mark.parametrize("query", [
+    LogQuery(since="2025-03-28 13:00:00", until="2025-03-28 13:05:00"),
+    LogQuery(since="2025-03-28 12:59:59", until="2025-03-28 13:00:01"),
+    LogQuery(since="2025-03-28 13:30:00"),
+    LogQuery(until="2025-03-28 12:10:00", level="ERROR"),
+    LogQuery(since="2025-03-28 11:00:00", until="2025-03-28 12:00:00"),
+    LogQuery(since="2025-03-28 15:00:00"),
+])
+def test_parse_time_window_matches_full_scan(ordered_log, query):
+    """Чтение найденного диапазона даёт те же записи, что полный парсинг."""
+    assert parse_time_window(ordered_log, query) == parse_log_file(
+        ordered_log, query
+    )
+
+
+def test_unordered_file_is_read_in_full(capsys):
+    """Перемешанный лог не ищется, о полном чтении сообщается в stderr."""
+    log = LOGS_DIR / "app1.log"
+    query = LogQuery(since="2025-03-28 12:10:00", until="2025-03-28 12:20:00")
+    assert parse_time_window(log, query) is None
+    assert "не упорядочен" in capsys.readouterr().err
+    report = analyze_logs([log], HandlerReport, query)
+    assert report.total_requests == len(parse_log_file(log, query))
+
+
+def test_query_without_time_is_not_seeked(ordered_log):
+    """Без границ времени поиск не выполняется."""
+    assert parse_time_window(ordered_log, LogQuery(level="ERROR")) is None
@@ -0,0 +1,170 @@
+"""
+Модуль тестов для режима serve из модуля server.
+
+Проверяет инкрементальное дочитывание логов блоками и перестроение
+при ротации. Слияние по времени для отчётов, зависящих от порядка.
+Фильтры и ограниченный кеш ответов.
+HTTP-API на localhost.
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+from logs_analyzer import server as log_server
+from logs_analyzer.merge import analyze_ordered
+from logs_analyzer.reports.timeline import TimelineReport
+from logs_analyzer.server import LogServer, LogWatcher, QueryError
+
+INFO_LINE = ("2025-03-28 12:44:46,000 INFO django.request:"
+             " GET /api/v1/reviews/ 204 OK [192.168.1.59]\n")
+ERROR_LINE = ("2025-03-28 12:11:57,000 ERROR django.request:"
+              " Internal Server Error: /admin/dashboard/"
+              " [192.168.1.29] - ValueError: Invalid input data\n")
+
+
+@pytest.fixture
+def watched_log(tmp_path: Path) -> Path:
+    """
+    Фикстура наблюдаемого лога с двумя строками.
+
+    :param tmp_path: Временная директория pytest
+    :return: Путь к лог-файлу
+    """
+    file = tmp_path / "app.log"
+    file.write_text(INFO_LINE + ERROR_LINE, encoding="utf-8")
+    return file
+
+
+def test_refresh_reads_only_appended_lines(watched_log):
+    """
+    Обновление дочитывает только новые полные строки.
+
+    Незавершённая строка учитывается после её завершения.
+    """
+    watcher = LogWatcher([watched_log], ["handlers", "errors"])
+    assert watcher.refresh() is True
+    assert watcher.reports["handlers"].total_requests == 2
+    assert watcher.reports["errors"].total_errors == 1
+    assert watcher.refresh() is False
+
+    with watched_log.open(mode="a", encoding="utf-8") as file:
+        file.write(INFO_LINE + INFO_LINE[:20])
+    watcher.refresh()
+    assert watcher.reports["handlers"].total_requests == 3
+    with watched_log.open(mode="a", encoding="utf-8") as file:
+        file.write(INFO_LINE[20:])
+    watcher.refresh()
+    assert watcher.reports["handlers"].total_requests == 4
+
+
+def test_refresh_reads_in_bounded_blocks(watched_log, monkeypatch):
+    """
+    Новая часть читается блоками не длиннее READ_BLOCK_SIZE.
+
+    Строка длиннее блока дочитывается целиком.
+    """
+    monkeypatch.setattr(log_server, "READ_BLOCK_SIZE", 64)
+    with watched_log.open(mode="a", encoding="utf-8") as file:
+        file.write(INFO_LINE * 5 + INFO_LINE[:20])
+    blocks = list(LogWatcher._read_new(
+        watched_log, 0, watched_log.stat().st_size
+    ))
+    assert b"".join(blocks) == (
+        (INFO_LINE + ERROR_LINE + INFO_LINE * 5).encode()
+    )
+    assert all(block.endswith(b"\n") for block in blocks)
+    assert max(map(len, blocks)) < len(ERROR_LINE) + 64
+    watcher = LogWatcher([watched_log], ["handlers"])
+    watcher.refresh()
+    assert watcher.reports["handlers"].total_requests == 7
+
+
+def test_ordered_reports_get_merged_records(tmp_path, monkeypatch):
+    """
+    Отчёт по времени получает записи всех файлов в порядке времени.
+
+    Результат совпадает со слиянием логов режимом --ordered.
+    """
+    monkeypatch.setattr(log_server, "READ_BLOCK_SIZE", 256)
+    logs = [tmp_path / "app1.log", tmp_path / "app2.log"]
+    for number, log in enumerate(logs):
+        log.write_text("".join(
+            f"2025-03-28 12:{minute:02d}:00,000 ERROR django.request: "
+            "Internal Server Error: /api/ [192.168.1.1] - ValueError: x\n"
+            for minute in range(number, 20, 2)
+        ), encoding="utf-8")
+    watcher = LogWatcher(logs, ["timeline"])
+    watcher.refresh()
+    expected = analyze_ordered(logs, TimelineReport)
+    assert watcher.reports["timeline"].as_dict() == expected.as_dict()
+    assert expected.data["/api/"].bursts == 1
+
+
+def test_truncated_log_rebuilds_aggregates(watched_log):
+    """Укоротившийся (ротированный) лог перестраивает агрегаты."""
+    watcher = LogWatcher([watched_log], ["handlers"])
+    watcher.refresh()
+    watched_log.write_text(INFO_LINE, encoding="utf-8")
+    watcher.refresh()
+    assert watcher.reports["handlers"].total_requests == 1
+
+
+def test_query_filters_and_cache(watched_log):
+    """
+    Фильтры по префиксу и уровню применяются к агрегатам.
+
+    Повторный запрос возвращает кешированный ответ до обновления.
+    """
+    watcher = LogWatcher([watched_log], ["handlers", "errors"])
+    watcher.refresh()
+    _, body = watcher.query("handlers", "json", handler_prefix="/admin/")
+    data = json.loads(body)
+    assert data["total_requests"] == 1
+    assert list(data["handlers"]) == ["/admin/dashboard/"]
+    _, body = watcher.query("handlers", "json", level="INFO")
+    assert json.loads(body)["handlers"] == {"/api/v1/reviews/": {"INFO": 1}}
+    first = watcher.query("handlers", "text")
+    assert watcher.query("handlers", "text") is first
+    with pytest.raises(QueryError):
+        watcher.query("errors", "json", level="ERROR")
+    with pytest.raises(QueryError):
+        watcher.query("missing")
+
+
+def test_cache_is_bounded(watched_log, monkeypatch):
+    """Кеш хранит не больше CACHE_SIZE последних ответов."""
+    monkeypatch.setattr(log_server, "CACHE_SIZE", 2)
+    watcher = LogWatcher([watched_log], ["handlers"])
+    watcher.refresh()
+    first = watcher.query("handlers", "json", handler_prefix="/a")
+    watcher.query("handlers", "json", handler_prefix="/b")
+    assert watcher.query("handlers", "json", handler_prefix="/a") is first
+    watcher.query("handlers", "json", handler_prefix="/c")
+    assert [key[2] for key in watcher._cache] == ["/a", "/c"]
+
+
+def test_http_api(watched_log):
+    """HTTP-сервер отдаёт отчёты и ошибки запросов."""
+    watcher = LogWatcher([watched_log], ["handlers"])
+    watcher.refresh()
+    server = LogServer(watcher, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with urllib.request.urlopen(
+            f"{base}/report?name=handlers&format=json"
+        ) as response:
+            assert json.loads(response.read())["total_requests"] == 2
+        with urllib.request.urlopen(f"{base}/report") as response:
+            assert b"Total requests: 2" in response.read()
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{base}/report?name=errors")
+        assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
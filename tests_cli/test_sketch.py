@@ -0,0 +1,64 @@
+"""
+Модуль тестов для скетча DDSketch.
+
+Проверяет относительную точность квантилей, объединение скетчей
+и ограничение числа корзин.
+"""
+
+import random
+
+import pytest
+
+from logs_analyzer.sketch import DDSketch
+
+
+def _exact(values: list[float], q: float) -> float:
+    """Точный квантиль по рангу q * (n - 1)."""
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+def test_quantiles_within_relative_accuracy():
+    """Квантили отличаются от точных не больше чем на погрешность."""
+    rng = random.Random(1)
+    values = [rng.lognormvariate(-2, 1) for _ in range(20_000)]
+    sketch = DDSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+    for q in (0.5, 0.95, 0.99):
+        exact = _exact(values, q)
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact * 1.0001
+
+
+def test_merge_equals_single_sketch():
+    """Объединение частичных скетчей совпадает со скетчем по всем данным."""
+    rng = random.Random(2)
+    values = [rng.uniform(0.001, 2) for _ in range(5_000)]
+    whole, left, right = DDSketch(), DDSketch(), DDSketch()
+    for position, value in enumerate(values):
+        whole.add(value)
+        (left if position % 2 else right).add(value)
+    left.merge(right)
+    assert left.bins == whole.bins
+    assert left.count == whole.count
+    assert left.quantile(0.99) == whole.quantile(0.99)
+
+
+def test_bins_are_bounded():
+    """Число корзин не превышает max_bins при большом разбросе значений."""
+    sketch = DDSketch(max_bins=64)
+    for exponent in range(-8, 8):
+        for step in range(100):
+            sketch.add(10 ** exponent * (1 + step / 100))
+    assert len(sketch.bins) <= 64
+    assert sketch.quantile(1.0) == sketch.max
+
+
+def test_zero_and_invalid_values():
+    """Нулевые значения учитываются, отрицательные отклоняются."""
+    sketch = DDSketch()
+    sketch.add(0.0)
+    assert sketch.quantile(0.5) == 0.0
+    with pytest.raises(ValueError):
+        sketch.add(-1.0)
+    with pytest.raises(ValueError):
+        DDSketch().merge(DDSketch(relative_accuracy=0.05))
@@ -0,0 +1,130 @@
+"""
+Модуль тестов снимков отчёта.
+
+Проверяет сохранение и загрузку снимка, вычисление разницы
+по обработчикам и уровням и сравнение со снимком из командной строки.
+"""
+
+import json
+import sys
+
+import pytest
+
+from logs_analyzer import main as log_analyzer_main
+from logs_analyzer.logs_parser import LogQuery
+from logs_analyzer.reports.errors import ErrorReport
+from logs_analyzer.reports.handlers import HandlerReport
+from logs_analyzer.snapshot import (
+    SnapshotDiff,
+    load_snapshot,
+    save_snapshot,
+    supports_snapshot,
+)
+
+
+def make_report(records: list[tuple[str, str]]) -> HandlerReport:
+    """
+    Строит отчёт по парам (обработчик, уровень).
+
+    :param records: Пары обработчика и уровня
+    :return: Отчёт по обработчикам
+    """
+    report = HandlerReport()
+    report.add_data([
+        {"handler": handler, "level": level} for handler, level in records
+    ])
+    return report
+
+
+def test_supports_snapshot():
+    """Снимок поддерживают только восстанавливаемые отчёты."""
+    assert supports_snapshot(HandlerReport)
+    assert not supports_snapshot(ErrorReport)
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    """Загруженный снимок совпадает с сохранённым отчётом."""
+    path = tmp_path / "base.json"
+    report = make_report([("/a/", "INFO"), ("/a/", "ERROR"), ("/b/", "INFO")])
+    save_snapshot(path, "handlers", report, LogQuery(level="INFO"))
+    snapshot = load_snapshot(path, "handlers", HandlerReport)
+    assert snapshot.report.as_dict() == report.as_dict()
+    assert snapshot.query == {"level": "INFO"}
+    assert [p.name for p in tmp_path.iterdir()] == ["base.json"]
+
+
+@pytest.mark.parametrize("payload", [
+    "not json",
+    json.dumps({"version": 99, "report": "handlers", "data": {}}),
+    json.dumps({"version": 1, "report": "errors", "data": {}}),
+    json.dumps({"version": 1, "report": "handlers", "data": {"x": 1}}),
+])
+def test_load_rejects_invalid(tmp_path, payload):
+    """Повреждённый или чужой снимок отклоняется."""
+    path = tmp_path / "base.json"
+    path.write_text(payload, encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_snapshot(path, "handlers", HandlerReport)
+
+
+def test_diff_marks_new_and_vanished(tmp_path):
+    """Разница учитывает изменения, новые и исчезнувшие обработчики."""
+    path = tmp_path / "base.json"
+    save_snapshot(path, "handlers", make_report(
+        [("/a/", "INFO"), ("/a/", "INFO"), ("/old/", "ERROR")]
+    ))
+    current = make_report(
+        [("/a/", "INFO"), ("/a/", "ERROR"), ("/new/", "INFO")]
+    )
+    diff = SnapshotDiff(load_snapshot(path, "handlers", HandlerReport),
+                        current)
+    assert diff.rows == [
+        ("/a/", "INFO", 2, 1),
+        ("/a/", "ERROR", 0, 1),
+        ("/new/", "INFO", 0, 1),
+        ("/old/", "ERROR", 1, 0),
+    ]
+    assert diff.new == {"/new/"}
+    assert diff.vanished == {"/old/"}
+    assert diff.changed == 1
+
+
+def test_main_compare(monkeypatch, tmp_path, capsys):
+    """Снимок, сохранённый одним запуском, сравнивается в следующем."""
+    log = tmp_path / "app.log"
+    log.write_text(
+        "2025-03-26 12:00:06,000 INFO django.request: "
+        "GET /api/v1/users/ 200 OK [192.168.1.1]\n",
+        encoding="utf-8",
+    )
+    snapshot = tmp_path / "base.json"
+    monkeypatch.setattr(sys, "argv", [
+        "prog", str(log), "--report", "handlers",
+        "--save-snapshot", str(snapshot),
+    ])
+    log_analyzer_main.main()
+    with log.open(mode="a", encoding="utf-8") as file:
+        file.write("2025-03-26 12:00:07,000 ERROR django.request: "
+                   "Internal Server Error: /api/v1/users/ [192.168.1.1] "
+                   "- ValueError: boom\n")
+    capsys.readouterr()
+    monkeypatch.setattr(sys, "argv", [
+        "prog", str(log), "--report", "handlers", "--compare", str(snapshot),
+    ])
+    log_analyzer_main.main()
+    out = capsys.readouterr().out
+    assert "Total requests: 1 -> 2 (+1, +100.0%)" in out
+    assert "/api/v1/users/      ERROR     0         1         +1" in out
+
+
+def test_main_compare_rejects_unsupported_report(monkeypatch, tmp_path):
+    """Сравнение со снимком недоступно отчётам без from_dict."""
+    log = tmp_path / "app.log"
+    log.write_text("", encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", [
+        "prog", str(log), "--report", "errors",
+        "--compare", str(tmp_path / "base.json"),
+    ])
+    with pytest.raises(SystemExit) as er:
+        log_analyzer_main.main()
+    assert er.value.code == 2
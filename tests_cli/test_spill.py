@@ -0,0 +1,135 @@
+"""
+Модуль тестов агрегации с ограничением памяти.
+
+Проверяет разбор размера памяти, слияние прогонов с объединением
+ключей, слияние проходами при большом числе прогонов, совпадение
+сброшенного отчёта с обычным и удаление временных файлов.
+"""
+
+import gc
+from pathlib import Path
+
+import pytest
+
+from logs_analyzer import spill
+from logs_analyzer.analyze import (
+    SpillOptions,
+    analyze_logs,
+    analyze_with_memory_limit,
+)
+from logs_analyzer.reports.errors import ErrorReport
+from logs_analyzer.reports.handlers import HandlerReport
+from logs_analyzer.spill import (
+    SpilledReport,
+    SpillStore,
+    parse_memory_limit,
+    supports_spill,
+)
+
+LOGS_DIR = Path(__file__).parent.parent / "logs_analyzer" / "logs"
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1024", 1024), ("64K", 64 * 1024), ("512m", 512 * 1024 ** 2),
+    ("1.5G", int(1.5 * 1024 ** 3)), ("256MiB", 256 * 1024 ** 2),
+])
+def test_parse_memory_limit(value, expected):
+    """Размер с суффиксом переводится в байты."""
+    assert parse_memory_limit(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "0", "-1M", "12X"])
+def test_parse_memory_limit_rejects_invalid(value):
+    """Некорректный размер отклоняется."""
+    with pytest.raises(ValueError):
+        parse_memory_limit(value)
+
+
+def test_store_merges_equal_keys(tmp_path):
+    """Один обработчик из разных прогонов объединяется в одну запись."""
+    store = SpillStore(HandlerReport, tmp_path)
+    for handler, level in (("/b/", "INFO"), ("/a/", "ERROR")):
+        report = HandlerReport()
+        report.add_data([{"handler": "/a/", "level": "INFO"},
+                         {"handler": handler, "level": level}])
+        store.spill(report)
+    rest = HandlerReport()
+    rest.add_data([{"handler": "/c/", "level": "INFO"}])
+    assert list(store.merged(rest)) == [
+        ("/a/", {"INFO": 2, "ERROR": 1}),
+        ("/b/", {"INFO": 1}),
+        ("/c/", {"INFO": 1}),
+    ]
+    store.close()
+    assert not list(tmp_path.iterdir())
+
+
+def test_spilled_report_matches_in_memory(tmp_path, capsys):
+    """Отчёт со сбросом на диск выводится так же, как обычный."""
+    log_files = sorted(LOGS_DIR.glob("*.log"))
+    analyze_logs(log_files, HandlerReport).print_report()
+    expected = capsys.readouterr().out
+
+    report = analyze_with_memory_limit(
+        log_files, HandlerReport, memory_limit=1,
+        options=SpillOptions(chunk_size=4096, directory=tmp_path),
+    )
+    assert isinstance(report, SpilledReport)
+    assert len(report.store.runs) > 1
+    report.print_report()
+    assert capsys.readouterr().out == expected
+    assert not list(tmp_path.iterdir())
+
+
+def test_runs_are_merged_in_passes(tmp_path, monkeypatch, capsys):
+    """Прогоны сливаются проходами, не открывая больше MERGE_FAN_IN."""
+    log_files = sorted(LOGS_DIR.glob("*.log"))
+    analyze_logs(log_files, HandlerReport).print_report()
+    expected = capsys.readouterr().out
+
+    monkeypatch.setattr(spill, "MERGE_FAN_IN", 3)
+    report = analyze_with_memory_limit(
+        log_files, HandlerReport, memory_limit=1,
+        options=SpillOptions(chunk_size=1024, directory=tmp_path),
+    )
+    assert len(report.store.runs) > 3
+    list(report.items())
+    assert len(report.store.runs) < 3
+    assert len(list(tmp_path.iterdir())) == len(report.store.runs)
+    report.print_report()
+    assert capsys.readouterr().out == expected
+    assert not list(tmp_path.iterdir())
+
+
+def test_unprinted_report_removes_runs(tmp_path):
+    """Файлы прогонов удаляются и без вывода отчёта."""
+    report = analyze_with_memory_limit(
+        sorted(LOGS_DIR.glob("*.log")), HandlerReport, memory_limit=1,
+        options=SpillOptions(chunk_size=4096, directory=tmp_path),
+    )
+    assert list(tmp_path.iterdir())
+    del report
+    gc.collect()
+    assert not list(tmp_path.iterdir())
+
+
+def test_memory_usage_counts_path_length():
+    """Оценка памяти растёт с длиной путей и числом уровней."""
+    short, long = HandlerReport(), HandlerReport()
+    short.add_data([{"handler": "/a/", "level": "INFO"}])
+    long.add_data([{"handler": "/a/" + "x" * 1000, "level": "INFO"}])
+    assert long.memory_usage() - short.memory_usage() >= 1000
+    before = short.memory_usage()
+    short.add_data([{"handler": "/a/", "level": "INFO"}])
+    assert short.memory_usage() == before
+    short.add_data([{"handler": "/a/", "level": "ERROR"}])
+    assert short.memory_usage() > before
+    merged = HandlerReport()
+    merged.merge(short)
+    assert merged.memory_usage() == short.memory_usage()
+
+
+def test_supports_spill():
+    """Протокол сброса реализован отчётом по обработчикам."""
+    assert supports_spill(HandlerReport)
+    assert not supports_spill(ErrorReport)
@@ -0,0 +1,109 @@
+"""
+Модуль тестов для потоковой обработки из модуля stream.
+
+Проверяет нарезку потока на блоки по границам строк.
+Определение потоковых источников.
+Конвейерный анализ stdin и именованных каналов.
+"""
+
+import io
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from logs_analyzer.analyze import analyze_logs
+from logs_analyzer.check_validate import validate_files
+from logs_analyzer.reports.handlers import HandlerReport
+from logs_analyzer.stream import (
+    StreamOptions,
+    analyze_stream,
+    is_stream_input,
+    iter_batches,
+)
+
+LINE = ("2025-03-28 12:44:46,000 INFO django.request:"
+        " GET /api/v1/reviews/ 204 OK [192.168.1.59]\n")
+ERROR_LINE = ("2025-03-28 12:11:57,000 ERROR django.request:"
+              " Internal Server Error: /admin/dashboard/"
+              " [192.168.1.29] - ValueError: Invalid input data\n")
+
+
+def test_iter_batches_line_aligned() -> None:
+    """
+    Блоки заканчиваются на границе строки.
+
+    Ни одна строка не разрывается, содержимое сохраняется полностью.
+    """
+    data = (LINE + ERROR_LINE) * 20
+    batches = list(iter_batches(io.BytesIO(data.encode()), batch_size=50))
+    assert b"".join(batches) == data.encode()
+    for batch in batches:
+        assert batch.endswith(b"\n")
+
+
+def test_iter_batches_keeps_unterminated_tail() -> None:
+    """Последняя строка без перевода строки не теряется."""
+    data = LINE + "tail without newline"
+    batches = list(iter_batches(io.BytesIO(data.encode()), batch_size=7))
+    assert b"".join(batches) == data.encode()
+    assert batches[-1].endswith(b"tail without newline")
+
+
+def test_is_stream_input(tmp_path: Path) -> None:
+    """'-' и именованный канал считаются потоками, обычный файл — нет."""
+    regular = tmp_path / "app.log"
+    regular.write_text(LINE)
+    fifo = tmp_path / "app.pipe"
+    os.mkfifo(fifo)
+    assert is_stream_input(Path("-"))
+    assert is_stream_input(fifo)
+    assert not is_stream_input(regular)
+    assert validate_files([Path("-"), fifo, regular]) is True
+
+
+def test_analyze_stream_counts_all_batches() -> None:
+    """
+    Конвейер агрегирует записи из всех блоков.
+
+    Небольшой размер блока заставляет поток пройти через
+    ограниченную очередь несколько раз.
+    """
+    data = (LINE * 3 + ERROR_LINE) * 50
+    report = analyze_stream(
+        io.BytesIO(data.encode()), HandlerReport(),
+        options=StreamOptions(workers=2, batch_size=256),
+    )
+    assert report.total_requests == 200
+    assert report.data["/api/v1/reviews/"]["INFO"] == 150
+    assert report.data["/admin/dashboard/"]["ERROR"] == 50
+
+
+def test_analyze_logs_from_stdin(monkeypatch) -> None:
+    """analyze_logs читает '-' из стандартного ввода."""
+    stdin = io.TextIOWrapper(io.BytesIO((LINE * 4).encode()))
+    monkeypatch.setattr(sys, "stdin", stdin)
+    report = analyze_logs([Path("-")], HandlerReport)
+    assert report.total_requests == 4
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="нет mkfifo")
+def test_analyze_logs_from_named_pipe(tmp_path: Path) -> None:
+    """Именованный канал и обычный файл анализируются вместе."""
+    regular = tmp_path / "app.log"
+    regular.write_text(ERROR_LINE)
+    fifo = tmp_path / "app.pipe"
+    os.mkfifo(fifo)
+
+    def _write() -> None:
+        with fifo.open(mode="w", encoding="utf-8") as pipe:
+            pipe.write(LINE * 5)
+
+    writer = threading.Thread(target=_write)
+    writer.start()
+    report = analyze_logs([fifo, regular], HandlerReport)
+    writer.join()
+    assert report.total_requests == 6
+    assert report.data["/api/v1/reviews/"]["INFO"] == 5
+    assert report.data["/admin/dashboard/"]["ERROR"] == 1
@@ -0,0 +1,38 @@
+"""
+Модуль тестов для класса TimelineReport.
+
+Проверяет подсчёт всплесков ошибок, первой и последней ошибки
+и вывод отчёта.
+"""
+
+from logs_analyzer.reports.timeline import BURST_GAP, TimelineReport
+
+
+def _record(stamp: int, level: str = "ERROR") -> dict:
+    """Запись хронологии обработчика /api/."""
+    return {"handler": "/api/", "level": level, "time": stamp}
+
+
+def test_bursts_split_by_gap():
+    """Ошибки с паузой больше BURST_GAP образуют новый всплеск."""
+    report = TimelineReport()
+    report.add_data([
+        _record(0), _record(10), _record(10 + BURST_GAP + 1),
+        _record(20 + BURST_GAP, "INFO"),
+    ])
+    timeline = report.data["/api/"]
+    assert timeline.bursts == 2
+    assert timeline.errors == 3
+    assert timeline.requests == 4
+    assert (timeline.first_error, timeline.last_error) == (0, 11 + BURST_GAP)
+
+
+def test_print_report(capsys):
+    """Отчёт выводит итог и время ошибок в формате строк лога."""
+    report = TimelineReport()
+    report.add_data([_record(1743163200)])
+    report.print_report()
+    output = capsys.readouterr().out
+    assert "Total errors: 1 in 1 bursts" in output
+    assert "2025-03-28 12:00:00" in output
+    assert report.as_dict()["handlers"]["/api/"]["bursts"] == 1